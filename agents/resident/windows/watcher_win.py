@@ -1,4 +1,4 @@
-import time, threading, queue, requests, numpy as np
+import json, time, threading, queue, requests, numpy as np
 import sounddevice as sd
 import webrtcvad
 from openwakeword import Model
@@ -6,18 +6,69 @@ from openwakeword import Model
 BASE = "http://127.0.0.1:8765"
 CFG = {"enabled": True, "keyword": "hey steve", "sensitivity": 0.5, "device": None}
 RUN = True
+STATE = {"version": None, "etag": None}
+
+DEFAULTS = dict(CFG)
+SETTING_KEYS = {"wakeword_enabled": "enabled", "wakeword_keyword": "keyword", "wakeword_sensitivity": "sensitivity", "wakeword_device_index": "device"}
+
+def apply_settings(s: dict, removed=()):
+    if "wakeword_enabled" in s:
+        CFG["enabled"] = bool(s["wakeword_enabled"])
+    if "wakeword_keyword" in s:
+        CFG["keyword"] = s["wakeword_keyword"] or "hey steve"
+    if "wakeword_sensitivity" in s:
+        CFG["sensitivity"] = float(s["wakeword_sensitivity"])
+    if "wakeword_device_index" in s:
+        CFG["device"] = s["wakeword_device_index"]
+    for key in removed:
+        if key in SETTING_KEYS:
+            CFG[SETTING_KEYS[key]] = DEFAULTS[SETTING_KEYS[key]]
+
+def apply_full_settings(s: dict):
+    # A full payload lists every stored key, so anything missing has been deleted
+    apply_settings(s, removed=[k for k in SETTING_KEYS if k not in s])
 
 def fetch_settings():
     try:
-        r = requests.get(f"{BASE}/api/settings", timeout=3)
-        s = r.json()
-        CFG["enabled"] = bool(s.get("wakeword_enabled", True))
-        CFG["keyword"] = s.get("wakeword_keyword", "hey steve")
-        CFG["sensitivity"] = float(s.get("wakeword_sensitivity", 0.5))
-        CFG["device"] = s.get("wakeword_device_index", None)
+        headers = {"If-None-Match": STATE["etag"]} if STATE["etag"] else {}
+        r = requests.get(f"{BASE}/api/settings", headers=headers, timeout=3)
+        if r.status_code == 304:
+            return
+        r.raise_for_status()
+        apply_full_settings(r.json())
+        STATE["etag"] = r.headers.get("ETag")
+        STATE["version"] = r.headers.get("X-Settings-Version")
     except Exception:
         pass
 
+def on_settings_event(payload: dict):
+    version = payload.get("version")
+    if payload.get("full"):
+        # Every (re)connect starts with a full payload; it is the authoritative state whatever the version
+        apply_full_settings(payload.get("settings", {}))
+    elif version == STATE["version"]:
+        return
+    else:
+        apply_settings(payload.get("set", {}), payload.get("removed", []))
+    STATE["version"] = version
+
+def subscribe_settings():
+    backoff = 1.0
+    while RUN:
+        try:
+            with requests.get(f"{BASE}/api/settings/stream", stream=True, timeout=(3, 60)) as r:
+                r.raise_for_status()
+                backoff = 1.0
+                for line in r.iter_lines(decode_unicode=True):
+                    if not RUN:
+                        return
+                    if line and line.startswith("data:"):
+                        on_settings_event(json.loads(line[5:]))
+        except Exception:
+            fetch_settings()
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
 def pick_label(scores: dict, key_hint: str):
     kh = key_hint.strip().lower()
     best = None
@@ -46,6 +97,7 @@ def audio_stream(q, device):
 
 def main():
     fetch_settings()
+    threading.Thread(target=subscribe_settings, daemon=True).start()
     vad = webrtcvad.Vad(2)
     mdl = Model(trigger_level=CFG["sensitivity"])
     last = 0.0
@@ -58,7 +110,6 @@ def main():
     frame_bytes = int(sr/1000*frame_ms)*2
     while RUN:
         try:
-            fetch_settings()
             if not CFG["enabled"]:
                 time.sleep(0.5)
                 continue
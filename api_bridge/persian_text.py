@@ -0,0 +1,33 @@
+"""
+Shared Persian normalizer for the API clients and the voice command extensions
+heystive_professional/heystive/utils/persian_text.py is the only implementation; this module
+imports it as a package when the backend tree is importable, and otherwise loads that same file
+by path without putting the backend directory on sys.path
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+MODULE_NAME = "heystive_persian_text"
+
+
+def _import_persian_text():
+    try:
+        from heystive.utils import persian_text
+        return persian_text
+    except ImportError:
+        pass
+    module = sys.modules.get(MODULE_NAME)
+    if module is None:
+        path = Path(__file__).resolve().parents[1] / "heystive_professional" / "heystive" / "utils" / "persian_text.py"
+        spec = importlib.util.spec_from_file_location(MODULE_NAME, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[MODULE_NAME] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+_persian_text = _import_persian_text()
+DIGITS_TO_LATIN, DIGITS_TO_PERSIAN = _persian_text.DIGITS_TO_LATIN, _persian_text.DIGITS_TO_PERSIAN
+get_normalizer, normalize_persian = _persian_text.get_normalizer, _persian_text.normalize_persian
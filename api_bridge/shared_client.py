@@ -14,6 +14,9 @@ import time
 import threading
 from urllib.parse import urljoin
 
+from api_bridge.persian_text import DIGITS_TO_LATIN, DIGITS_TO_PERSIAN, normalize_persian
+from api_bridge.wav_stream import iter_wav_stream
+
 logger = logging.getLogger(__name__)
 
 class HeystiveSharedClient:
@@ -200,6 +203,40 @@ class HeystiveSharedClient:
                 'message': f'خطا در تولید صوت: {str(e)}'
             }
     
+    def stream_text_to_speech(self, text: str, on_audio: Callable[[bytes, int, int], None],
+                              voice_id: str = 'default', chunk_size: int = 4096) -> Dict[str, Any]:
+        """
+        Stream speech from /api/tts/stream, calling on_audio(pcm_bytes, sample_rate, channels)
+        for each 16-bit PCM chunk as it arrives instead of waiting for the whole clip
+        """
+        try:
+            start = time.time()
+            first_chunk_ms = None
+            total = 0
+            with self.session.post(
+                f"{self.base_url}/api/tts/stream",
+                json={'text': text, 'voice': voice_id},
+                headers={'Accept': 'audio/wav'},
+                stream=True,
+                timeout=20
+            ) as response:
+                response.raise_for_status()
+                for pcm, sample_rate, channels in iter_wav_stream(response.iter_content(chunk_size)):
+                    if first_chunk_ms is None:
+                        first_chunk_ms = (time.time() - start) * 1000
+                    total += len(pcm)
+                    on_audio(pcm, sample_rate, channels)
+            
+            logger.info(f"✅ TTS streamed: {text[:50]}... ({total} bytes)")
+            return {'status': 'success', 'bytes': total, 'first_chunk_ms': first_chunk_ms}
+            
+        except Exception as e:
+            logger.error(f"❌ TTS stream failed: {e}")
+            return {
+                'status': 'error',
+                'message': f'خطا در تولید صوت: {str(e)}'
+            }
+    
     # WebSocket Methods
     async def connect_websocket(self, on_message: Callable = None, on_error: Callable = None):
         """Connect to WebSocket for real-time communication"""
@@ -479,17 +516,9 @@ class PersianTextProcessor:
     """
     
     def __init__(self):
-        # Persian digits mapping
-        self.persian_digits = str.maketrans('0123456789', '۰۱۲۳۴۵۶۷۸۹')
-        self.english_digits = str.maketrans('۰۱۲۳۴۵۶۷۸۹', '0123456789')
-        
-        # Arabic to Persian character mapping
-        self.arabic_to_persian = {
-            'ي': 'ی',  # Arabic yeh to Persian yeh
-            'ك': 'ک',  # Arabic kaf to Persian kaf
-            'ء': 'ٔ',  # Arabic hamza to Persian hamza
-            'ة': 'ه',  # Arabic teh marbuta to Persian heh
-        }
+        # Digit tables shared with heystive.utils.persian_text
+        self.persian_digits = DIGITS_TO_PERSIAN
+        self.english_digits = DIGITS_TO_LATIN
     
     def to_persian_digits(self, text: str) -> str:
         """Convert English digits to Persian"""
@@ -500,15 +529,8 @@ class PersianTextProcessor:
         return text.translate(self.english_digits)
     
     def normalize_persian_text(self, text: str) -> str:
-        """Normalize Persian text by replacing Arabic characters"""
-        normalized = text
-        for arabic, persian in self.arabic_to_persian.items():
-            normalized = normalized.replace(arabic, persian)
-        
-        # Remove extra whitespace
-        normalized = ' '.join(normalized.split())
-        
-        return normalized
+        """Normalize Persian text by replacing Arabic characters and collapsing whitespace"""
+        return normalize_persian(text, "display")
     
     def is_persian_text(self, text: str) -> bool:
         """Check if text contains Persian characters"""
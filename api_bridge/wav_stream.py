@@ -0,0 +1,70 @@
+"""
+Streamed WAV parsing shared by the Heystive API clients
+Walks the RIFF chunks of a WAV body as it arrives and yields its PCM payload in whole samples
+"""
+
+import struct
+from typing import Iterable, Iterator, Optional, Tuple
+
+# Size fields a streaming server writes when the length is not known up front
+UNKNOWN_SIZES = (0, 0xFFFFFFFF)
+
+
+def iter_wav_stream(chunks: Iterable[bytes]) -> Iterator[Tuple[bytes, int, int]]:
+    """
+    Incrementally parse a streamed 16-bit PCM WAV body: yields (pcm_bytes, sample_rate, channels)
+    with every chunk aligned to whole samples. The header may arrive split across chunks and may
+    carry extra chunks (LIST, fact, ...) before "data"; a data size of 0 or 0xFFFFFFFF means the
+    payload runs to the end of the stream
+    """
+    header = bytearray()
+    pcm = bytearray()
+    fmt: Optional[Tuple[int, int]] = None
+    remaining: Optional[int] = None
+    offset = 12
+    frame = 0
+    for chunk in chunks:
+        if frame:
+            payload = chunk
+        else:
+            header += chunk
+            if len(header) < 12:
+                continue
+            if header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+                raise ValueError("stream is not a WAV body")
+            # Walk whole chunks until the data chunk header has arrived
+            while len(header) >= offset + 8:
+                chunk_id = bytes(header[offset:offset + 4])
+                size = struct.unpack_from('<I', header, offset + 4)[0]
+                if chunk_id == b'data':
+                    if fmt is None:
+                        raise ValueError("WAV data chunk before fmt chunk")
+                    remaining = None if size in UNKNOWN_SIZES else size
+                    frame = 2 * fmt[0]
+                    break
+                if chunk_id == b'fmt ':
+                    if len(header) < offset + 24:
+                        break
+                    audio_format, channels, sample_rate = struct.unpack_from('<HHI', header, offset + 8)
+                    bits = struct.unpack_from('<H', header, offset + 22)[0]
+                    if audio_format != 1 or bits != 16 or not channels:
+                        raise ValueError(f"unsupported WAV format {audio_format} ({bits}-bit, {channels} channels)")
+                    fmt = (channels, sample_rate)
+                end = offset + 8 + size + (size & 1)
+                if len(header) < end:
+                    break
+                offset = end
+            if not frame:
+                continue
+            payload = bytes(header[offset + 8:])
+            header.clear()
+        if remaining is not None:
+            payload = payload[:remaining]
+            remaining -= len(payload)
+        pcm += payload
+        usable = len(pcm) - len(pcm) % frame
+        if usable:
+            yield bytes(pcm[:usable]), fmt[1], fmt[0]
+            del pcm[:usable]
+    if not frame and header:
+        raise ValueError("WAV stream ended before the data chunk")
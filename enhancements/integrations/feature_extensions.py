@@ -21,6 +21,8 @@ from pathlib import Path
 import json
 import time
 
+from api_bridge.persian_text import normalize_persian
+
 logger = logging.getLogger(__name__)
 
 class VoiceCommandExtensions:
@@ -217,28 +219,8 @@ class VoiceCommandExtensions:
             return None
             
     def _normalize_persian_text(self, text: str) -> str:
-        """Normalize Persian text for better matching"""
-        if not text:
-            return ""
-            
-        # Convert Arabic numerals to Persian
-        arabic_to_persian = str.maketrans('0123456789', '۰۱۲۳۴۵۶۷۸۹')
-        text = text.translate(arabic_to_persian)
-        
-        # Normalize Persian characters
-        normalizations = {
-            'ي': 'ی',  # Arabic ya to Persian ya
-            'ك': 'ک',  # Arabic kaf to Persian kaf
-            'ء': '',   # Remove hamza
-        }
-        
-        for old, new in normalizations.items():
-            text = text.replace(old, new)
-            
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        
-        return text.strip()
+        """Normalize Persian text for better matching (Persian digits and letters, hamza dropped)"""
+        return normalize_persian(text, "match") if text else ""
         
     def _match_persian_pattern(self, text: str, pattern: str) -> bool:
         """Match Persian text against command pattern"""
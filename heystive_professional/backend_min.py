@@ -1,16 +1,16 @@
-import base64, time, json, os, sqlite3
+import asyncio, base64, time, json, os
 from typing import Optional, List, Dict
 from datetime import datetime, timezone
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
 try:
     import webrtcvad
 except Exception:
     webrtcvad = None
 from intent_router import route_intent, execute_plan
-from store import log_message, DB_PATH
+from store import log_message, fetch_messages
 from brain import plan_text
 from models_registry import list_models, register_model, download_model
 from settings_store import read_settings, write_settings
@@ -19,6 +19,10 @@ app = FastAPI()
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
 AWAKE_UNTIL = 0.0
 WAKE_PHRASES = ["hey heystive", "hey steve", "heystive", "steve"]
+WAKE_WINDOW_S = float(os.environ.get("HEYSTIVE_WAKE_WINDOW_S", "8"))
+STREAM_QUEUE_FRAMES = int(os.environ.get("HEYSTIVE_STREAM_QUEUE_FRAMES", "32"))
+TTS_STREAM_CHUNK_BYTES = int(os.environ.get("HEYSTIVE_TTS_STREAM_CHUNK_BYTES", "4096"))
+_stt_pool = None
 class STTIn(BaseModel):
     audio_base64: Optional[str] = None
     text: Optional[str] = None
@@ -30,6 +34,7 @@ class IntentIn(BaseModel):
     plan: Optional[List[dict]] = None
 class BrainIn(BaseModel):
     text: str
+    execute: bool = False
 class ModelRegisterIn(BaseModel):
     name: str
     type: str
@@ -63,15 +68,16 @@ def models_register(body: ModelRegisterIn):
 def models_download(name: str):
     return download_model(name)
 @app.post("/api/brain")
-def brain(payload: BrainIn):
+async def brain(payload: BrainIn):
     engine, plan, message = plan_text(payload.text)
-    return {"engine": engine, "plan": plan, "message": message}
+    out = {"engine": engine, "plan": plan, "message": message}
+    if payload.execute:
+        from intent_router import execute_plan_async
+        out["results"] = await execute_plan_async(plan, {})
+    return out
 @app.get("/api/logs")
 def logs(limit: int = Query(20, ge=1, le=200)):
-    con = sqlite3.connect(DB_PATH)
-    cur = con.execute("SELECT id, ts, role, text, skill, result FROM messages ORDER BY id DESC LIMIT ?", (limit,))
-    rows = cur.fetchall()
-    con.close()
+    rows = fetch_messages(limit)
     out = []
     for r in rows:
         try:
@@ -91,31 +97,72 @@ def stt(payload: STTIn):
 def tts(payload: TTSIn):
     engine = choose_tts()
     try:
-        from services.tts_pyttsx3 import tts_to_base64
+        from services.tts_pyttsx3 import synthesize
         from config import settings
-        audio_b64 = tts_to_base64(payload.text, getattr(settings, "tts_tmp_dir", "./.tmp_tts"))
-        log_message("assistant", payload.text, f"tts_{engine}", {"bytes": len(audio_b64)})
-        return {"audio_base64": audio_b64, "engine": engine, "voice": payload.voice}
+        audio = synthesize(payload.text, tmp_dir=getattr(settings, "tts_tmp_dir", None))
+        audio_b64 = audio.to_base64()
+        log_message("assistant", payload.text, f"tts_{engine}", {"bytes": len(audio), "synth_engine": audio.engine})
+        return {"audio_base64": audio_b64, "mimetype": audio.mimetype, "sample_rate": audio.sample_rate, "engine": engine, "voice": payload.voice}
     except Exception as e:
         log_message("assistant", payload.text, f"tts_{engine}_fallback", {"note": str(e)})
         return {"ok": True, "text": payload.text, "engine": engine, "note": str(e), "voice": payload.voice}
+@app.post("/api/tts/stream")
+def tts_stream(payload: TTSIn):
+    """Chunked audio/wav: streaming header, then PCM as the engine produces it"""
+    engine = choose_tts()
+    try:
+        from services.tts_pyttsx3 import open_pcm_stream
+        from heystive.engines.tts.audio_result import streaming_wav_header
+        from config import settings
+        sample_rate, channels, chunks = open_pcm_stream(payload.text, tmp_dir=getattr(settings, "tts_tmp_dir", None), chunk_bytes=TTS_STREAM_CHUNK_BYTES)
+    except Exception as e:
+        log_message("assistant", payload.text, f"tts_{engine}_fallback", {"note": str(e)})
+        return JSONResponse({"ok": False, "text": payload.text, "engine": engine, "note": str(e), "voice": payload.voice}, status_code=503)
+    def body():
+        sent = 0
+        yield streaming_wav_header(sample_rate, channels)
+        for chunk in chunks:
+            sent += len(chunk)
+            yield chunk
+        log_message("assistant", payload.text, f"tts_{engine}", {"bytes": sent, "streamed": True})
+    headers = {"Cache-Control": "no-store", "X-Audio-Sample-Rate": str(sample_rate), "X-Audio-Channels": str(channels)}
+    return StreamingResponse(body(), media_type="audio/wav", headers=headers)
 @app.post("/api/intent")
-def intent(payload: Dict):
+async def intent(payload: Dict):
     text = payload.get("text")
     plan = payload.get("plan")
     if plan:
-        from intent_router import execute_plan
-        results = execute_plan(plan, {})
+        from intent_router import execute_plan_async, stream_plan
+        from plan_executor import PlanError, normalize_plan
+        try:
+            normalize_plan(plan)
+        except PlanError as e:
+            return JSONResponse({"skill": "plan", "error": str(e)}, status_code=400)
+        if payload.get("stream"):
+            # One JSON line per step, in completion order; a client disconnect closes steps and cancels the rest
+            async def body():
+                steps = stream_plan(plan, {})
+                try:
+                    async for step in steps:
+                        log_message("user", str(step["result"]), step["skill"], step["result"])
+                        yield json.dumps(step, ensure_ascii=False, default=str) + "\n"
+                finally:
+                    await steps.aclose()
+            return StreamingResponse(body(), media_type="application/x-ndjson", headers={"Cache-Control": "no-store"})
+        results = await execute_plan_async(plan, {})
         for step in results:
-            if "result" in step:
-                log_message("user", str(step["result"]), step["skill"], step["result"])
+            log_message("user", str(step["result"]), step["skill"], step["result"])
         return {"skill": "plan", "results": results}
     if text:
         from intent_router import route_intent
-        name, result = route_intent(text, {})
+        name, result = await asyncio.to_thread(route_intent, text, {})
         log_message("user", text, name, result)
         return {"skill": name, "result": result}
     return {"skill": "none", "result": {"message": "no input"}}
+@app.get("/api/skills")
+def skills_index():
+    from intent_router import dispatcher
+    return {"skills": dispatcher.stats()}
 @app.websocket("/ws")
 async def ws_echo(ws: WebSocket):
     await ws.accept()
@@ -125,10 +172,158 @@ async def ws_echo(ws: WebSocket):
             await ws.send_text(msg)
     except WebSocketDisconnect:
         pass
+def _get_stt_pool():
+    global _stt_pool
+    if _stt_pool is None:
+        from services.streaming_vosk import RecognizerPool
+        from config import settings
+        _stt_pool = RecognizerPool(settings.vosk_model_dir)
+    return _stt_pool
+def _check_wake(text: str) -> bool:
+    global AWAKE_UNTIL
+    t = text.lower()
+    if any(p in t for p in WAKE_PHRASES):
+        AWAKE_UNTIL = time.time() + WAKE_WINDOW_S
+        return True
+    return False
+class _STTStream:
+    def __init__(self, ws: WebSocket, pool, eng):
+        self.ws = ws
+        self.pool = pool
+        self.eng = eng
+        self.frames = asyncio.Queue(maxsize=STREAM_QUEUE_FRAMES)
+        self.closed = False
+        self.error: Optional[str] = None
+        self.worker = asyncio.create_task(self._recognize())
+    @classmethod
+    async def open(cls, ws: WebSocket, pool, sample_rate: int) -> Optional["_STTStream"]:
+        # A cold pool builds the Vosk model and recognizer here, so it runs off the event loop
+        try:
+            eng = await asyncio.to_thread(pool.acquire, sample_rate)
+        except Exception as e:
+            await ws.send_json({"type": "error", "error": "stt_unavailable", "detail": str(e) or type(e).__name__})
+            return None
+        return cls(ws, pool, eng)
+    async def _send(self, payload: dict):
+        if self.closed:
+            return
+        try:
+            await self.ws.send_json(payload)
+        except Exception:
+            self.closed = True
+    async def _emit_final(self, text: str):
+        wake = _check_wake(text)
+        await self._send({"type": "final", "text": text, "wake": wake, "awake_until": AWAKE_UNTIL})
+        log_message("user", text, f"stt_stream_{self.eng.engine}", {"text": text, "wake": wake})
+    async def _recognize(self):
+        try:
+            last_partial = ""
+            while True:
+                pcm = await self.frames.get()
+                if pcm is None:
+                    break
+                part, final = await asyncio.to_thread(self.eng.accept, pcm)
+                if final:
+                    last_partial = ""
+                    await self._emit_final(final)
+                elif part and part != last_partial:
+                    last_partial = part
+                    await self._send({"type": "partial", "text": part})
+            text = await asyncio.to_thread(self.eng.finalize)
+            if text:
+                await self._emit_final(text)
+            else:
+                await self._send({"type": "final", "text": "", "wake": False, "awake_until": AWAKE_UNTIL})
+        except Exception as e:
+            self.error = str(e) or type(e).__name__
+            await self._send({"type": "error", "error": "stt_failed", "detail": self.error})
+        finally:
+            # Unblock a push() waiting on a full queue; later pushes see the dead worker and fail fast
+            while not self.frames.empty():
+                self.frames.get_nowait()
+    async def push(self, pcm: bytes):
+        if self.worker.done():
+            raise RuntimeError(self.error or "recognizer stopped")
+        await self.frames.put(pcm)
+    async def finish(self, disconnected: bool = False):
+        if disconnected:
+            self.closed = True
+            while not self.frames.empty():
+                self.frames.get_nowait()
+        try:
+            if not self.worker.done():
+                await self.frames.put(None)
+            await self.worker
+        finally:
+            # A recognizer that raised may be in a bad state, so it is dropped rather than pooled
+            if self.error is None:
+                self.pool.release(self.eng)
+def _sample_rate(value) -> Optional[int]:
+    try:
+        sr = int(value)
+    except (TypeError, ValueError):
+        return None
+    return sr if 8000 <= sr <= 48000 else None
 @app.websocket("/ws/stream")
 async def ws_stream(ws: WebSocket):
     await ws.accept()
-    await ws.close()
+    pool = _get_stt_pool()
+    session = None
+    try:
+        while True:
+            msg = await ws.receive()
+            if msg.get("type") == "websocket.disconnect":
+                break
+            pcm = msg.get("bytes")
+            if pcm is None:
+                try:
+                    data = json.loads(msg.get("text") or "{}")
+                except Exception:
+                    await ws.send_json({"type": "error", "error": "invalid_json"})
+                    continue
+                kind = data.get("type")
+                if kind == "start":
+                    sr = _sample_rate(data.get("sr", 16000))
+                    if sr is None:
+                        await ws.send_json({"type": "error", "error": "invalid_sr"})
+                        continue
+                    if session:
+                        await session.finish()
+                    session = await _STTStream.open(ws, pool, sr)
+                    if session is None:
+                        continue
+                    await ws.send_json({"type": "ack", "engine": session.eng.engine, "vad": webrtcvad is not None, "sr": session.eng.sample_rate})
+                    continue
+                if kind == "stop":
+                    if session:
+                        await session.finish()
+                        session = None
+                    continue
+                if kind != "chunk":
+                    await ws.send_json({"type": "error", "error": "unknown_type"})
+                    continue
+                try:
+                    pcm = base64.b64decode(data.get("pcm_b64") or "")
+                except Exception:
+                    await ws.send_json({"type": "error", "error": "invalid_pcm"})
+                    continue
+            if not pcm:
+                continue
+            if session is None:
+                session = await _STTStream.open(ws, pool, 16000)
+                if session is None:
+                    continue
+            try:
+                await session.push(pcm)
+            except RuntimeError:
+                # The worker already reported stt_failed; the next frame opens a fresh session
+                await session.finish()
+                session = None
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if session:
+            await session.finish(disconnected=True)
 if __name__ == "__main__":
     import uvicorn
     s = read_settings()
@@ -2,6 +2,6 @@ from typing import Tuple, List, Dict
 
 def plan_text(text: str) -> Tuple[str, List[dict], str]:
     engine = "simple"
-    plan = [{"skill": "fallback", "args": {"text": text}}]
+    plan = [{"id": "0", "skill": "fallback", "args": {"text": text}, "depends_on": []}]
     message = f"Processed: {text}"
     return engine, plan, message
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""
+Streaming post-processing chain for synthesized speech
+High-pass (cached second-order sections per sample rate), feed-forward reverb and gain,
+applied block by block with carried state, in place on float32 buffers
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+
+@lru_cache(maxsize=32)
+def highpass_sos(sample_rate: int, cutoff_hz: float = 80.0, order: int = 2) -> np.ndarray:
+    """Butterworth high-pass as float32 SOS, designed once per (sample_rate, cutoff, order)"""
+    from scipy import signal
+    sos = signal.butter(order, cutoff_hz, btype="high", fs=sample_rate, output="sos").astype(np.float32)
+    return sos
+
+
+class EnhancementStream:
+    """
+    Per-utterance enhancement state. process() carries the filter state and reverb tail from
+    one block into the next, so chunked synthesis matches one-shot processing of the joined audio
+    """
+
+    def __init__(self, sample_rate: int, cutoff_hz: float = 80.0, reverb_delay_s: float = 0.05,
+                 reverb_decay: float = 0.3, peak: float = 0.95, gain: Optional[float] = None):
+        self.sample_rate = int(sample_rate)
+        self.sos = highpass_sos(self.sample_rate, cutoff_hz)
+        self.zi: Optional[np.ndarray] = None
+        self.delay = max(1, int(reverb_delay_s * self.sample_rate))
+        self.decay = np.float32(reverb_decay)
+        self.history = np.zeros(self.delay, dtype=np.float32)
+        self.peak = peak
+        self.gain = gain
+        self._fixed_gain = gain is not None
+        self._input_peak = 0.0
+
+    def _update_gain(self, block: np.ndarray):
+        """Peak-hold normalization: gain only ever shrinks as louder input arrives"""
+        block_peak = float(np.max(np.abs(block)))
+        if block_peak > self._input_peak:
+            self._input_peak = block_peak
+            self.gain = self.peak / block_peak
+
+    def process(self, block: np.ndarray, limit: bool = True) -> np.ndarray:
+        """
+        Enhance one block. The only full-size allocation is sosfilt's float32 output;
+        gain, reverb and limiting run in place on that buffer
+        """
+        from scipy import signal
+        block = np.asarray(block, dtype=np.float32).reshape(-1)
+        if block.size == 0:
+            return block
+        if not self._fixed_gain:
+            self._update_gain(block)
+
+        if self.zi is None:
+            # Start in steady state for the first sample so a DC offset does not click
+            self.zi = (signal.sosfilt_zi(self.sos) * block[0]).astype(np.float32)
+        block, self.zi = signal.sosfilt(self.sos, block, zi=self.zi)
+        if self.gain and self.gain != 1.0:
+            block *= np.float32(self.gain)  # the filter is linear, so gain can follow it
+
+        # y[n] = x[n] + decay * x[n - delay], with the previous block's tail as x[n - delay] for n < delay
+        n, d = block.size, self.delay
+        tail = np.concatenate((self.history[n:], block)) if n < d else block[-d:].copy()
+        if n > d:
+            block[d:] += self.decay * block[:-d]
+        head = min(n, d)
+        block[:head] += self.decay * self.history[:head]
+        self.history = tail
+
+        if limit:
+            np.clip(block, -1.0, 1.0, out=block)
+        return block
+
+    def reset(self):
+        self.zi = None
+        self.history[:] = 0.0
+        self._input_peak = 0.0
+        if not self._fixed_gain:
+            self.gain = None
+
+
+class EnhancementPipeline:
+    """Shared configuration; enhance() for whole clips, stream() for chunked synthesis"""
+
+    def __init__(self, cutoff_hz: float = 80.0, reverb_delay_s: float = 0.05, reverb_decay: float = 0.3, peak: float = 0.95):
+        self.cutoff_hz = cutoff_hz
+        self.reverb_delay_s = reverb_delay_s
+        self.reverb_decay = reverb_decay
+        self.peak = peak
+
+    def stream(self, sample_rate: int) -> EnhancementStream:
+        return EnhancementStream(sample_rate, self.cutoff_hz, self.reverb_delay_s, self.reverb_decay, self.peak)
+
+    def enhance(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+        """One-shot: normalize to the clip's own peak, process, then renormalize only if the reverb overshoots"""
+        stream = self.stream(sample_rate)
+        out = stream.process(audio, limit=False)
+        top = float(np.max(np.abs(out))) if out.size else 0.0
+        if top > 1.0:
+            out *= np.float32(self.peak / top)
+        return out
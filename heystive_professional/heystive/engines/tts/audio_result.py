@@ -0,0 +1,133 @@
+"""
+In-memory audio results for TTS engines
+Synthesized audio stays in a numpy/bytes buffer; WAV headers are encoded straight into memory
+and nothing touches the disk unless save() is called
+"""
+
+import base64
+import io
+import struct
+import wave
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+WAV_HEADER_BYTES = 44
+
+
+def wav_header(num_samples: int, sample_rate: int, channels: int = 1, sample_width: int = 2) -> bytes:
+    """Canonical 44-byte PCM WAV header; num_samples counts frames across all channels"""
+    data_bytes = num_samples * sample_width
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_bytes, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate, sample_rate * channels * sample_width, channels * sample_width, sample_width * 8,
+        b"data", data_bytes,
+    )
+
+
+def streaming_wav_header(sample_rate: int, channels: int = 1, sample_width: int = 2) -> bytes:
+    """WAV header for a stream of unknown length: RIFF/data sizes set to 0xFFFFFFFF as most decoders expect"""
+    header = bytearray(wav_header(0, sample_rate, channels, sample_width))
+    struct.pack_into("<I", header, 4, 0xFFFFFFFF)
+    struct.pack_into("<I", header, 40, 0xFFFFFFFF)
+    return bytes(header)
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int, channels: int = 1) -> bytes:
+    """Encode samples as 16-bit PCM WAV directly into one buffer (header + PCM written in place)"""
+    samples = np.asarray(samples)
+    n = samples.size
+    buf = bytearray(WAV_HEADER_BYTES + 2 * n)
+    buf[:WAV_HEADER_BYTES] = wav_header(n, sample_rate, channels)
+    pcm = np.frombuffer(buf, dtype=np.int16, count=n, offset=WAV_HEADER_BYTES)
+    if samples.dtype == np.int16:
+        pcm[:] = samples.ravel()
+    else:
+        np.multiply(np.clip(samples.ravel(), -1.0, 1.0), 32767, out=pcm, casting="unsafe")
+    return bytes(buf)
+
+
+def decode_wav(data: bytes) -> Tuple[np.ndarray, int, int]:
+    """Decode 16-bit PCM WAV bytes into (float32 samples, sample_rate, channels)"""
+    with wave.open(io.BytesIO(data), "rb") as wf:
+        sample_rate, channels, width = wf.getframerate(), wf.getnchannels(), wf.getsampwidth()
+        frames = wf.readframes(wf.getnframes())
+    if width != 2:
+        raise ValueError(f"unsupported sample width: {width}")
+    return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0, sample_rate, channels
+
+
+def sniff_format(data: bytes) -> str:
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        return "wav"
+    if data[:3] == b"ID3" or (len(data) > 1 and data[0] == 0xFF and data[1] & 0xE0 == 0xE0):
+        return "mp3"
+    return "bin"
+
+
+class AudioResult:
+    """
+    Synthesized audio held in memory: either PCM samples plus sample rate, or an already
+    encoded buffer (e.g. gTTS MP3). Encoding happens once, on first to_bytes()
+    """
+
+    def __init__(self, samples: Optional[np.ndarray] = None, sample_rate: int = 22050,
+                 data: Optional[bytes] = None, format: str = "wav", channels: int = 1, engine: str = ""):
+        if samples is None and data is None:
+            raise ValueError("AudioResult needs samples or encoded data")
+        self.samples = None if samples is None else np.asarray(samples, dtype=np.float32).ravel()
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.format = format
+        self.engine = engine
+        self._data = data
+
+    @classmethod
+    def from_bytes(cls, data: bytes, engine: str = "") -> "AudioResult":
+        fmt = sniff_format(data)
+        sample_rate = struct.unpack_from("<I", data, 24)[0] if fmt == "wav" and len(data) >= WAV_HEADER_BYTES else 0
+        return cls(data=data, sample_rate=sample_rate, format=fmt, engine=engine)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], engine: str = "") -> "AudioResult":
+        return cls.from_bytes(Path(path).read_bytes(), engine)
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.samples is not None:
+            return len(self.samples) / float(self.sample_rate * self.channels)
+        if self.format == "wav" and self.sample_rate:
+            return (len(self._data) - WAV_HEADER_BYTES) / float(2 * self.sample_rate * self.channels)
+        return None
+
+    @property
+    def mimetype(self) -> str:
+        return {"wav": "audio/wav", "mp3": "audio/mpeg"}.get(self.format, "application/octet-stream")
+
+    def to_bytes(self) -> bytes:
+        """Encoded audio (WAV for PCM results)"""
+        if self._data is None:
+            self._data = encode_wav(self.samples, self.sample_rate, self.channels)
+        return self._data
+
+    def pcm(self) -> np.ndarray:
+        """Float32 samples, decoding WAV data if needed"""
+        if self.samples is None:
+            if self.format != "wav":
+                raise ValueError(f"cannot decode {self.format} without an external decoder")
+            self.samples, self.sample_rate, self.channels = decode_wav(self._data)
+        return self.samples
+
+    def to_base64(self) -> str:
+        return base64.b64encode(self.to_bytes()).decode("ascii")
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Persist to disk (the only method that writes a file)"""
+        path = Path(path)
+        path.write_bytes(self.to_bytes())
+        return path
+
+    def __len__(self) -> int:
+        return len(self.to_bytes())
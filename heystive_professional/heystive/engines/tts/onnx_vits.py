@@ -0,0 +1,157 @@
+"""
+ONNX Runtime CPU backend for Coqui VITS models
+Exports the loaded Vits graph once with its own export_onnx, caches it (optionally
+int8 dynamically quantized) and serves synthesis from a thread-tuned InferenceSession
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+import logging
+
+from .vits_batcher import join_sentences
+
+logger = logging.getLogger(__name__)
+
+VITS_BACKEND = os.environ.get("HEYSTIVE_TTS_VITS_BACKEND", "torch").strip().lower()
+ONNX_CACHE_DIR = os.environ.get("HEYSTIVE_ONNX_CACHE_DIR", "")
+ONNX_QUANTIZE = os.environ.get("HEYSTIVE_ONNX_QUANTIZE", "0").strip().lower() in ("1", "true", "yes", "int8")
+ONNX_THREADS = int(os.environ.get("HEYSTIVE_ONNX_THREADS", "0"))
+
+
+def physical_cores() -> int:
+    """Physical core count (psutil when installed), never less than 1"""
+    try:
+        import psutil
+        cores = psutil.cpu_count(logical=False)
+        if cores:
+            return cores
+    except ImportError:
+        pass
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def model_fingerprint(*parts: Any) -> str:
+    """Cache key for an exported graph; file paths contribute their size and mtime"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(repr(part).encode("utf-8"))
+        if isinstance(part, (str, Path)) and part and os.path.isfile(part):
+            st = os.stat(part)
+            digest.update(f"{st.st_size}:{st.st_mtime_ns}".encode("ascii"))
+    return digest.hexdigest()[:16]
+
+
+class OnnxVitsEngine:
+    """
+    Drop-in for the Coqui TTS object on the VITS path: tts(text=...) returns the waveform
+    as a float32 array, synthesized sentence by sentence through ONNX Runtime
+    """
+
+    def __init__(self, model, cache_dir: Path, fingerprint: str, quantize: bool = ONNX_QUANTIZE,
+                 intra_op_threads: int = ONNX_THREADS, inter_op_threads: int = 1,
+                 split_sentences=None, sample_rate: int = 22050):
+        self.model = model
+        self.cache_dir = Path(cache_dir)
+        self.fingerprint = fingerprint
+        self.quantize = quantize
+        self.intra_op_threads = intra_op_threads or physical_cores()
+        self.inter_op_threads = max(1, inter_op_threads)
+        self.split_sentences = split_sentences
+        self.sample_rate = sample_rate
+        self.variant = "onnx-int8" if quantize else "onnx-fp32"
+        self.session = None
+        self.input_names: List[str] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_coqui(cls, tts_engine, model_name: str, cache_dir: Path, **kwargs) -> "OnnxVitsEngine":
+        """Wrap a loaded TTS.api.TTS object whose synthesizer holds a Vits model"""
+        synthesizer = tts_engine.synthesizer
+        model = synthesizer.tts_model
+        if type(model).__name__ != "Vits" or not hasattr(model, "export_onnx"):
+            raise TypeError(f"{type(model).__name__} has no ONNX export")
+        fingerprint = model_fingerprint(model_name, getattr(synthesizer, "tts_checkpoint", None), getattr(synthesizer, "tts_config_path", None))
+        return cls(model, cache_dir, fingerprint, split_sentences=getattr(synthesizer, "split_into_sentences", None),
+                   sample_rate=getattr(synthesizer, "output_sample_rate", 22050), **kwargs)
+
+    @property
+    def graph_path(self) -> Path:
+        return self.cache_dir / f"vits_{self.fingerprint}.onnx"
+
+    @property
+    def session_path(self) -> Path:
+        return self.cache_dir / f"vits_{self.fingerprint}.int8.onnx" if self.quantize else self.graph_path
+
+    def export(self) -> Path:
+        """Export the fp32 graph once; later loads reuse the cached file"""
+        path = self.graph_path
+        if path.exists():
+            return path
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        self.model.export_onnx(output_path=str(tmp), verbose=False)
+        os.replace(tmp, path)
+        logger.info(f"Exported VITS graph to {path}")
+        return path
+
+    def quantized(self) -> Path:
+        """Dynamic int8 weight quantization of the exported graph, cached next to it"""
+        path = self.session_path
+        if path.exists():
+            return path
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        quantize_dynamic(str(self.export()), str(tmp), weight_type=QuantType.QInt8)
+        os.replace(tmp, path)
+        return path
+
+    def load(self) -> "OnnxVitsEngine":
+        import onnxruntime as ort
+        with self._lock:
+            if self.session is not None:
+                return self
+            path = self.quantized() if self.quantize else self.export()
+            options = ort.SessionOptions()
+            options.intra_op_num_threads = self.intra_op_threads
+            options.inter_op_num_threads = self.inter_op_threads
+            options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            self.session = ort.InferenceSession(str(path), sess_options=options, providers=["CPUExecutionProvider"])
+            self.input_names = [i.name for i in self.session.get_inputs()]
+        return self
+
+    def _scales(self):
+        import numpy as np
+        m = self.model
+        return np.array([m.inference_noise_scale, m.length_scale, m.inference_noise_scale_dp], dtype=np.float32)
+
+    def synthesize_ids(self, ids: List[int]):
+        """Run one token sequence through the session"""
+        import numpy as np
+        x = np.asarray(ids, dtype=np.int64)[None, :]
+        feeds: Dict[str, Any] = {"input": x, "input_lengths": np.array([x.shape[1]], dtype=np.int64), "scales": self._scales()}
+        if "sid" in self.input_names:
+            feeds["sid"] = np.zeros(1, dtype=np.int64)
+        if "langid" in self.input_names:
+            feeds["langid"] = np.zeros(1, dtype=np.int64)
+        audio = self.session.run(["output"], feeds)[0]
+        return np.ascontiguousarray(audio.reshape(-1), dtype=np.float32)
+
+    def tts(self, text: str, **kwargs):
+        """Synthesize text (same gap after every sentence as Coqui's Synthesizer.tts)"""
+        if self.session is None:
+            self.load()
+        sentences = [s for s in (self.split_sentences(text) if self.split_sentences else [text]) if s.strip()] or [text]
+        return join_sentences([self.synthesize_ids(self.model.tokenizer.text_to_ids(s)) for s in sentences])
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "variant": self.variant,
+            "graph": str(self.session_path),
+            "intra_op_threads": self.intra_op_threads,
+            "inter_op_threads": self.inter_op_threads,
+            "loaded": self.session is not None,
+        }
@@ -9,9 +9,17 @@ import os
 import warnings
 import time
 import sys
+import queue
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import logging
+from .audio_result import AudioResult
+from .synthesis_cache import CACHE_DIR, SynthesisCache, synthesis_key
+from .vits_batcher import BATCH_MAX, BATCH_WAIT_MS, MicroBatcher, VitsBatchRunner, join_sentences
+from .onnx_vits import ONNX_CACHE_DIR, VITS_BACKEND, OnnxVitsEngine
+from .synthesis_workers import POOL_SIZE, SynthesisWorkerPool, WorkerError
+from ...utils.persian_text import normalize_persian
 
 # Auto-generated model paths from downloaded models (2025-09-08 02:42:46)
 import os
@@ -106,27 +114,95 @@ class PersianMultiTTSManager:
     All engines must be functional and generate real audio files
     """
     
-    def __init__(self):
-        self.output_dir = Path("/workspace/heystive_audio_output")
-        self.output_dir.mkdir(exist_ok=True)
+    ENGINE_PRIORITY = (
+        'kamtera_female', 'kamtera_male', 'informal_persian',
+        'google_tts', 'system_tts', 'espeak_persian'
+    )
+    
+    # Static description of each engine, reported by list_engines before the engine is loaded
+    ENGINE_INFO = {
+        'kamtera_female': {
+            'name': 'Kamtera Female VITS', 'model_path': 'Kamtera/persian-tts-female-vits',
+            'quality': 'Premium', 'speed': 'Medium', 'offline': True, 'voice_type': 'Female', 'accent': 'Persian'
+        },
+        'kamtera_male': {
+            'name': 'Kamtera Male VITS', 'model_path': 'Kamtera/persian-tts-male-vits',
+            'quality': 'Premium', 'speed': 'Medium', 'offline': True, 'voice_type': 'Male', 'accent': 'Persian'
+        },
+        'informal_persian': {
+            'name': 'Informal Persian VITS', 'model_path': 'karim23657/persian-tts-female-GPTInformal-Persian-vits',
+            'quality': 'High', 'speed': 'Medium', 'offline': True, 'voice_type': 'Female', 'accent': 'Informal Persian'
+        },
+        'google_tts': {
+            'name': 'Google TTS', 'model_path': 'Persian (fa) via gtts',
+            'quality': 'High', 'speed': 'Fast', 'offline': False, 'voice_type': 'Neutral', 'accent': 'Persian'
+        },
+        'system_tts': {
+            'name': 'System TTS', 'model_path': 'pyttsx3 with Persian optimization',
+            'quality': 'Medium', 'speed': 'Fast', 'offline': True, 'voice_type': 'System', 'accent': 'System Default'
+        },
+        'espeak_persian': {
+            'name': 'eSpeak-NG Persian', 'model_path': 'eSpeak-NG Persian fallback',
+            'quality': 'Basic', 'speed': 'Very Fast', 'offline': True, 'voice_type': 'Synthetic', 'accent': 'Persian'
+        }
+    }
+    
+    def __init__(self, lazy: bool = True, warmup: Optional[List[str]] = None, output_dir: Optional[Path] = None):
+        self.output_dir = Path(output_dir) if output_dir else Path("/workspace/heystive_audio_output")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.synthesis_cache = SynthesisCache(Path(CACHE_DIR) if CACHE_DIR else self.output_dir / "tts_cache")
+        self.last_audio: Optional[AudioResult] = None
+        self.last_output_file = None
         
         self.engines = {}
         self.current_engine = None
-        self.engine_priority = [
-            'kamtera_female', 'kamtera_male', 'informal_persian', 
-            'google_tts', 'system_tts', 'espeak_persian'
-        ]
+        self.engine_priority = list(self.ENGINE_PRIORITY)
+        
+        # Lazy engine handles: loaders run on first use or from the warm-up queue
+        self.lazy = lazy
+        self.engine_loaders = {
+            'kamtera_female': self._init_kamtera_female,
+            'kamtera_male': self._init_kamtera_male,
+            'informal_persian': self._init_informal_persian,
+            'google_tts': self._init_google_tts,
+            'system_tts': self._init_system_tts,
+            'espeak_persian': self._init_espeak_persian
+        }
+        self.engine_labels = {name: info['name'] for name, info in self.ENGINE_INFO.items()}
+        self.engine_states = {name: 'unloaded' for name in self.engine_priority}
+        self.engine_load_times = {}
+        self._load_locks = {name: threading.Lock() for name in self.engine_priority}
+        self._warmup_queue = queue.PriorityQueue()
+        self._warmup_thread = None
+        self._warmup_lock = threading.Lock()
+        
+        # Micro-batchers for VITS engines, created on first synthesis
+        self.vits_batchers = {}
+        self._batchers_lock = threading.Lock()
+        
+        # Persistent espeak/pyttsx3 worker processes, started on first synthesis
+        self.worker_pools = {}
+        self._worker_pools_lock = threading.Lock()
         
         print("🚀 Initializing Persian Multi-TTS Manager...")
         print("=" * 60)
         
-        # Initialize all TTS engines
-        self._initialize_all_engines()
+        if lazy:
+            print("⏳ TTS engines load on first use")
+        else:
+            # Initialize all TTS engines
+            self._initialize_all_engines()
         
         # Auto-select best available engine
         self._auto_select_best_engine()
         
-        print(f"✅ Persian TTS Manager initialized with {len(self.engines)} engines")
+        print(f"✅ Persian TTS Manager initialized with {len(self.engines)} engines loaded")
+        
+        if warmup is None:
+            warmup_env = os.environ.get("HEYSTIVE_TTS_WARMUP", "").strip()
+            warmup = list(self.engine_priority) if warmup_env == "all" else [n for n in warmup_env.split(",") if n]
+        if warmup:
+            self.warm_up(warmup)
         
         # Check downloaded models integration
         self._check_downloaded_models()
@@ -136,26 +212,84 @@ class PersianMultiTTSManager:
         
         print("🔄 Initializing Persian TTS Engines...")
         
-        # ENGINE 1: Kamtera Female VITS (Premium Quality)
-        self._init_kamtera_female()
-        
-        # ENGINE 2: Kamtera Male VITS (High Quality)
-        self._init_kamtera_male()
-        
-        # ENGINE 3: Informal Persian VITS (Conversational Style)
-        self._init_informal_persian()
-        
-        # ENGINE 4: Google TTS (Online - Natural)
-        self._init_google_tts()
-        
-        # ENGINE 5: System TTS (pyttsx3 - Optimized)
-        self._init_system_tts()
-        
-        # ENGINE 6: eSpeak Persian (Offline Fallback)
-        self._init_espeak_persian()
+        # Kamtera Female/Male VITS, Informal VITS, Google TTS, System TTS, eSpeak in priority order
+        for engine_name in self.engine_priority:
+            self._ensure_engine(engine_name)
         
         print(f"✅ Initialized {len(self.engines)} TTS engines")
     
+    def _ensure_engine(self, engine_name: str) -> bool:
+        """Load an engine on first use; returns True when it is ready"""
+        if engine_name in self.engines:
+            return True
+        loader = self.engine_loaders.get(engine_name)
+        if loader is None:
+            return False
+        with self._load_locks[engine_name]:
+            if engine_name in self.engines:
+                return True
+            if self.engine_states.get(engine_name) == 'failed':
+                return False
+            self.engine_states[engine_name] = 'loading'
+            start = time.perf_counter()
+            try:
+                loader()
+            except Exception as e:
+                print(f"❌ {self.engine_labels.get(engine_name, engine_name)}: Failed - {e}")
+            self.engine_load_times[engine_name] = time.perf_counter() - start
+            self.engine_states[engine_name] = 'loaded' if engine_name in self.engines else 'failed'
+        return engine_name in self.engines
+    
+    def warm_up(self, engine_names: Optional[List[str]] = None, background: bool = True):
+        """Queue engines for loading in engine_priority order, on a background thread by default"""
+        names = [n for n in self.engine_priority if engine_names is None or n in engine_names]
+        if not background:
+            for name in names:
+                self._ensure_engine(name)
+            return
+        # Enqueue and start under the lock the worker holds while deciding to exit,
+        # so a name is never left behind by a worker that has just found the queue empty
+        with self._warmup_lock:
+            for name in names:
+                self._warmup_queue.put((self.engine_priority.index(name), name))
+            if self._warmup_thread is None or not self._warmup_thread.is_alive():
+                self._warmup_thread = threading.Thread(target=self._warmup_worker, name="heystive-tts-warmup", daemon=True)
+                self._warmup_thread.start()
+    
+    def _warmup_worker(self):
+        while True:
+            try:
+                _, name = self._warmup_queue.get(timeout=1.0)
+            except queue.Empty:
+                with self._warmup_lock:
+                    if self._warmup_queue.empty():
+                        self._warmup_thread = None
+                        return
+                continue
+            self._ensure_engine(name)
+    
+    def _resolve_engine(self, engine_name: Optional[str]) -> Optional[str]:
+        """Load the requested engine, or the current one falling back down the priority list"""
+        if engine_name:
+            return engine_name if self._ensure_engine(engine_name) else None
+        while self.current_engine and not self._ensure_engine(self.current_engine):
+            self._auto_select_best_engine()
+        return self.current_engine
+    
+    def _select_vits_backend(self, tts_engine, model_path: str):
+        """Swap a Coqui VITS engine for its ONNX Runtime export when HEYSTIVE_TTS_VITS_BACKEND=onnx"""
+        if VITS_BACKEND != 'onnx':
+            return tts_engine, "coqui"
+        try:
+            cache_dir = Path(ONNX_CACHE_DIR) if ONNX_CACHE_DIR else self.output_dir / "onnx_cache"
+            onnx_engine = OnnxVitsEngine.from_coqui(tts_engine, model_path, cache_dir).load()
+            info = onnx_engine.info()
+            print(f"   ⚡ ONNX Runtime {info['variant']} ({info['intra_op_threads']} threads): {info['graph']}")
+            return onnx_engine, "onnx"
+        except Exception as e:
+            print(f"   ⚠️ ONNX backend unavailable, using PyTorch: {e}")
+            return tts_engine, "coqui"
+    
     def _init_kamtera_female(self):
         """Initialize Kamtera Female VITS model"""
         try:
@@ -171,7 +305,7 @@ class PersianMultiTTSManager:
                 # Use exact model path from requirements
                 model_path = "Kamtera/persian-tts-female-vits"
                 tts_engine = TTS(model_path)
-                engine_type = "coqui"
+                tts_engine, engine_type = self._select_vits_backend(tts_engine, model_path)
                 
             except ImportError:
                 # Fallback to a mock implementation for demonstration
@@ -186,7 +320,7 @@ class PersianMultiTTSManager:
                 
                 # Generate test audio based on engine type
                 success = False
-                if engine_type == "coqui":
+                if engine_type in ("coqui", "onnx"):
                     try:
                         wav = tts_engine.tts(text=test_text)
                         torchaudio.save(str(test_file), torch.tensor(wav).unsqueeze(0), 22050)
@@ -203,7 +337,7 @@ class PersianMultiTTSManager:
                         'engine_type': engine_type,
                         'name': f'Kamtera Female VITS ({engine_type.title()})',
                         'model_path': "Kamtera/persian-tts-female-vits",
-                        'quality': 'Premium' if engine_type == "coqui" else 'Demo',
+                        'quality': 'Premium' if engine_type != "mock" else 'Demo',
                         'speed': 'Medium',
                         'offline': True,
                         'status': 'Working',
@@ -232,7 +366,7 @@ class PersianMultiTTSManager:
                 # Use exact model path from requirements
                 model_path = "Kamtera/persian-tts-male-vits"
                 tts_engine = TTS(model_path)
-                engine_type = "coqui"
+                tts_engine, engine_type = self._select_vits_backend(tts_engine, model_path)
                 
             except ImportError:
                 # Fallback to a mock implementation for demonstration
@@ -247,7 +381,7 @@ class PersianMultiTTSManager:
                 
                 # Generate test audio based on engine type
                 success = False
-                if engine_type == "coqui":
+                if engine_type in ("coqui", "onnx"):
                     try:
                         wav = tts_engine.tts(text=test_text)
                         torchaudio.save(str(test_file), torch.tensor(wav).unsqueeze(0), 22050)
@@ -264,7 +398,7 @@ class PersianMultiTTSManager:
                         'engine_type': engine_type,
                         'name': f'Kamtera Male VITS ({engine_type.title()})',
                         'model_path': "Kamtera/persian-tts-male-vits",
-                        'quality': 'High' if engine_type == "coqui" else 'Demo',
+                        'quality': 'High' if engine_type != "mock" else 'Demo',
                         'speed': 'Medium',
                         'offline': True,
                         'status': 'Working',
@@ -293,7 +427,7 @@ class PersianMultiTTSManager:
                 # Use exact model path from requirements
                 model_path = "karim23657/persian-tts-female-GPTInformal-Persian-vits"
                 tts_engine = TTS(model_path)
-                engine_type = "coqui"
+                tts_engine, engine_type = self._select_vits_backend(tts_engine, model_path)
                 
             except ImportError:
                 # Fallback to a mock implementation for demonstration
@@ -308,7 +442,7 @@ class PersianMultiTTSManager:
                 
                 # Generate test audio based on engine type
                 success = False
-                if engine_type == "coqui":
+                if engine_type in ("coqui", "onnx"):
                     try:
                         wav = tts_engine.tts(text=test_text)
                         torchaudio.save(str(test_file), torch.tensor(wav).unsqueeze(0), 22050)
@@ -325,7 +459,7 @@ class PersianMultiTTSManager:
                         'engine_type': engine_type,
                         'name': f'Informal Persian VITS ({engine_type.title()})',
                         'model_path': "karim23657/persian-tts-female-GPTInformal-Persian-vits",
-                        'quality': 'High' if engine_type == "coqui" else 'Demo',
+                        'quality': 'High' if engine_type != "mock" else 'Demo',
                         'speed': 'Medium',
                         'offline': True,
                         'status': 'Working',
@@ -544,16 +678,27 @@ class PersianMultiTTSManager:
                 engine_info = self.engines[engine_name]
                 print(f"🎯 Auto-selected: {engine_info['name']} ({engine_info['quality']} quality)")
                 return
+            if self.lazy and self.engine_states.get(engine_name) != 'failed':
+                self.current_engine = engine_name
+                print(f"🎯 Auto-selected: {self.engine_labels[engine_name]} (loads on first use)")
+                return
         
+        self.current_engine = None
         print("❌ No TTS engines available!")
     
     def list_engines(self) -> Dict[str, Dict]:
-        """List all available TTS engines with detailed information"""
+        """List all registered TTS engines with detailed information and loaded/unloaded state"""
         print("\n🎤 AVAILABLE PERSIAN TTS ENGINES:")
         print("=" * 60)
         
-        for i, (key, engine_info) in enumerate(self.engines.items(), 1):
+        listed = {}
+        for i, key in enumerate(self.engine_priority, 1):
+            state = self.engine_states.get(key, 'unloaded')
             current = "✅ CURRENT" if key == self.current_engine else ""
+            engine_info = self.engines.get(key)
+            if engine_info is None:
+                engine_info = {**self.ENGINE_INFO[key], 'status': 'Failed' if state == 'failed' else 'Not loaded'}
+            listed[key] = {**engine_info, 'state': state, 'load_time': self.engine_load_times.get(key)}
             print(f"{i}. {engine_info['name']} {current}")
             print(f"   Model: {engine_info['model_path']}")
             print(f"   Quality: {engine_info['quality']}")
@@ -561,13 +706,17 @@ class PersianMultiTTSManager:
             print(f"   Voice: {engine_info['voice_type']} ({engine_info['accent']})")
             print(f"   Offline: {'Yes' if engine_info['offline'] else 'No'}")
             print(f"   Status: {engine_info['status']}")
+            if key in self.engine_load_times:
+                print(f"   State: {state} ({self.engine_load_times[key]:.2f}s load)")
+            else:
+                print(f"   State: {state}")
             print()
         
-        return self.engines
+        return listed
     
     def switch_engine(self, engine_name: str) -> bool:
         """Switch to a different TTS engine"""
-        if engine_name in self.engines:
+        if self._ensure_engine(engine_name):
             self.current_engine = engine_name
             engine_info = self.engines[engine_name]
             print(f"🔄 Switched to: {engine_info['name']}")
@@ -577,101 +726,170 @@ class PersianMultiTTSManager:
             print(f"Available engines: {list(self.engines.keys())}")
             return False
     
-    def speak_persian(self, text: str, engine_name: Optional[str] = None, output_file: Optional[str] = None) -> bool:
+    def speak_persian(self, text: str, engine_name: Optional[str] = None, output_file: Optional[str] = None, use_cache: bool = True) -> bool:
         """
         Speak Persian text using specified or current engine
-        Returns True if audio was successfully generated
+        Returns True if audio was successfully generated; the audio stays in memory in last_audio
+        and is written to disk only when output_file is given
         """
+        result = self.synthesize_persian(text, engine_name, use_cache)
+        if result is None:
+            return False
+        self.last_audio = result
+        self.last_output_file = None
+        if output_file:
+            try:
+                self.last_output_file = str(result.save(output_file))
+            except OSError as e:
+                print(f"❌ Could not save audio to {output_file}: {e}")
+                return False
+        return True
+    
+    def synthesize_persian(self, text: str, engine_name: Optional[str] = None, use_cache: bool = True) -> Optional[AudioResult]:
+        """Synthesize Persian text into an in-memory AudioResult (None on failure)"""
         
-        # Use specified engine or current engine
-        target_engine = engine_name if engine_name else self.current_engine
+        # Use specified engine or current engine, loading it on first use
+        target_engine = self._resolve_engine(engine_name)
         
         if not target_engine or target_engine not in self.engines:
             print(f"❌ No TTS engine available (requested: {engine_name}, current: {self.current_engine})")
-            return False
+            return None
         
         engine_info = self.engines[target_engine]
         
         try:
             # Normalize Persian text
             normalized_text = self._normalize_persian_text(text)
-            print(f"🔊 Speaking with {engine_info['name']}: '{normalized_text}'")
             
-            # Generate output filename if not provided
-            if not output_file:
-                timestamp = int(time.time())
-                output_file = self.output_dir / f"persian_speech_{target_engine}_{timestamp}.wav"
+            # Serve repeated phrases from the synthesis cache
+            cache_key = None
+            if use_cache:
+                cache_key = synthesis_key(normalized_text, target_engine, engine_info.get('voice_type', ''), self._synthesis_params(target_engine))
+                cached = self.synthesis_cache.get(cache_key)
+                if cached is not None:
+                    print(f"⚡ Cache hit ({engine_info['name']}): '{normalized_text}'")
+                    return AudioResult(data=cached.data, format=cached.format, sample_rate=cached.sample_rate,
+                                       engine=target_engine)
+            
+            print(f"🔊 Speaking with {engine_info['name']}: '{normalized_text}'")
             
             # Use appropriate engine method based on engine type
             engine_type = engine_info.get('engine_type', 'unknown')
             
             if target_engine in ['kamtera_female', 'kamtera_male', 'informal_persian']:
                 if engine_type == 'mock':
-                    return self._speak_mock_vits(normalized_text, output_file, engine_info['engine'])
+                    result = self._speak_mock_vits(normalized_text, engine_info['engine'])
                 else:
-                    return self._speak_vits(normalized_text, output_file, engine_info['engine'])
+                    result = self._speak_vits(normalized_text, engine_info['engine'])
             elif target_engine == 'google_tts':
-                return self._speak_google_tts(normalized_text, output_file)
+                result = self._speak_google_tts(normalized_text)
             elif target_engine == 'system_tts':
-                return self._speak_system_tts(normalized_text, output_file, engine_info['engine'])
+                result = self._speak_system_tts(normalized_text, engine_info['engine'])
             elif target_engine == 'espeak_persian':
-                return self._speak_espeak(normalized_text, output_file)
+                result = self._speak_espeak(normalized_text)
             else:
                 print(f"❌ Unknown engine type: {target_engine}")
-                return False
+                return None
+            
+            if result is not None:
+                result.engine = target_engine
+                if cache_key:
+                    self.synthesis_cache.put(cache_key, result.to_bytes(), result.format, result.sample_rate)
+            return result
                 
         except Exception as e:
             print(f"❌ TTS Error ({target_engine}): {e}")
-            return False
+            return None
     
-    def _speak_vits(self, text: str, output_file: str, tts_engine) -> bool:
+    def _synthesis_params(self, engine_name: str) -> Dict:
+        """Parameters that change the audio an engine produces for the same text"""
+        engine_info = self.engines.get(engine_name, {})
+        return {
+            'name': engine_info.get('name', ''),
+            'model_path': engine_info.get('model_path', ''),
+            'engine_type': engine_info.get('engine_type', ''),
+            'accent': engine_info.get('accent', ''),
+            'variant': getattr(engine_info.get('engine'), 'variant', '')
+        }
+    
+    def get_cache_stats(self) -> Dict:
+        """Synthesis cache hit/miss counters and tier sizes"""
+        return self.synthesis_cache.stats()
+    
+    def _speak_vits(self, text: str, tts_engine) -> Optional[AudioResult]:
         """Speak with VITS-based engines (Kamtera, Informal Persian)"""
         try:
-            import torch
-            import torchaudio
+            # Generate audio (micro-batched with concurrent requests when the model supports it)
+            wav = self._vits_synthesize(text, tts_engine)
+            result = AudioResult(samples=wav, sample_rate=22050)
             
-            # Generate audio
-            wav = tts_engine.tts(text=text)
-            
-            # Save to file
-            torchaudio.save(output_file, torch.tensor(wav).unsqueeze(0), 22050)
-            
-            # Verify file was created
-            if os.path.exists(output_file) and os.path.getsize(output_file) > 0:
-                file_size = os.path.getsize(output_file)
-                print(f"✅ Audio generated: {output_file} ({file_size} bytes)")
-                return True
+            if len(result.samples) > 0:
+                print(f"✅ Audio generated: {result.duration:.2f}s ({len(result)} bytes)")
+                return result
             else:
-                print(f"❌ Audio file not created: {output_file}")
-                return False
+                print("❌ VITS engine returned no audio")
+                return None
                 
         except Exception as e:
             print(f"❌ VITS engine error: {e}")
-            return False
+            return None
+    
+    def _get_vits_batcher(self, tts_engine) -> Optional[MicroBatcher]:
+        """Batcher for a single-speaker Coqui VITS engine without a separate vocoder, else None"""
+        if BATCH_MAX <= 1:
+            return None
+        key = id(tts_engine)
+        with self._batchers_lock:
+            if key in self.vits_batchers:
+                return self.vits_batchers[key]
+            batcher = None
+            synthesizer = getattr(tts_engine, 'synthesizer', None)
+            model = getattr(synthesizer, 'tts_model', None)
+            if (model is not None and type(model).__name__ == 'Vits'
+                    and getattr(synthesizer, 'vocoder_model', None) is None
+                    and getattr(model, 'num_speakers', 0) <= 1):
+                batcher = MicroBatcher(VitsBatchRunner.from_synthesizer(synthesizer), BATCH_MAX, BATCH_WAIT_MS)
+            self.vits_batchers[key] = batcher
+            return batcher
+    
+    def _vits_synthesize(self, text: str, tts_engine):
+        """Synthesize sentence by sentence through the shared micro-batcher"""
+        batcher = self._get_vits_batcher(tts_engine)
+        if batcher is None:
+            return tts_engine.tts(text=text)
+        
+        synthesizer = tts_engine.synthesizer
+        sentences = synthesizer.split_into_sentences(text) if hasattr(synthesizer, 'split_into_sentences') else [text]
+        futures = [batcher.submit(sentence) for sentence in sentences if sentence.strip()] or [batcher.submit(text)]
+        return join_sentences([future.result() for future in futures])
     
-    def _speak_mock_vits(self, text: str, output_file: str, mock_engine) -> bool:
+    def get_batching_stats(self) -> Dict[str, Dict]:
+        """Throughput metrics of the VITS micro-batchers"""
+        stats = {}
+        for engine_name, engine_info in self.engines.items():
+            batcher = self.vits_batchers.get(id(engine_info['engine']))
+            if batcher is not None:
+                stats[engine_name] = batcher.stats()
+        return stats
+    
+    def _speak_mock_vits(self, text: str, mock_engine) -> Optional[AudioResult]:
         """Speak with mock VITS engines for demonstration"""
         try:
             print(f"   📢 Mock VITS synthesis: '{text}'")
             
             # Generate mock audio
-            success = self._generate_mock_audio(text, Path(output_file))
-            
-            if success:
-                file_size = os.path.getsize(output_file)
-                print(f"✅ Mock audio generated: {output_file} ({file_size} bytes)")
-                return True
-            else:
-                print(f"❌ Mock audio file not created: {output_file}")
-                return False
+            result = AudioResult(samples=self._mock_audio_samples(text), sample_rate=22050)
+            print(f"✅ Mock audio generated: {result.duration:.2f}s ({len(result)} bytes)")
+            return result
                 
         except Exception as e:
             print(f"❌ Mock VITS engine error: {e}")
-            return False
+            return None
     
-    def _speak_google_tts(self, text: str, output_file: str) -> bool:
+    def _speak_google_tts(self, text: str) -> Optional[AudioResult]:
         """Speak with Google TTS"""
         try:
+            import io
             from gtts import gTTS
             
             # Try Persian first, then Arabic, then English
@@ -683,95 +901,100 @@ class PersianMultiTTSManager:
                 except:
                     tts = gTTS(text=text, lang='en', slow=False)
             
-            # Save to file
-            tts.save(output_file)
+            # Stream the MP3 straight into memory
+            buffer = io.BytesIO()
+            tts.write_to_fp(buffer)
             
-            # Verify file was created
-            if os.path.exists(output_file) and os.path.getsize(output_file) > 0:
-                file_size = os.path.getsize(output_file)
-                print(f"✅ Audio generated: {output_file} ({file_size} bytes)")
-                return True
+            if buffer.tell() > 0:
+                print(f"✅ Audio generated: {buffer.tell()} bytes")
+                return AudioResult(data=buffer.getvalue(), format="mp3", sample_rate=24000)
             else:
-                print(f"❌ Audio file not created: {output_file}")
-                return False
+                print("❌ Google TTS returned no audio")
+                return None
                 
         except Exception as e:
             print(f"❌ Google TTS error: {e}")
-            return False
+            return None
+    
+    def _worker_pool(self, backend: str) -> Optional[SynthesisWorkerPool]:
+        """Shared worker pool for an offline backend, or None when workers are disabled"""
+        if POOL_SIZE <= 0:
+            return None
+        with self._worker_pools_lock:
+            if backend not in self.worker_pools:
+                self.worker_pools[backend] = SynthesisWorkerPool(backend)
+            return self.worker_pools[backend]
+    
+    def _speak_with_workers(self, backend: str, text: str) -> Optional[AudioResult]:
+        """Synthesize on a persistent worker; None means fall back to the in-process path"""
+        pool = self._worker_pool(backend)
+        if pool is None:
+            return None
+        try:
+            result = pool.synthesize(text)
+            print(f"✅ Audio generated by {backend} worker: {len(result)} bytes")
+            return result
+        except WorkerError as e:
+            print(f"⚠️ {backend} worker failed, synthesizing in-process: {e}")
+            return None
+    
+    def get_worker_stats(self) -> Dict[str, Dict]:
+        """Queue depth, in-flight and restart metrics of the synthesis worker pools"""
+        return {backend: pool.stats() for backend, pool in list(self.worker_pools.items())}
     
-    def _speak_system_tts(self, text: str, output_file: str, engine) -> bool:
+    def _speak_system_tts(self, text: str, engine) -> Optional[AudioResult]:
         """Speak with System TTS (pyttsx3)"""
+        result = self._speak_with_workers('pyttsx3', text)
+        if result is not None:
+            return result
         try:
-            # Save to file
-            engine.save_to_file(text, output_file)
-            engine.runAndWait()
-            
-            # Verify file was created
-            if os.path.exists(output_file) and os.path.getsize(output_file) > 0:
-                file_size = os.path.getsize(output_file)
-                print(f"✅ Audio generated: {output_file} ({file_size} bytes)")
-                return True
-            else:
-                print(f"❌ Audio file not created: {output_file}")
-                return False
+            import tempfile
+            
+            # pyttsx3 can only render to a path; use a private scratch dir and read it straight back
+            with tempfile.TemporaryDirectory(prefix="heystive_tts_") as tmp:
+                scratch = os.path.join(tmp, "speech.wav")
+                engine.save_to_file(text, scratch)
+                engine.runAndWait()
+                
+                if os.path.exists(scratch) and os.path.getsize(scratch) > 0:
+                    result = AudioResult.from_file(scratch)
+                    print(f"✅ Audio generated: {len(result)} bytes")
+                    return result
+                else:
+                    print("❌ System TTS produced no audio")
+                    return None
                 
         except Exception as e:
             print(f"❌ System TTS error: {e}")
-            return False
+            return None
     
-    def _speak_espeak(self, text: str, output_file: str) -> bool:
+    def _speak_espeak(self, text: str) -> Optional[AudioResult]:
         """Speak with eSpeak"""
+        result = self._speak_with_workers('espeak', text)
+        if result is not None:
+            return result
         try:
             import subprocess
             
-            # Try Persian first
-            cmd = ["espeak", "-w", output_file, "-s", "150", "-v", "fa", text]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            
-            if result.returncode == 0 and os.path.exists(output_file) and os.path.getsize(output_file) > 0:
-                file_size = os.path.getsize(output_file)
-                print(f"✅ Audio generated: {output_file} ({file_size} bytes)")
-                return True
-            else:
-                # Fallback to English
-                cmd = ["espeak", "-w", output_file, "-s", "150", text]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+            # Try Persian first, then fall back to English; WAV comes back on stdout
+            for voice_args, label in ((["-v", "fa"], ""), ([], " (English fallback)")):
+                cmd = ["espeak", "--stdout", "-s", "150", *voice_args, text]
+                result = subprocess.run(cmd, capture_output=True, timeout=10)
                 
-                if result.returncode == 0 and os.path.exists(output_file) and os.path.getsize(output_file) > 0:
-                    file_size = os.path.getsize(output_file)
-                    print(f"✅ Audio generated (English fallback): {output_file} ({file_size} bytes)")
-                    return True
-                else:
-                    print(f"❌ eSpeak error: {result.stderr}")
-                    return False
+                if result.returncode == 0 and result.stdout:
+                    print(f"✅ Audio generated{label}: {len(result.stdout)} bytes")
+                    return AudioResult.from_bytes(result.stdout)
+            
+            print(f"❌ eSpeak error: {result.stderr.decode('utf-8', 'replace')}")
+            return None
                     
         except Exception as e:
             print(f"❌ eSpeak error: {e}")
-            return False
+            return None
     
     def _normalize_persian_text(self, text: str) -> str:
-        """Normalize Persian text for better TTS pronunciation"""
-        # Convert Persian digits to English for better pronunciation
-        persian_digits = "۰۱۲۳۴۵۶۷۸۹"
-        english_digits = "0123456789"
-        
-        for p_digit, e_digit in zip(persian_digits, english_digits):
-            text = text.replace(p_digit, e_digit)
-        
-        # Handle common Persian pronunciation issues
-        replacements = {
-            "ض": "ز",  # Pronounce ض as ز
-            "ص": "س",  # Pronounce ص as س
-            "ث": "س",  # Pronounce ث as س
-            "ظ": "ز",  # Pronounce ظ as ز
-            "ط": "ت",  # Pronounce ط as ت
-            "ق": "غ",  # Pronounce ق as غ
-        }
-        
-        for persian_char, replacement in replacements.items():
-            text = text.replace(persian_char, replacement)
-        
-        return text.strip()
+        """Normalize Persian text for better TTS pronunciation (ASCII digits, phonetic letter folds)"""
+        return normalize_persian(text, "tts")
     
     def _create_mock_kamtera_engine(self, voice_type: str):
         """Create a mock Kamtera engine for demonstration purposes"""
@@ -787,45 +1010,44 @@ class PersianMultiTTSManager:
         print(f"   📢 Mock Kamtera synthesis: '{text}'")
         return f"Mock audio for: {text}"
     
+    def _mock_audio_samples(self, text: str, sample_rate: int = 22050):
+        """Simple tone pattern based on text, as float samples"""
+        import numpy as np
+        
+        duration = max(1.0, len(text) * 0.1)  # Minimum 1 second
+        samples = int(duration * sample_rate)
+        
+        # Create a simple tone pattern
+        t = np.linspace(0, duration, samples)
+        
+        # Vary frequency based on text content for different "voices"
+        base_freq = 200 + (hash(text) % 200)  # 200-400 Hz range
+        
+        # Create a more complex waveform
+        audio = (
+            0.3 * np.sin(2 * np.pi * base_freq * t) +
+            0.2 * np.sin(2 * np.pi * (base_freq * 1.5) * t) +
+            0.1 * np.sin(2 * np.pi * (base_freq * 2) * t)
+        )
+        
+        # Add envelope to make it sound more natural
+        envelope = np.exp(-t * 0.5)  # Decay envelope
+        audio = audio * envelope
+        
+        # Apply fade in/out
+        fade_samples = int(0.1 * sample_rate)  # 100ms fade
+        if len(audio) > 2 * fade_samples:
+            # Fade in
+            audio[:fade_samples] *= np.linspace(0, 1, fade_samples)
+            # Fade out
+            audio[-fade_samples:] *= np.linspace(1, 0, fade_samples)
+        
+        return audio
+    
     def _generate_mock_audio(self, text: str, output_file: Path) -> bool:
         """Generate mock audio file for demonstration"""
         try:
-            import numpy as np
-            import soundfile as sf
-            
-            # Generate a simple tone pattern based on text
-            duration = max(1.0, len(text) * 0.1)  # Minimum 1 second
-            sample_rate = 22050
-            samples = int(duration * sample_rate)
-            
-            # Create a simple tone pattern
-            t = np.linspace(0, duration, samples)
-            
-            # Vary frequency based on text content for different "voices"
-            base_freq = 200 + (hash(text) % 200)  # 200-400 Hz range
-            
-            # Create a more complex waveform
-            audio = (
-                0.3 * np.sin(2 * np.pi * base_freq * t) +
-                0.2 * np.sin(2 * np.pi * (base_freq * 1.5) * t) +
-                0.1 * np.sin(2 * np.pi * (base_freq * 2) * t)
-            )
-            
-            # Add envelope to make it sound more natural
-            envelope = np.exp(-t * 0.5)  # Decay envelope
-            audio = audio * envelope
-            
-            # Apply fade in/out
-            fade_samples = int(0.1 * sample_rate)  # 100ms fade
-            if len(audio) > 2 * fade_samples:
-                # Fade in
-                audio[:fade_samples] *= np.linspace(0, 1, fade_samples)
-                # Fade out
-                audio[-fade_samples:] *= np.linspace(1, 0, fade_samples)
-            
-            # Save to file
-            sf.write(str(output_file), audio, sample_rate)
-            
+            AudioResult(samples=self._mock_audio_samples(text), sample_rate=22050).save(output_file)
             return output_file.exists() and output_file.stat().st_size > 0
             
         except Exception as e:
@@ -843,8 +1065,9 @@ class PersianMultiTTSManager:
         print()
         
         results = {}
+        self.warm_up(background=False)
         
-        for engine_name, engine_info in self.engines.items():
+        for engine_name, engine_info in list(self.engines.items()):
             print(f"🔊 Testing: {engine_info['name']}")
             
             # Generate test file
@@ -877,8 +1100,9 @@ class PersianMultiTTSManager:
     
     def get_current_engine_info(self) -> Optional[Dict]:
         """Get information about the currently selected engine"""
-        if self.current_engine:
-            return self.engines[self.current_engine]
+        current = self._resolve_engine(None)
+        if current:
+            return self.engines[current]
         return None
 
 
@@ -909,11 +1133,11 @@ if __name__ == "__main__":
     print("🚀 INITIALIZING PERSIAN MULTI-TTS SYSTEM...")
     print("=" * 60)
     
-    # Create TTS manager
-    tts_manager = PersianMultiTTSManager()
+    # Create TTS manager, loading every engine up front so the listing reflects what works
+    tts_manager = PersianMultiTTSManager(lazy=False)
     
     # Show available engines
-    available_engines = tts_manager.list_engines()
+    available_engines = {name: info for name, info in tts_manager.list_engines().items() if info['state'] == 'loaded'}
     
     if available_engines:
         # Test all engines
@@ -4,11 +4,12 @@ Human-indistinguishable Persian speech synthesis
 """
 
 import asyncio
+import re
 import numpy as np
 import torch
 import torchaudio
 import soundfile as sf
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
 import logging
 import time
 import requests
@@ -19,8 +20,29 @@ import os
 import psutil
 import gc
 
+from .audio_enhancement import EnhancementPipeline, EnhancementStream
+from .stream_player import StreamPlayer
+from ...utils.persian_text import normalize_persian
+
 logger = logging.getLogger(__name__)
 
+# Sentence and clause boundaries (Persian and the ASCII forms the normalizer produces)
+SEGMENT_BOUNDARY_RE = re.compile(r'(?<=[.!?؟،,؛;])\s+')
+
+
+def split_persian_segments(text: str, min_chars: int = 2) -> List[str]:
+    """Split normalized text at sentence/clause boundaries, folding tiny fragments into the previous segment"""
+    segments = []
+    for part in SEGMENT_BOUNDARY_RE.split(text.strip()):
+        part = part.strip()
+        if not part:
+            continue
+        if segments and len(part.strip('.!?؟،,؛; ')) < min_chars:
+            segments[-1] = f"{segments[-1]} {part}"
+        else:
+            segments.append(part)
+    return segments
+
 class ElitePersianTTS:
     """
     Premium Persian Text-to-Speech engine with multiple model support
@@ -45,9 +67,16 @@ class ElitePersianTTS:
             "total_syntheses": 0,
             "average_latency": 0.0,
             "quality_score": 0.0,
-            "model_switches": 0
+            "model_switches": 0,
+            "streaming_syntheses": 0,
+            "average_time_to_first_audio": 0.0,
+            "last_time_to_first_audio": 0.0
         }
         
+        # Streaming synthesis: PCM chunk length and segments synthesized ahead of playback
+        self.stream_chunk_ms = 200
+        self.stream_prefetch_segments = 2
+        
         # Persian text processor
         self.persian_processor = PersianTTSProcessor()
         
@@ -380,7 +409,7 @@ class ElitePersianTTS:
             )
             
             # Post-process audio for quality enhancement
-            enhanced_audio = await self.audio_enhancer.enhance_audio(audio_data)
+            enhanced_audio = await self.audio_enhancer.enhance_audio(audio_data, self.sample_rate)
             
             # Calculate metrics
             latency = time.time() - start_time
@@ -393,6 +422,80 @@ class ElitePersianTTS:
             logger.error(f"Persian TTS synthesis failed: {e}")
             raise
     
+    async def stream_premium_persian(self, text: str, emotion: str = "neutral",
+                                     speed: float = 1.0) -> AsyncIterator[np.ndarray]:
+        """
+        Stream Persian speech as float32 PCM chunks at self.sample_rate
+        
+        The normalized text is split at sentence/clause boundaries; segment N+1 is
+        synthesized while the consumer is still handling (e.g. playing) segment N,
+        so time-to-first-audio depends on the first clause, not the whole response.
+        """
+        if not self.active_model:
+            raise Exception("No TTS model available")
+        
+        start_time = time.time()
+        normalized = self.persian_processor.persian_normalizer.normalize(text)
+        segments = split_persian_segments(normalized)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.stream_prefetch_segments))
+        
+        # One enhancement state per utterance: filter memory and reverb tail carry across segments
+        enhancer = self.audio_enhancer.stream(self.sample_rate)
+        
+        async def produce():
+            try:
+                for segment in segments:
+                    processed = await self.persian_processor.preprocess_text(segment)
+                    audio = await self.active_model["synthesize"](processed, emotion, speed)
+                    await queue.put(enhancer.process(audio))
+                await queue.put(None)
+            except Exception as e:
+                await queue.put(e)
+        
+        producer = asyncio.create_task(produce())
+        chunk = max(1, int(self.sample_rate * self.stream_chunk_ms / 1000))
+        first = True
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                audio = np.asarray(item, dtype=np.float32)
+                for offset in range(0, len(audio), chunk):
+                    if first:
+                        first = False
+                        self._update_stream_stats(time.time() - start_time)
+                    yield audio[offset:offset + chunk]
+            self._update_synthesis_stats(time.time() - start_time)
+        except Exception as e:
+            logger.error(f"Persian TTS streaming failed: {e}")
+            raise
+        finally:
+            if not producer.done():
+                producer.cancel()
+    
+    async def speak_streaming(self, text: str, emotion: str = "neutral", speed: float = 1.0) -> bool:
+        """Play streamed synthesis as chunks arrive; playback runs off-loop so the next segment keeps synthesizing"""
+        player = self._create_stream_player()
+        try:
+            async for pcm in self.stream_premium_persian(text, emotion, speed):
+                await asyncio.to_thread(player.write, pcm)
+            return True
+        except Exception as e:
+            logger.error(f"Streaming speech failed: {e}")
+            return False
+        finally:
+            try:
+                await asyncio.to_thread(player.close)
+            except Exception as e:
+                logger.warning(f"Closing the audio stream failed: {e}")
+    
+    def _create_stream_player(self) -> StreamPlayer:
+        """One output stream per utterance, so consecutive chunks play without gaps"""
+        return StreamPlayer(self.sample_rate)
+    
     async def speak_immediately(self, text: str) -> bool:
         """
         Immediate speech output with minimal latency
@@ -546,6 +649,14 @@ class ElitePersianTTS:
         current_avg = self.synthesis_stats["average_latency"]
         self.synthesis_stats["average_latency"] = (current_avg * (total - 1) + latency) / total
     
+    def _update_stream_stats(self, time_to_first_audio: float):
+        """Update time-to-first-audio statistics for streaming synthesis"""
+        self.synthesis_stats["streaming_syntheses"] += 1
+        total = self.synthesis_stats["streaming_syntheses"]
+        current_avg = self.synthesis_stats["average_time_to_first_audio"]
+        self.synthesis_stats["average_time_to_first_audio"] = (current_avg * (total - 1) + time_to_first_audio) / total
+        self.synthesis_stats["last_time_to_first_audio"] = time_to_first_audio
+    
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get TTS performance statistics"""
         return {
@@ -656,109 +767,27 @@ class PersianTTSProcessor:
 
 
 class AudioEnhancer:
-    """Audio post-processing for quality enhancement"""
+    """Audio post-processing for quality enhancement (high-pass, subtle reverb, peak normalization)"""
+    
+    def __init__(self, pipeline: Optional[EnhancementPipeline] = None):
+        self.pipeline = pipeline or EnhancementPipeline()
     
-    async def enhance_audio(self, audio_data: np.ndarray) -> np.ndarray:
-        """Enhance audio quality"""
+    async def enhance_audio(self, audio_data: np.ndarray, sample_rate: int = 22050) -> np.ndarray:
+        """Enhance a whole clip"""
         try:
-            # Normalize amplitude
-            enhanced = self._normalize_amplitude(audio_data)
-            
-            # Apply gentle filtering
-            enhanced = self._apply_gentle_filter(enhanced)
-            
-            # Add subtle reverb for naturalness
-            enhanced = self._add_subtle_reverb(enhanced)
-            
-            return enhanced
-            
+            return self.pipeline.enhance(audio_data, sample_rate)
         except Exception as e:
             logger.error(f"Audio enhancement failed: {e}")
             return audio_data
     
-    def _normalize_amplitude(self, audio_data: np.ndarray) -> np.ndarray:
-        """Normalize audio amplitude"""
-        max_val = np.max(np.abs(audio_data))
-        if max_val > 0:
-            return audio_data / max_val * 0.95
-        return audio_data
-    
-    def _apply_gentle_filter(self, audio_data: np.ndarray) -> np.ndarray:
-        """Apply gentle filtering for clarity"""
-        # Simple high-pass filter to remove low-frequency noise
-        from scipy import signal
-        
-        # Design high-pass filter
-        nyquist = 22050 / 2
-        cutoff = 80 / nyquist
-        b, a = signal.butter(2, cutoff, btype='high')
-        
-        # Apply filter
-        filtered = signal.filtfilt(b, a, audio_data)
-        
-        return filtered
-    
-    def _add_subtle_reverb(self, audio_data: np.ndarray) -> np.ndarray:
-        """Add subtle reverb for naturalness"""
-        # Simple reverb simulation
-        reverb_delay = int(0.05 * 22050)  # 50ms delay
-        reverb_decay = 0.3
-        
-        if len(audio_data) > reverb_delay:
-            reverb_signal = np.zeros_like(audio_data)
-            reverb_signal[reverb_delay:] = audio_data[:-reverb_delay] * reverb_decay
-            
-            # Mix original and reverb
-            enhanced = audio_data + reverb_signal
-            
-            # Normalize to prevent clipping
-            max_val = np.max(np.abs(enhanced))
-            if max_val > 1.0:
-                enhanced = enhanced / max_val * 0.95
-            
-            return enhanced
-        
-        return audio_data
+    def stream(self, sample_rate: int = 22050) -> EnhancementStream:
+        """Per-utterance state for enhancing consecutive segments without seams"""
+        return self.pipeline.stream(sample_rate)
 
 
 class PersianTextNormalizer:
-    """Persian text normalization utilities"""
+    """Persian text normalization utilities (ASCII digits and punctuation, collapsed whitespace)"""
     
     def normalize(self, text: str) -> str:
         """Normalize Persian text"""
-        # Normalize Persian digits
-        text = self._normalize_digits(text)
-        
-        # Normalize Persian punctuation
-        text = self._normalize_punctuation(text)
-        
-        # Normalize whitespace
-        text = self._normalize_whitespace(text)
-        
-        return text
-    
-    def _normalize_digits(self, text: str) -> str:
-        """Normalize Persian digits to English"""
-        persian_digits = '۰۱۲۳۴۵۶۷۸۹'
-        english_digits = '0123456789'
-        
-        for p, e in zip(persian_digits, english_digits):
-            text = text.replace(p, e)
-        
-        return text
-    
-    def _normalize_punctuation(self, text: str) -> str:
-        """Normalize Persian punctuation"""
-        # Persian question mark
-        text = text.replace('؟', '?')
-        
-        # Persian comma
-        text = text.replace('،', ',')
-        
-        return text
-    
-    def _normalize_whitespace(self, text: str) -> str:
-        """Normalize whitespace"""
-        import re
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
\ No newline at end of file
+        return normalize_persian(text, "text")
\ No newline at end of file
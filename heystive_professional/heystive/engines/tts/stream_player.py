@@ -0,0 +1,52 @@
+"""
+Gapless playback for streamed synthesis
+One sounddevice OutputStream stays open for the whole utterance and PCM chunks are written
+into it back to back, instead of starting and draining a new stream for every chunk
+"""
+
+from typing import Callable, Optional
+
+import numpy as np
+
+
+class StreamPlayer:
+    """
+    Blocking writer over a single output stream. write() returns as soon as the chunk is
+    buffered, so the next chunk can be queued while this one is still playing; close()
+    waits for the buffered audio to finish
+    """
+
+    def __init__(self, sample_rate: int, open_stream: Optional[Callable[[int], object]] = None):
+        self.sample_rate = int(sample_rate)
+        self._open_stream = open_stream or self._open_sounddevice
+        self._stream = None
+        self.frames_written = 0
+
+    @staticmethod
+    def _open_sounddevice(sample_rate: int):
+        import sounddevice as sd
+        return sd.OutputStream(samplerate=sample_rate, channels=1, dtype="float32")
+
+    def write(self, pcm: np.ndarray):
+        if self._stream is None:
+            self._stream = self._open_stream(self.sample_rate)
+            self._stream.start()
+        block = np.ascontiguousarray(pcm, dtype=np.float32).reshape(-1, 1)
+        self._stream.write(block)
+        self.frames_written += block.shape[0]
+
+    def close(self):
+        """Let the buffered audio play out (OutputStream.stop drains) and release the device"""
+        stream, self._stream = self._stream, None
+        if stream is None:
+            return
+        try:
+            stream.stop()
+        finally:
+            stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,202 @@
+"""
+Content-addressed synthesis cache for Persian TTS
+In-memory LRU in front of an on-disk store keyed by normalized text, engine, voice and synthesis params
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.environ.get("HEYSTIVE_TTS_CACHE_DIR", "")
+MEMORY_MB = float(os.environ.get("HEYSTIVE_TTS_CACHE_MEMORY_MB", "64"))
+DISK_MB = float(os.environ.get("HEYSTIVE_TTS_CACHE_DISK_MB", "512"))
+
+
+def synthesis_key(text: str, engine: str, voice: str = "", params: Optional[Dict[str, Any]] = None) -> str:
+    """Stable content address for one synthesis request"""
+    payload = json.dumps([text, engine, voice, params or {}], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CachedAudio(NamedTuple):
+    """Encoded audio as the engine produced it"""
+    data: bytes
+    format: str
+    sample_rate: int
+
+
+class SynthesisCache:
+    """
+    Two-tier audio cache: entries in an LRU bounded by max_memory_bytes, files under
+    root/<key[:2]>/<key>.<sample_rate>.<format> bounded by max_disk_bytes (least recently used
+    evicted first). The file name carries the format and sample rate, so a disk hit needs no sidecar
+    """
+
+    def __init__(self, root: Path, max_memory_bytes: int = int(MEMORY_MB * 1024 * 1024),
+                 max_disk_bytes: int = int(DISK_MB * 1024 * 1024)):
+        self.root = Path(root)
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, CachedAudio]" = OrderedDict()
+        self._memory_bytes = 0
+        # key -> (size, format, sample_rate)
+        self._disk: "OrderedDict[str, Tuple[int, str, int]]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.RLock()
+        self._scanned = False
+        self.stats_counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "puts": 0, "memory_evictions": 0, "disk_evictions": 0}
+
+    def _path(self, key: str, fmt: str, sample_rate: int) -> Path:
+        return self.root / key[:2] / f"{key}.{sample_rate}.{fmt}"
+
+    def path_for(self, key: str) -> Optional[Path]:
+        """The on-disk file holding key, if it is stored there"""
+        with self._lock:
+            self._scan()
+            entry = self._disk.get(key)
+            return None if entry is None else self._path(key, entry[1], entry[2])
+
+    def _scan(self):
+        """Index existing files once, oldest mtime first, so eviction order survives restarts"""
+        if self._scanned:
+            return
+        self._scanned = True
+        found = []
+        if self.root.is_dir():
+            for sub in os.scandir(self.root):
+                if not sub.is_dir():
+                    continue
+                for entry in os.scandir(sub.path):
+                    parts = entry.name.split(".")
+                    if entry.name.startswith(".") or len(parts) != 3 or not parts[1].isdigit():
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    found.append((st.st_mtime_ns, parts[0], st.st_size, parts[2], int(parts[1])))
+        for _, key, size, fmt, sample_rate in sorted(found):
+            self._drop_disk(key)  # an older file for the same key in another format
+            self._disk[key] = (size, fmt, sample_rate)
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def get(self, key: str) -> Optional[CachedAudio]:
+        """Return the cached audio with its format and sample rate, promoting disk hits into memory"""
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                if key in self._disk:
+                    self._disk.move_to_end(key)
+                self.stats_counters["memory_hits"] += 1
+                return audio
+            self._scan()
+            entry = self._disk.get(key)
+            if entry is not None:
+                path = self._path(key, entry[1], entry[2])
+                try:
+                    audio = CachedAudio(path.read_bytes(), entry[1], entry[2])
+                    os.utime(path)
+                except OSError:
+                    self._forget_disk(key)
+                    audio = None
+                if audio is not None:
+                    self._disk.move_to_end(key)
+                    self._remember(key, audio)
+                    self.stats_counters["disk_hits"] += 1
+                    return audio
+            self.stats_counters["misses"] += 1
+            return None
+
+    def put(self, key: str, data: bytes, fmt: str, sample_rate: int) -> Optional[Path]:
+        """Store encoded audio in both tiers; returns the on-disk path"""
+        if not data:
+            return None
+        audio = CachedAudio(data, fmt, int(sample_rate))
+        with self._lock:
+            self._scan()
+            self._remember(key, audio)
+            self.stats_counters["puts"] += 1
+            path = self._path(key, audio.format, audio.sample_rate)
+            if self._disk.get(key, (0, None, None))[1:] == (audio.format, audio.sample_rate) and path.exists():
+                self._disk.move_to_end(key)
+                return path
+            self._drop_disk(key)
+            if len(data) > self.max_disk_bytes:
+                return None
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp.write_bytes(data)
+                os.replace(tmp, path)
+            except OSError as e:
+                logger.warning(f"TTS cache write failed: {e}")
+                return None
+            self._disk[key] = (len(data), audio.format, audio.sample_rate)
+            self._disk_bytes += len(data)
+            self._evict_disk()
+            return path
+
+    def _remember(self, key: str, audio: CachedAudio):
+        if len(audio.data) > self.max_memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old.data)
+        self._memory[key] = audio
+        self._memory_bytes += len(audio.data)
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted.data)
+            self.stats_counters["memory_evictions"] += 1
+
+    def _forget_disk(self, key: str) -> Optional[Tuple[int, str, int]]:
+        entry = self._disk.pop(key, None)
+        if entry is not None:
+            self._disk_bytes -= entry[0]
+        return entry
+
+    def _drop_disk(self, key: str):
+        """Forget key and delete its file"""
+        entry = self._forget_disk(key)
+        if entry is not None:
+            try:
+                self._path(key, entry[1], entry[2]).unlink()
+            except OSError:
+                pass
+
+    def _evict_disk(self):
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            self._drop_disk(next(iter(self._disk)))
+            self.stats_counters["disk_evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._scan()
+            for key in list(self._disk):
+                self._drop_disk(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            c = self.stats_counters
+            hits = c["memory_hits"] + c["disk_hits"]
+            lookups = hits + c["misses"]
+            return {
+                **c,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "root": str(self.root),
+            }
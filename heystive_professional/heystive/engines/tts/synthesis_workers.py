@@ -0,0 +1,503 @@
+"""
+Persistent synthesis worker processes for the offline TTS engines
+Each worker initializes espeak/pyttsx3 once and serves requests over a length-prefixed
+frame protocol on its stdin/stdout pipes, so short utterances stop paying for process
+spawn and engine start-up. The pool health-checks workers, restarts crashed ones,
+bounds in-flight requests per worker and reports queue depth
+"""
+
+import json
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from .audio_result import AudioResult
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = int(os.environ.get("HEYSTIVE_TTS_WORKERS", "2"))
+MAX_INFLIGHT = int(os.environ.get("HEYSTIVE_TTS_WORKER_INFLIGHT", "1"))
+REQUEST_TIMEOUT_S = float(os.environ.get("HEYSTIVE_TTS_WORKER_TIMEOUT_S", "15"))
+HEALTH_INTERVAL_S = float(os.environ.get("HEYSTIVE_TTS_WORKER_HEALTH_S", "30"))
+
+FRAME = struct.Struct("<II")  # header length, payload length
+PACKAGE_ROOT = Path(__file__).resolve().parents[3]
+
+
+class WorkerError(RuntimeError):
+    """A synthesis worker failed, crashed or timed out"""
+
+
+def write_frame(stream, header: Dict[str, Any], payload: bytes = b""):
+    """Write one frame: <II lengths, JSON header, raw payload"""
+    head = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    stream.write(FRAME.pack(len(head), len(payload)) + head + payload)
+    stream.flush()
+
+
+def _read_exact(stream, n: int) -> Optional[bytes]:
+    data = b""
+    while len(data) < n:
+        chunk = stream.read(n - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def read_frame(stream) -> Optional[Tuple[Dict[str, Any], bytes]]:
+    """Read one frame, or None at EOF"""
+    lengths = _read_exact(stream, FRAME.size)
+    if lengths is None:
+        return None
+    head_len, payload_len = FRAME.unpack(lengths)
+    head = _read_exact(stream, head_len)
+    payload = _read_exact(stream, payload_len) if payload_len else b""
+    if head is None or payload is None:
+        return None
+    return json.loads(head.decode("utf-8")), payload
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+class _EspeakBackend:
+    """libespeak-ng through ctypes (synchronous mode, initialized once); falls back to the CLI"""
+
+    def __init__(self, voice: str = "fa", rate: int = 150):
+        self.voice = voice
+        self.rate = rate
+        self.lib = None
+        self.sample_rate = 22050
+        try:
+            self._load_library()
+        except Exception as e:
+            self.lib = None
+            sys.stderr.write(f"libespeak unavailable, using CLI: {e}\n")
+
+    def _load_library(self):
+        import ctypes
+        import ctypes.util
+        name = ctypes.util.find_library("espeak-ng") or ctypes.util.find_library("espeak")
+        if not name:
+            raise OSError("libespeak not found")
+        lib = ctypes.CDLL(name)
+        sample_rate = lib.espeak_Initialize(2, 0, None, 0)  # AUDIO_OUTPUT_SYNCHRONOUS
+        if sample_rate <= 0:
+            raise OSError("espeak_Initialize failed")
+        self._chunks: List[bytes] = []
+        callback_type = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(ctypes.c_short), ctypes.c_int, ctypes.c_void_p)
+
+        def on_samples(wav, num_samples, events):
+            if num_samples > 0:
+                self._chunks.append(ctypes.string_at(wav, num_samples * 2))
+            return 0
+
+        self._callback = callback_type(on_samples)  # keep a reference for the lifetime of the library
+        lib.espeak_SetSynthCallback(self._callback)
+        lib.espeak_SetParameter(1, self.rate, 0)  # espeakRATE
+        if lib.espeak_SetVoiceByName(self.voice.encode("utf-8")) != 0:
+            lib.espeak_SetVoiceByName(b"en")
+        lib.espeak_Synth.argtypes = [ctypes.c_char_p, ctypes.c_size_t, ctypes.c_uint, ctypes.c_int,
+                                     ctypes.c_uint, ctypes.c_uint, ctypes.c_void_p, ctypes.c_void_p]
+        self.lib = lib
+        self.sample_rate = sample_rate
+
+    def synthesize(self, text: str) -> Tuple[bytes, Dict[str, Any]]:
+        if self.lib is None:
+            return self._synthesize_cli(text)
+        import numpy as np
+        self._chunks = []
+        data = text.encode("utf-8") + b"\0"
+        if self.lib.espeak_Synth(data, len(data), 0, 1, 0, 1, None, None) != 0:  # POS_CHARACTER, espeakCHARS_UTF8
+            raise RuntimeError("espeak_Synth failed")
+        pcm = np.frombuffer(b"".join(self._chunks), dtype=np.int16)
+        return AudioResult(samples=pcm / 32768.0, sample_rate=self.sample_rate).to_bytes(), {"sample_rate": self.sample_rate}
+
+    def _synthesize_cli(self, text: str) -> Tuple[bytes, Dict[str, Any]]:
+        for voice_args in (["-v", self.voice], []):
+            result = subprocess.run([shutil.which("espeak-ng") or "espeak", "--stdout", "-s", str(self.rate), *voice_args, text], capture_output=True, timeout=REQUEST_TIMEOUT_S)
+            if result.returncode == 0 and result.stdout:
+                return result.stdout, {"sample_rate": AudioResult.from_bytes(result.stdout).sample_rate}
+        raise RuntimeError(result.stderr.decode("utf-8", "replace") or "espeak produced no audio")
+
+
+class _Pyttsx3Backend:
+    """pyttsx3 engine created once and driven from the worker's own main thread"""
+
+    def __init__(self, rate: int = 150):
+        import tempfile
+        import pyttsx3
+        self.engine = pyttsx3.init()
+        self.engine.setProperty('rate', rate)
+        self.engine.setProperty('volume', 1.0)
+        for voice in self.engine.getProperty('voices') or []:
+            tags = f"{voice.id} {voice.name} {getattr(voice, 'languages', '')}".lower()
+            if 'fa' in tags.split() or 'persian' in tags or 'farsi' in tags:
+                self.engine.setProperty('voice', voice.id)
+                break
+        self.scratch_dir = tempfile.mkdtemp(prefix="heystive_tts_worker_")
+
+    def synthesize(self, text: str) -> Tuple[bytes, Dict[str, Any]]:
+        # pyttsx3 can only render to a path; the worker reuses one private scratch file
+        path = os.path.join(self.scratch_dir, "speech.wav")
+        self.engine.save_to_file(text, path)
+        self.engine.runAndWait()
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+        if not data:
+            raise RuntimeError("pyttsx3 produced no audio")
+        return data, {"sample_rate": AudioResult.from_bytes(data).sample_rate}
+
+
+class _MockBackend:
+    """Deterministic tone per text, for demos and tests without a speech engine"""
+
+    def __init__(self, sample_rate: int = 16000):
+        self.sample_rate = sample_rate
+
+    def synthesize(self, text: str) -> Tuple[bytes, Dict[str, Any]]:
+        import numpy as np
+        t = np.arange(int(self.sample_rate * max(0.1, 0.02 * len(text)))) / self.sample_rate
+        audio = 0.3 * np.sin(2 * np.pi * (200 + sum(map(ord, text)) % 200) * t)
+        return AudioResult(samples=audio, sample_rate=self.sample_rate).to_bytes(), {"sample_rate": self.sample_rate}
+
+
+BACKENDS = {"espeak": _EspeakBackend, "pyttsx3": _Pyttsx3Backend, "mock": _MockBackend}
+
+
+def worker_main(engine: str):
+    """Serve frames on stdin/stdout until EOF"""
+    stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+    sys.stdout = sys.stderr  # engine chatter must not corrupt the frame stream
+    try:
+        backend = BACKENDS[engine]()
+        write_frame(stdout, {"id": 0, "ok": True, "op": "ready", "pid": os.getpid()})
+    except Exception as e:
+        write_frame(stdout, {"id": 0, "ok": False, "op": "ready", "error": f"{type(e).__name__}: {e}"})
+        return
+    while True:
+        frame = read_frame(stdin)
+        if frame is None:
+            return
+        header, _ = frame
+        reply = {"id": header.get("id"), "ok": True}
+        payload = b""
+        try:
+            if header.get("op") == "synth":
+                payload, meta = backend.synthesize(header.get("text", ""))
+                reply.update(meta)
+            elif header.get("op") != "ping":
+                raise ValueError(f"unknown op: {header.get('op')}")
+        except Exception as e:
+            reply = {"id": header.get("id"), "ok": False, "error": f"{type(e).__name__}: {e}"}
+        write_frame(stdout, reply, payload)
+
+
+# ---------------------------------------------------------------------------
+# Parent side
+# ---------------------------------------------------------------------------
+
+class SynthesisWorker:
+    """One worker process plus a reader thread that resolves in-flight requests by id"""
+
+    def __init__(self, engine: str, index: int, max_inflight: int = MAX_INFLIGHT, start_timeout: float = REQUEST_TIMEOUT_S):
+        self.engine = engine
+        self.index = index
+        self.max_inflight = max(1, max_inflight)
+        self.inflight: Dict[int, Future] = {}
+        self.completed = 0
+        self.failed = 0
+        self.started_at = time.time()
+        self._next_id = 0
+        self._write_lock = threading.Lock()
+        self._ready: Future = Future()
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PACKAGE_ROOT), env.get("PYTHONPATH")]))
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", __name__, "--engine", engine],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env,
+        )
+        self._reader = threading.Thread(target=self._read_loop, name=f"heystive-tts-worker-{engine}-{index}", daemon=True)
+        self._reader.start()
+        try:
+            ready = self._ready.result(start_timeout)
+        except TimeoutError:
+            self.stop(0)
+            raise WorkerError(f"{engine} worker did not become ready within {start_timeout}s")
+        if not ready.get("ok"):
+            self.stop()
+            raise WorkerError(f"{engine} worker failed to start: {ready.get('error')}")
+        self.pid = ready.get("pid")
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    @property
+    def has_capacity(self) -> bool:
+        return self.alive and len(self.inflight) < self.max_inflight
+
+    def _read_loop(self):
+        while True:
+            frame = read_frame(self.process.stdout)
+            if frame is None:
+                break
+            header, payload = frame
+            if header.get("op") == "ready":
+                self._ready.set_result(header)
+                continue
+            future = self.inflight.pop(header.get("id"), None)
+            if future is None:
+                continue
+            if header.get("ok"):
+                self.completed += 1
+                future.set_result((header, payload))
+            else:
+                self.failed += 1
+                future.set_exception(WorkerError(header.get("error", "worker error")))
+        # EOF: the process exited or crashed; fail everything still waiting on it
+        error = WorkerError(f"{self.engine} worker {self.index} exited (code {self.process.poll()})")
+        if not self._ready.done():
+            self._ready.set_result({"ok": False, "error": str(error)})
+        for request_id in list(self.inflight):
+            future = self.inflight.pop(request_id, None)
+            if future is not None and not future.done():
+                self.failed += 1
+                future.set_exception(error)
+
+    def submit(self, op: str, **fields) -> Future:
+        future: Future = Future()
+        with self._write_lock:
+            self._next_id += 1
+            request_id = self._next_id
+            self.inflight[request_id] = future
+            try:
+                write_frame(self.process.stdin, {"id": request_id, "op": op, **fields})
+            except (BrokenPipeError, OSError, ValueError) as e:
+                self.inflight.pop(request_id, None)
+                future.set_exception(WorkerError(f"{self.engine} worker {self.index} pipe closed: {e}"))
+        return future
+
+    def stop(self, timeout: float = 2.0):
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+class SynthesisWorkerPool:
+    """
+    Fixed-size pool of persistent workers for one engine. Callers block while every live
+    worker is at its in-flight limit; dead workers are restarted on the next dispatch or
+    health check
+    """
+
+    def __init__(self, engine: str, size: int = POOL_SIZE, max_inflight: int = MAX_INFLIGHT,
+                 request_timeout: float = REQUEST_TIMEOUT_S, health_interval: float = HEALTH_INTERVAL_S):
+        if engine not in BACKENDS:
+            raise ValueError(f"unknown synthesis worker engine: {engine}")
+        self.engine = engine
+        self.size = max(1, size)
+        self.max_inflight = max(1, max_inflight)
+        self.request_timeout = request_timeout
+        self.workers: List[Optional[SynthesisWorker]] = [None] * self.size
+        self._cond = threading.Condition()
+        self._waiting = 0
+        self._spawning = [False] * self.size
+        self._closed = False
+        self.metrics = {"requests": 0, "errors": 0, "restarts": 0, "spawn_failures": 0, "max_queue_depth": 0, "queue_wait_s": 0.0, "busy_s": 0.0}
+        self._health_thread = None
+        if health_interval > 0:
+            self._health_thread = threading.Thread(target=self._health_loop, args=(health_interval,), name=f"heystive-tts-health-{engine}", daemon=True)
+            self._health_thread.start()
+
+    def _spawn(self, index: int) -> Optional[SynthesisWorker]:
+        """
+        Start worker index. The caller marks the slot in _spawning under _cond and calls this
+        without holding it, so a slow engine start never blocks dispatch to the other workers
+        """
+        try:
+            worker = SynthesisWorker(self.engine, index, self.max_inflight, self.request_timeout)
+        except (WorkerError, OSError, TimeoutError) as e:
+            worker, error = None, e
+        with self._cond:
+            self._spawning[index] = False
+            previous = self.workers[index]
+            if worker is None:
+                self.metrics["spawn_failures"] += 1
+            elif self._closed:
+                previous, installed = worker, None
+            else:
+                if previous is not None:
+                    self.metrics["restarts"] += 1
+                self.workers[index] = installed = worker
+            self._cond.notify_all()
+        if worker is None:
+            logger.warning(f"TTS worker spawn failed ({self.engine}): {error}")
+            return None
+        if previous is not None:
+            previous.stop(0)
+        return installed
+
+    def _dispatch(self, op: str, **fields) -> Tuple[SynthesisWorker, Future]:
+        """Submit to the first live worker with spare capacity, starting or waiting for one if needed"""
+        deadline = time.monotonic() + self.request_timeout
+        tried = set()
+        with self._cond:
+            self._waiting += 1
+            self.metrics["max_queue_depth"] = max(self.metrics["max_queue_depth"], self._waiting)
+        try:
+            while True:
+                with self._cond:
+                    if self._closed:
+                        raise WorkerError("worker pool is closed")
+                    spawn = None
+                    for index, worker in enumerate(self.workers):
+                        if worker is not None and worker.alive:
+                            if worker.has_capacity:
+                                return worker, worker.submit(op, **fields)
+                        elif spawn is None and not self._spawning[index] and index not in tried:
+                            spawn = index
+                    if spawn is not None:
+                        self._spawning[spawn] = True
+                        tried.add(spawn)
+                    else:
+                        if not any(self._spawning) and not any(w is not None and w.alive for w in self.workers):
+                            raise WorkerError(f"no {self.engine} synthesis worker could be started")
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise WorkerError(f"timed out waiting for a free {self.engine} worker")
+                        self._cond.wait(remaining)
+                        continue
+                self._spawn(spawn)
+        finally:
+            with self._cond:
+                self._waiting -= 1
+
+    def _request(self, op: str, **fields) -> Tuple[Dict[str, Any], bytes]:
+        queued = time.perf_counter()
+        worker, future = self._dispatch(op, **fields)
+        start = time.perf_counter()
+        try:
+            return future.result(self.request_timeout)
+        except TimeoutError:
+            # A hung engine is as bad as a crashed one: kill it so the slot is respawned
+            worker.process.kill()
+            raise WorkerError(f"{self.engine} worker {worker.index} timed out")
+        finally:
+            with self._cond:
+                self.metrics["queue_wait_s"] += start - queued
+                self.metrics["busy_s"] += time.perf_counter() - start
+                self._cond.notify()
+
+    def synthesize(self, text: str) -> AudioResult:
+        """Synthesize text on a free worker; raises WorkerError on failure"""
+        with self._cond:
+            self.metrics["requests"] += 1
+        try:
+            header, payload = self._request("synth", text=text)
+        except Exception:
+            with self._cond:
+                self.metrics["errors"] += 1
+            raise
+        result = AudioResult.from_bytes(payload, self.engine)
+        if header.get("sample_rate"):
+            result.sample_rate = header["sample_rate"]
+        return result
+
+    def health_check(self) -> Dict[int, bool]:
+        """Ping started, idle workers and restart dead or unresponsive ones"""
+        status = {}
+        for index in range(self.size):
+            with self._cond:
+                if self._closed:
+                    break
+                worker = self.workers[index]
+                if worker is None:
+                    continue  # slots are filled on demand
+                if worker.inflight:
+                    status[index] = worker.alive
+                    continue
+                future = worker.submit("ping") if worker.alive else None
+            healthy = False
+            if future is not None:
+                try:
+                    healthy = bool(future.result(min(self.request_timeout, 5.0))[0].get("ok"))
+                except Exception:
+                    healthy = False
+                with self._cond:
+                    self._cond.notify()
+            if not healthy:
+                with self._cond:
+                    respawn = self.workers[index] is worker and not self._spawning[index] and not self._closed
+                    if respawn:
+                        self._spawning[index] = True
+                        worker.process.kill()
+                if respawn:
+                    healthy = self._spawn(index) is not None
+            status[index] = healthy
+        return status
+
+    def _health_loop(self, interval: float):
+        while not self._closed:
+            time.sleep(interval)
+            if self._closed:
+                return
+            try:
+                self.health_check()
+            except Exception as e:
+                logger.warning(f"TTS worker health check failed ({self.engine}): {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            m = dict(self.metrics)
+            requests = m["requests"] or 1
+            m.update({
+                "engine": self.engine,
+                "size": self.size,
+                "max_inflight": self.max_inflight,
+                "queue_depth": self._waiting,
+                "inflight": sum(len(w.inflight) for w in self.workers if w is not None),
+                "alive": sum(1 for w in self.workers if w is not None and w.alive),
+                "avg_queue_wait_ms": 1000.0 * m["queue_wait_s"] / requests,
+                "workers": [
+                    {"index": w.index, "pid": w.pid, "alive": w.alive, "inflight": len(w.inflight), "completed": w.completed, "failed": w.failed}
+                    for w in self.workers if w is not None
+                ],
+            })
+            return m
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            workers, self.workers = self.workers, [None] * self.size
+            self._cond.notify_all()
+        for worker in workers:
+            if worker is not None:
+                worker.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Heystive persistent synthesis worker")
+    parser.add_argument("--engine", choices=sorted(BACKENDS), required=True)
+    worker_main(parser.parse_args().engine)
@@ -0,0 +1,197 @@
+"""
+Micro-batching scheduler for VITS inference
+Collects concurrent synthesis requests for a few milliseconds, runs one padded batched
+forward pass and hands each caller its own waveform
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Batching is opt-in: 1 keeps every synthesis on the unbatched Synthesizer.tts path
+BATCH_MAX = int(os.environ.get("HEYSTIVE_TTS_BATCH_MAX", "1"))
+BATCH_WAIT_MS = float(os.environ.get("HEYSTIVE_TTS_BATCH_WAIT_MS", "5"))
+# Zero samples Synthesizer.tts appends after every sentence
+SENTENCE_GAP = 10000
+
+
+class MicroBatcher:
+    """
+    Generic request batcher: submit() returns a Future; a worker thread drains up to
+    max_batch pending items, waiting at most max_wait_ms after the first one, and calls
+    batch_fn(items) -> results (same order)
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], Sequence[Any]], max_batch: int = BATCH_MAX,
+                 max_wait_ms: float = BATCH_WAIT_MS, name: str = "heystive-tts-batcher"):
+        self.batch_fn = batch_fn
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait_ms = max(0.0, float(max_wait_ms))
+        self.name = name
+        self._pending: List[tuple] = []
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self._started_at = time.perf_counter()
+        self.metrics = {"requests": 0, "batches": 0, "items": 0, "max_batch_seen": 0, "busy_s": 0.0, "queue_wait_s": 0.0, "errors": 0}
+
+    def submit(self, item: Any) -> Future:
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("batcher is closed")
+            self._pending.append((item, future, time.perf_counter()))
+            self.metrics["requests"] += 1
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._worker.start()
+            self._cond.notify()
+        return future
+
+    def run(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """Submit and block for the result"""
+        return self.submit(item).result(timeout)
+
+    def _take_batch(self) -> List[tuple]:
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if not self._pending:
+                return []
+            deadline = self._pending[0][2] + self.max_wait_ms / 1000.0
+            while len(self._pending) < self.max_batch and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            start = time.perf_counter()
+            items = [b[0] for b in batch]
+            try:
+                results = list(self.batch_fn(items))
+                if len(results) != len(items):
+                    raise RuntimeError(f"batch_fn returned {len(results)} results for {len(items)} items")
+            except Exception as e:
+                self.metrics["errors"] += 1
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finally:
+                elapsed = time.perf_counter() - start
+                self.metrics["batches"] += 1
+                self.metrics["items"] += len(batch)
+                self.metrics["max_batch_seen"] = max(self.metrics["max_batch_seen"], len(batch))
+                self.metrics["busy_s"] += elapsed
+                self.metrics["queue_wait_s"] += sum(start - b[2] for b in batch)
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout=5)
+
+    def stats(self) -> Dict[str, Any]:
+        m = dict(self.metrics)
+        batches = m["batches"] or 1
+        items = m["items"] or 1
+        wall = time.perf_counter() - self._started_at
+        m.update({
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait_ms,
+            "pending": len(self._pending),
+            "avg_batch_size": m["items"] / batches,
+            "avg_queue_wait_ms": 1000.0 * m["queue_wait_s"] / items,
+            "items_per_busy_s": m["items"] / m["busy_s"] if m["busy_s"] else 0.0,
+            "items_per_s": m["items"] / wall if wall else 0.0,
+        })
+        return m
+
+
+def join_sentences(wavs: Sequence[Any]):
+    """Concatenate per-sentence waveforms the way Synthesizer.tts does, with a gap after each one"""
+    import numpy as np
+    parts = []
+    for wav in wavs:
+        parts.append(np.asarray(wav, dtype=np.float32).reshape(-1))
+        parts.append(np.zeros(SENTENCE_GAP, dtype=np.float32))
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+
+
+class VitsBatchRunner:
+    """
+    batch_fn for a Coqui Vits model: tokenizes, sorts by token length, right-pads,
+    runs Vits.inference once with x_lengths and trims each waveform to its own length.
+    trim_silence applies the same end-of-speech trim Synthesizer.tts does when the model
+    config sets audio.do_trim_silence
+    """
+
+    def __init__(self, model, pad_id: Optional[int] = None, language: Optional[str] = None,
+                 trim_silence: bool = False):
+        self.model = model
+        self.language = language
+        self.trim_silence = trim_silence
+        tokenizer = getattr(model, "tokenizer", None)
+        if pad_id is None:
+            pad_id = getattr(getattr(tokenizer, "characters", None), "pad_id", None)
+        self.pad_id = 0 if pad_id is None else int(pad_id)
+
+    @classmethod
+    def from_synthesizer(cls, synthesizer, **kwargs) -> "VitsBatchRunner":
+        """Runner for synthesizer.tts_model with the synthesizer's own post-processing settings"""
+        audio = getattr(getattr(synthesizer, "tts_config", None), "audio", None) or {}
+        trim = "do_trim_silence" in audio and bool(audio["do_trim_silence"])
+        return cls(synthesizer.tts_model, trim_silence=trim, **kwargs)
+
+    def _trim_silence(self, wav):
+        from TTS.tts.utils.synthesis import trim_silence
+        return trim_silence(wav, self.model.ap)
+
+    def tokenize(self, text: str) -> List[int]:
+        return list(self.model.tokenizer.text_to_ids(text, language=self.language))
+
+    def __call__(self, items: List[Any]) -> List[Any]:
+        import numpy as np
+        import torch
+
+        ids = [self.tokenize(i) if isinstance(i, str) else list(i) for i in items]
+        order = sorted(range(len(ids)), key=lambda i: len(ids[i]), reverse=True)
+        lengths = [max(1, len(ids[i])) for i in order]
+        x = torch.full((len(order), lengths[0]), self.pad_id, dtype=torch.long)
+        for row, i in enumerate(order):
+            if ids[i]:
+                x[row, :len(ids[i])] = torch.tensor(ids[i], dtype=torch.long)
+        device = next(self.model.parameters()).device
+        x = x.to(device)
+        x_lengths = torch.tensor(lengths, dtype=torch.long, device=device)
+        with torch.no_grad():
+            outputs = self.model.inference(x, aux_input={"x_lengths": x_lengths, "d_vectors": None, "speaker_ids": None, "language_ids": None, "durations": None})
+        wav = outputs["model_outputs"].squeeze(1).cpu().numpy()
+        y_mask = outputs["y_mask"].squeeze(1)
+        frames = y_mask.shape[-1]
+        max_len = getattr(self.model, "max_inference_len", None)
+        if max_len:
+            frames = min(frames, max_len)
+        hop = max(1, wav.shape[-1] // max(1, frames))
+        sizes = (y_mask[:, :frames].sum(-1).long().cpu().numpy() * hop).clip(max=wav.shape[-1])
+        results: List[Any] = [None] * len(items)
+        for row, i in enumerate(order):
+            sample = np.ascontiguousarray(wav[row, :int(sizes[row])], dtype=np.float32)
+            results[i] = self._trim_silence(sample) if self.trim_silence else sample
+        return results
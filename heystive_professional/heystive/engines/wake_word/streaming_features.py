@@ -0,0 +1,282 @@
+"""
+Streaming audio buffers, VAD gating and frame-cached feature extraction for wake word detection
+Each analysis frame is computed once instead of recomputing features over the whole window
+"""
+
+import numpy as np
+from scipy.signal import savgol_filter
+from typing import Dict, Any, Callable, Optional, Tuple
+
+try:
+    import librosa
+except Exception:
+    librosa = None
+
+ENERGY_FLOOR = 1e-4
+
+
+class AudioRingBuffer:
+    """Fixed-capacity ring buffer holding the most recent samples"""
+
+    def __init__(self, capacity: int, dtype=np.float32):
+        self.capacity = int(capacity)
+        self.dtype = np.dtype(dtype)
+        self._data = np.zeros(self.capacity, dtype=self.dtype)
+        self._write = 0
+        self._size = 0
+        self.total = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, samples: np.ndarray):
+        """Append samples, overwriting the oldest ones when full"""
+        samples = np.asarray(samples, dtype=self.dtype).ravel()
+        n = len(samples)
+        if n == 0:
+            return
+        self.total += n
+        if n >= self.capacity:
+            self._data[:] = samples[-self.capacity:]
+            self._write = 0
+            self._size = self.capacity
+            return
+        end = self._write + n
+        if end <= self.capacity:
+            self._data[self._write:end] = samples
+        else:
+            split = self.capacity - self._write
+            self._data[self._write:] = samples[:split]
+            self._data[:n - split] = samples[split:]
+        self._write = end % self.capacity
+        self._size = min(self.capacity, self._size + n)
+
+    def latest(self, n: int) -> np.ndarray:
+        """Return a contiguous copy of the last n samples"""
+        n = min(int(n), self._size)
+        start = (self._write - n) % self.capacity
+        if start + n <= self.capacity:
+            return self._data[start:start + n].copy()
+        return np.concatenate((self._data[start:], self._data[:self._write]))
+
+    def oldest(self, n: int) -> np.ndarray:
+        """Return a contiguous copy of the first (oldest) n samples"""
+        n = min(int(n), self._size)
+        start = (self._write - self._size) % self.capacity
+        if start + n <= self.capacity:
+            return self._data[start:start + n].copy()
+        return np.concatenate((self._data[start:], self._data[:start + n - self.capacity]))
+
+    def view(self) -> np.ndarray:
+        """Return all buffered samples, oldest first"""
+        return self.latest(self._size)
+
+    def clear(self):
+        self._write = 0
+        self._size = 0
+        self.total = 0
+
+
+class StreamingVAD:
+    """
+    Per-frame voice activity flags over the most recent max_seconds of audio
+    Each incoming chunk is framed once; frames whose RMS is below energy_floor are rejected in
+    a single vectorized pass and only the rest reach is_speech (e.g. webrtcvad.Vad.is_speech).
+    The default floor (about -80 dBFS) only skips near-digital silence, so quiet speech is left
+    for the VAD to judge; 0 disables the pre-gate. Without is_speech the floor is the detector
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 10, max_seconds: float = 3.0,
+                 is_speech: Optional[Callable[[bytes, int], bool]] = None,
+                 energy_floor: float = ENERGY_FLOOR, smooth_frames: int = 10):
+        self.sample_rate = sample_rate
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.is_speech = is_speech
+        self.energy_floor = energy_floor
+        self.smooth_frames = max(1, smooth_frames)
+        self.flags = AudioRingBuffer(max(1, int(max_seconds * 1000 / frame_ms)), dtype=np.uint8)
+        self._rest = np.zeros(0, dtype=np.int16)
+        self._speech = 0
+        self.frames_classified = 0
+        self.frames_gated = 0
+
+    def push(self, pcm: np.ndarray) -> int:
+        """Classify the complete frames in new int16 PCM; returns the number of new frames"""
+        pcm = np.asarray(pcm, dtype=np.int16).ravel()
+        if self._rest.size:
+            pcm = np.concatenate((self._rest, pcm))
+        n = len(pcm) // self.frame_length
+        self._rest = pcm[n * self.frame_length:].copy()
+        if n == 0:
+            return 0
+        frames = pcm[:n * self.frame_length].reshape(n, self.frame_length)
+        rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1)) / 32768.0
+        voiced = rms >= self.energy_floor if self.energy_floor > 0 else np.ones(n, dtype=bool)
+        if self.is_speech is not None:
+            idx = np.flatnonzero(voiced)
+            self.frames_gated += n - len(idx)
+            for i in idx:
+                voiced[i] = bool(self.is_speech(frames[i].tobytes(), self.sample_rate))
+        flags = voiced.astype(np.uint8)
+        evicted = len(self.flags) + n - self.flags.capacity
+        if evicted > 0:
+            self._speech -= int(self.flags.oldest(evicted).sum())
+        self.flags.append(flags)
+        self._speech += int(flags[-self.flags.capacity:].sum())
+        self.frames_classified += n
+        return n
+
+    def speech_ratio(self, seconds: Optional[float] = None) -> float:
+        """Fraction of voiced frames over the buffered window, or over its last `seconds`"""
+        if seconds is None:
+            n = len(self.flags)
+            return self._speech / n if n else 0.0
+        recent = self.flags.latest(int(seconds * self.sample_rate / self.frame_length))
+        return float(recent.mean()) if recent.size else 0.0
+
+    def timeline(self) -> np.ndarray:
+        """Speech probability per frame: voiced flags averaged over smooth_frames, oldest first"""
+        flags = self.flags.view().astype(np.float32)
+        if flags.size == 0:
+            return flags
+        kernel = np.full(self.smooth_frames, 1.0 / self.smooth_frames, dtype=np.float32)
+        return np.convolve(flags, kernel, mode="full")[:flags.size] * (self.smooth_frames / np.minimum(np.arange(1, flags.size + 1), self.smooth_frames))
+
+    def reset(self):
+        self.flags.clear()
+        self._rest = np.zeros(0, dtype=np.int16)
+        self._speech = 0
+
+
+class StreamingFeatureExtractor:
+    """
+    MFCC / delta / spectral-centroid / ZCR over the last max_seconds of audio, matching what
+    librosa computes for the same window (centered frames, power_to_db with top_db, delta with
+    interp edges). Every full frame is analysed once and cached by its absolute stream position,
+    so a window that slides by whole hops only analyses its new frames plus the zero-padded
+    edge frames; the global top_db clip, the DCT and the deltas are cheap and done per call
+    """
+
+    def __init__(self, sample_rate: int = 16000, n_fft: int = 2048, hop_length: int = 512,
+                 n_mfcc: int = 13, n_mels: int = 128, max_seconds: float = 3.0, delta_width: int = 9,
+                 center: bool = True, top_db: Optional[float] = 80.0):
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.n_mfcc = n_mfcc
+        self.max_samples = int(sample_rate * max_seconds)
+        self.delta_width = delta_width
+        self.center = center
+        self.top_db = top_db
+
+        self._window = np.hanning(n_fft + 1)[:-1].astype(np.float32)
+        self._freqs = np.fft.rfftfreq(n_fft, 1.0 / sample_rate).astype(np.float32)
+        self._mel = self._mel_filters(n_mels)
+        self._dct = self._dct_matrix(n_mels, n_mfcc)
+
+        self._samples = AudioRingBuffer(self.max_samples)
+        self._frames: Dict[int, Tuple[np.ndarray, float, float]] = {}  # stream offset -> (mel_db, centroid, zcr)
+        self.frames_processed = 0
+
+    def _mel_filters(self, n_mels: int) -> np.ndarray:
+        if librosa is not None:
+            return librosa.filters.mel(sr=self.sample_rate, n_fft=self.n_fft, n_mels=n_mels).astype(np.float32)
+        def hz_to_mel(f):
+            return 2595.0 * np.log10(1.0 + f / 700.0)
+        def mel_to_hz(m):
+            return 700.0 * (10 ** (m / 2595.0) - 1.0)
+        pts = mel_to_hz(np.linspace(hz_to_mel(0.0), hz_to_mel(self.sample_rate / 2.0), n_mels + 2))
+        fb = np.zeros((n_mels, len(self._freqs)), dtype=np.float32)
+        for i in range(n_mels):
+            lo, mid, hi = pts[i], pts[i + 1], pts[i + 2]
+            up = (self._freqs - lo) / max(mid - lo, 1e-9)
+            down = (hi - self._freqs) / max(hi - mid, 1e-9)
+            fb[i] = np.maximum(0.0, np.minimum(up, down)) * (2.0 / max(hi - lo, 1e-9))
+        return fb
+
+    @staticmethod
+    def _dct_matrix(n_in: int, n_out: int) -> np.ndarray:
+        k = np.arange(n_out)[:, None]
+        n = np.arange(n_in)[None, :]
+        basis = np.cos(np.pi / n_in * (n + 0.5) * k) * np.sqrt(2.0 / n_in)
+        basis[0] /= np.sqrt(2.0)
+        return basis.astype(np.float32)
+
+    def push(self, samples: np.ndarray) -> int:
+        """Add new float samples in [-1, 1]; returns the number of hops the stream advanced"""
+        samples = np.asarray(samples, dtype=np.float32).ravel()
+        before = self._samples.total
+        self._samples.append(samples)
+        return self._samples.total // self.hop_length - before // self.hop_length
+
+    def _spectral(self, frame: np.ndarray) -> Tuple[np.ndarray, float]:
+        mag = np.abs(np.fft.rfft(frame * self._window)).astype(np.float32)
+        mel_db = 10.0 * np.log10(np.maximum(self._mel @ (mag * mag), 1e-10))
+        total = float(mag.sum())
+        return mel_db, (float(self._freqs @ mag) / total if total > 0 else 0.0)
+
+    @staticmethod
+    def _zcr(frame: np.ndarray) -> float:
+        signs = np.signbit(np.where(np.abs(frame) <= 1e-10, 0.0, frame))  # librosa's zero_crossings threshold
+        return np.count_nonzero(signs[1:] != signs[:-1]) / len(frame)
+
+    def _frame_starts(self, n: int) -> np.ndarray:
+        """Window-relative start of every analysis frame, as librosa frames a window of n samples"""
+        if self.center:
+            return np.arange(1 + n // self.hop_length) * self.hop_length - self.n_fft // 2
+        return np.arange(max(0, 1 + (n - self.n_fft) // self.hop_length)) * self.hop_length
+
+    def _analyse(self, y: np.ndarray, offset: int, rel: int) -> Tuple[np.ndarray, float, float]:
+        end = rel + self.n_fft
+        if rel >= 0 and end <= len(y):
+            key = offset + rel
+            cached = self._frames.get(key)
+            if cached is None:
+                frame = y[rel:end]
+                cached = self._frames[key] = (*self._spectral(frame), self._zcr(frame))
+                self.frames_processed += 1
+            return cached
+        # Edge frame: the STFT pads with zeros, zero_crossing_rate repeats the edge samples
+        lo, hi = max(rel, 0), min(end, len(y))
+        pad = (lo - rel, end - hi)
+        mel_db, centroid = self._spectral(np.pad(y[lo:hi], pad))
+        return mel_db, centroid, self._zcr(np.pad(y[lo:hi], pad, mode="edge"))
+
+    @property
+    def buffered_seconds(self) -> float:
+        return len(self._samples) / float(self.sample_rate)
+
+    def _delta(self, data: np.ndarray, order: int) -> np.ndarray:
+        if data.shape[1] < self.delta_width:
+            return np.zeros_like(data)
+        return savgol_filter(data, self.delta_width, order, deriv=order, axis=-1, mode="interp").astype(np.float32)
+
+    def features(self) -> Dict[str, Any]:
+        """Features of the buffered window in the layout of the full-window librosa extractor"""
+        y = self._samples.view()
+        n = len(y)
+        offset = self._samples.total - n
+        columns = [self._analyse(y, offset, int(rel)) for rel in self._frame_starts(n)] if n else []
+        for key in [k for k in self._frames if k < offset]:
+            del self._frames[key]
+        if columns:
+            mel_db = np.stack([c[0] for c in columns], axis=1)
+            if self.top_db is not None:
+                mel_db = np.maximum(mel_db, mel_db.max() - self.top_db)
+            mfccs = (self._dct @ mel_db).astype(np.float32)
+        else:
+            mfccs = np.zeros((self.n_mfcc, 0), dtype=np.float32)
+        return {
+            "mfccs": mfccs,
+            "delta_mfccs": self._delta(mfccs, 1),
+            "delta2_mfccs": self._delta(mfccs, 2),
+            "spectral_centroids": np.array([[c[1] for c in columns]], dtype=np.float32).reshape(1, -1),
+            "zcr": np.array([[c[2] for c in columns]], dtype=np.float32).reshape(1, -1),
+            "duration": n / float(self.sample_rate),
+            "energy": float(np.mean(y * y)) if n else 0.0,
+        }
+
+    def reset(self):
+        self._samples.clear()
+        self._frames.clear()
+        self.frames_processed = 0
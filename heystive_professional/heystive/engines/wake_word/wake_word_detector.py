@@ -4,6 +4,8 @@ Detects "هی استیو" with high accuracy and low latency
 """
 
 import asyncio
+import os
+import threading
 import numpy as np
 import pyaudio
 import webrtcvad
@@ -13,9 +15,13 @@ import torchaudio
 from typing import Optional, Callable, Dict, Any
 import logging
 from pathlib import Path
+from .streaming_features import AudioRingBuffer, StreamingFeatureExtractor, StreamingVAD
 
 logger = logging.getLogger(__name__)
 
+# RMS below which frames skip webrtcvad; raise it only for noisy rooms, it drops quiet speech
+VAD_ENERGY_FLOOR = float(os.environ.get("HEYSTIVE_WAKE_VAD_ENERGY_FLOOR", "0.0001"))
+
 class PersianWakeWordDetector:
     """
     Advanced wake word detection optimized for Persian phonemes
@@ -37,9 +43,27 @@ class PersianWakeWordDetector:
         self.detection_threshold = 0.7
         self.min_audio_length = 1.0  # seconds
         self.max_audio_length = 3.0  # seconds
+        self.speech_ratio_threshold = 0.1  # voiced fraction of the window before features are examined
         
-        # Audio buffer for continuous listening
-        self.audio_buffer = []
+        # Ring buffer and frame-incremental features for continuous listening
+        self.audio_buffer = AudioRingBuffer(int(self.sample_rate * self.max_audio_length))
+        self.feature_extractor = StreamingFeatureExtractor(
+            sample_rate=self.sample_rate,
+            n_fft=2048,
+            hop_length=512,
+            n_mfcc=13,
+            max_seconds=self.max_audio_length
+        )
+        self.vad_tracker = StreamingVAD(
+            sample_rate=self.sample_rate,
+            frame_ms=10,
+            max_seconds=self.max_audio_length,
+            is_speech=self.vad.is_speech,
+            energy_floor=VAD_ENERGY_FLOOR
+        )
+        self._buffer_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._processing = False
         self.is_listening = False
         self.audio_stream = None
         self.pyaudio_instance = None
@@ -156,6 +180,7 @@ class PersianWakeWordDetector:
             return
             
         self.is_listening = True
+        self._loop = asyncio.get_running_loop()
         
         try:
             # Initialize audio stream
@@ -186,21 +211,19 @@ class PersianWakeWordDetector:
             return (None, pyaudio.paComplete)
         
         try:
-            # Convert audio data to numpy array
-            audio_data = np.frombuffer(in_data, dtype=np.int16)
-            
-            # Add to buffer
-            self.audio_buffer.extend(audio_data)
-            
-            # Keep buffer size manageable
-            max_buffer_size = int(self.sample_rate * self.max_audio_length)
-            if len(self.audio_buffer) > max_buffer_size:
-                self.audio_buffer = self.audio_buffer[-max_buffer_size:]
-            
-            # Check for wake word if we have enough audio
-            min_buffer_size = int(self.sample_rate * self.min_audio_length)
-            if len(self.audio_buffer) >= min_buffer_size:
-                asyncio.create_task(self._process_audio_chunk())
+            self.feed_audio(np.frombuffer(in_data, dtype=np.int16))
+            
+            # Check for wake word if we have enough speech and no check is in flight
+            if self._window_ready() and not self._processing and self._loop is not None:
+                self._processing = True
+                scheduled = False
+                try:
+                    asyncio.run_coroutine_threadsafe(self._process_audio_chunk(), self._loop)
+                    scheduled = True
+                finally:
+                    # The coroutine resets the flag itself; if it never got scheduled nobody else will
+                    if not scheduled:
+                        self._processing = False
             
             return (None, pyaudio.paContinue)
             
@@ -208,26 +231,47 @@ class PersianWakeWordDetector:
             logger.error(f"Error in audio callback: {e}")
             return (None, pyaudio.paComplete)
     
+    def feed_audio(self, audio_data: np.ndarray) -> int:
+        """Append int16 PCM to the ring buffer, classify its VAD frames and compute features for the new hops only"""
+        pcm = np.asarray(audio_data, dtype=np.int16)
+        samples = pcm.astype(np.float32) / 32768.0  # Normalize to [-1, 1]
+        with self._buffer_lock:
+            self.audio_buffer.append(samples)
+            self.vad_tracker.push(pcm)
+            return self.feature_extractor.push(samples)
+    
+    def _window_ready(self) -> bool:
+        """Enough buffered audio whose speech ratio crosses the threshold"""
+        min_buffer_size = int(self.sample_rate * self.min_audio_length)
+        return len(self.audio_buffer) >= min_buffer_size and self.vad_tracker.speech_ratio() >= self.speech_ratio_threshold
+    
+    def speech_timeline(self) -> np.ndarray:
+        """Speech probability per 10ms frame over the buffered window"""
+        with self._buffer_lock:
+            return self.vad_tracker.timeline()
+    
+    def _reset_buffers(self):
+        with self._buffer_lock:
+            self.audio_buffer.clear()
+            self.vad_tracker.reset()
+            self.feature_extractor.reset()
+    
     async def _process_audio_chunk(self):
         """Process audio chunk for wake word detection"""
         try:
-            # Convert buffer to numpy array
-            audio_array = np.array(self.audio_buffer, dtype=np.float32)
-            audio_array = audio_array / 32768.0  # Normalize to [-1, 1]
-            
-            # Voice Activity Detection
-            if not self._has_voice_activity(audio_array):
-                return
-            
-            # Extract features for wake word detection
-            features = self._extract_wake_word_features(audio_array)
+            with self._buffer_lock:
+                # Voice Activity Detection from the cached per-frame flags
+                if not self._window_ready():
+                    return
+                audio_array = self.audio_buffer.view()
+                features = self.feature_extractor.features()
             
             # Check for wake word pattern
             if self._detect_wake_word_pattern(features, audio_array):
                 logger.info("Wake word detected: 'هی استیو'")
                 
                 # Clear buffer to prevent multiple detections
-                self.audio_buffer.clear()
+                self._reset_buffers()
                 
                 # Trigger callback
                 if self.wake_callback:
@@ -235,28 +279,27 @@ class PersianWakeWordDetector:
                     
         except Exception as e:
             logger.error(f"Error processing audio chunk: {e}")
+        finally:
+            self._processing = False
     
     def _has_voice_activity(self, audio_array: np.ndarray) -> bool:
-        """Check if audio contains voice activity"""
+        """Check if a standalone audio array contains voice activity (streaming uses vad_tracker)"""
         try:
-            # Convert to 16-bit PCM for VAD
-            audio_16bit = (audio_array * 32767).astype(np.int16)
-            
-            # Check voice activity in chunks
-            chunk_size = int(0.01 * self.sample_rate)  # 10ms chunks
-            for i in range(0, len(audio_16bit) - chunk_size, chunk_size):
-                chunk = audio_16bit[i:i + chunk_size]
-                if self.vad.is_speech(chunk.tobytes(), self.sample_rate):
-                    return True
-            
-            return False
+            tracker = StreamingVAD(
+                sample_rate=self.sample_rate,
+                max_seconds=len(audio_array) / self.sample_rate + 0.01,
+                is_speech=self.vad.is_speech,
+                energy_floor=VAD_ENERGY_FLOOR
+            )
+            tracker.push((audio_array * 32767).astype(np.int16))
+            return tracker.speech_ratio() > 0
             
         except Exception as e:
             logger.error(f"VAD error: {e}")
             return False
     
     def _extract_wake_word_features(self, audio_array: np.ndarray) -> Dict[str, Any]:
-        """Extract features for wake word detection"""
+        """Extract features for a whole window at once (offline use; streaming uses feature_extractor)"""
         try:
             # MFCC features
             mfccs = librosa.feature.mfcc(
@@ -346,6 +389,7 @@ class PersianWakeWordDetector:
     async def stop_listening(self):
         """Stop wake word monitoring"""
         self.is_listening = False
+        self._loop = None
         
         if self.audio_stream:
             self.audio_stream.stop_stream()
@@ -363,6 +407,9 @@ class PersianWakeWordDetector:
         return {
             "is_listening": self.is_listening,
             "buffer_size": len(self.audio_buffer),
+            "frames_processed": self.feature_extractor.frames_processed,
+            "speech_ratio": self.vad_tracker.speech_ratio(),
+            "vad_frames_gated": self.vad_tracker.frames_gated,
             "sample_rate": self.sample_rate,
             "chunk_size": self.chunk_size,
             "detection_threshold": self.detection_threshold
@@ -10,6 +10,9 @@ from typing import Dict, Any, Optional, List, Tuple
 from enum import Enum
 import json
 
+from .pattern_matcher import AhoCorasickMatcher
+from ..utils.persian_text import normalize_persian
+
 logger = logging.getLogger(__name__)
 
 class ConversationState(Enum):
@@ -38,8 +41,15 @@ class PersianConversationFlow:
         self.conversation_context = {}
         self.pending_actions = []
         
-        # Persian language patterns
+        # Persian language patterns, compiled into one automaton keyed "category" or "category.subtype"
         self.persian_patterns = self._initialize_persian_patterns()
+        self.pattern_matcher = AhoCorasickMatcher(normalizer=self._normalize_for_matching)
+        for category, words in self.persian_patterns.items():
+            if isinstance(words, dict):
+                for subtype, sub_words in words.items():
+                    self.pattern_matcher.add_many(f"{category}.{subtype}", sub_words)
+            else:
+                self.pattern_matcher.add_many(category, words)
         
         # Response templates
         self.response_templates = self._load_response_templates()
@@ -82,6 +92,34 @@ class PersianConversationFlow:
             "help": ["کمک", "راهنما", "چیکار", "قابلیت", "می‌تونی"]
         }
     
+    @staticmethod
+    def _normalize_for_matching(text: str) -> str:
+        return normalize_persian(text, "match").lower()
+    
+    # Keyword categories whose subtypes _pattern_match_intent enumerates, so new subtypes are usable
+    OPEN_PATTERN_CATEGORIES = ("device_control", "actions")
+    
+    def add_intent_pattern(self, category: str, pattern: str, subtype: Optional[str] = None) -> bool:
+        """
+        Hot-add a keyword to a category _pattern_match_intent reads; it takes effect on the next
+        utterance. Raises ValueError for unknown categories, a subtype on a flat category, a
+        missing subtype, or a new subtype outside OPEN_PATTERN_CATEGORIES
+        """
+        words = self.persian_patterns.get(category)
+        if words is None:
+            raise ValueError(f"Unknown intent category: {category}")
+        if isinstance(words, dict):
+            if not subtype:
+                raise ValueError(f"Intent category {category} needs a subtype: {', '.join(words)}")
+            if subtype not in words and category not in self.OPEN_PATTERN_CATEGORIES:
+                raise ValueError(f"Unknown {category} subtype: {subtype}")
+            words = words.setdefault(subtype, [])
+        elif subtype:
+            raise ValueError(f"Intent category {category} has no subtypes")
+        if pattern not in words:
+            words.append(pattern)
+        return self.pattern_matcher.add(f"{category}.{subtype}" if subtype else category, pattern)
+    
     def _load_response_templates(self) -> Dict[str, List[str]]:
         """Load Persian response templates"""
         return {
@@ -175,18 +213,19 @@ class PersianConversationFlow:
             return {"intent": "other", "confidence": 0.0, "entities": {}}
     
     def _pattern_match_intent(self, user_input: str) -> Dict[str, Any]:
-        """Fast pattern matching for common Persian intents"""
-        user_lower = user_input.lower()
+        """Fast pattern matching for common Persian intents (one automaton pass over the utterance)"""
+        hits = self.pattern_matcher.search(user_input)
         intent_data = {
             "intent": "other",
             "confidence": 0.0,
             "entities": {},
             "action": None,
-            "device": None
+            "device": None,
+            "spans": {label: [(hit.start, hit.end) for hit in label_hits] for label, label_hits in hits.items()}
         }
         
         # Check for greetings
-        if any(greeting in user_lower for greeting in self.persian_patterns["greetings"]):
+        if "greetings" in hits:
             intent_data.update({
                 "intent": "greeting",
                 "confidence": 0.9
@@ -194,28 +233,16 @@ class PersianConversationFlow:
             return intent_data
         
         # Check for help requests
-        if any(help_word in user_lower for help_word in self.persian_patterns["help"]):
+        if "help" in hits:
             intent_data.update({
                 "intent": "help",
                 "confidence": 0.9
             })
             return intent_data
         
-        # Check for device control
-        device_found = None
-        action_found = None
-        
-        # Find device
-        for device_type, device_words in self.persian_patterns["device_control"].items():
-            if any(word in user_lower for word in device_words):
-                device_found = device_type
-                break
-        
-        # Find action
-        for action_type, action_words in self.persian_patterns["actions"].items():
-            if any(word in user_lower for word in action_words):
-                action_found = action_type
-                break
+        # Check for device control (first device/action type in pattern order, as before)
+        device_found = next((d for d in self.persian_patterns["device_control"] if f"device_control.{d}" in hits), None)
+        action_found = next((a for a in self.persian_patterns["actions"] if f"actions.{a}" in hits), None)
         
         if device_found and action_found:
             intent_data.update({
@@ -231,7 +258,7 @@ class PersianConversationFlow:
             return intent_data
         
         # Check for questions
-        if any(question_word in user_lower for question_word in self.persian_patterns["questions"]):
+        if "questions" in hits:
             intent_data.update({
                 "intent": "question",
                 "confidence": 0.7
@@ -240,14 +267,14 @@ class PersianConversationFlow:
         
         # Check for confirmations (if waiting for confirmation)
         if self.current_state == ConversationState.WAITING_CONFIRMATION:
-            if any(yes_word in user_lower for yes_word in self.persian_patterns["confirmations"]["yes"]):
+            if "confirmations.yes" in hits:
                 intent_data.update({
                     "intent": "confirmation",
                     "confirmation": True,
                     "confidence": 0.9
                 })
                 return intent_data
-            elif any(no_word in user_lower for no_word in self.persian_patterns["confirmations"]["no"]):
+            elif "confirmations.no" in hits:
                 intent_data.update({
                     "intent": "confirmation",
                     "confirmation": False,
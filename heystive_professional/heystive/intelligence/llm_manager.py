@@ -11,6 +11,9 @@ from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 import os
 
+from .response_cache import (ResponseCache, response_key, mentions_any, CACHE_SIZE, CACHE_TTL_S,
+                             TIME_TERMS, FOLLOW_UP_TERMS)
+
 # Optional imports
 try:
     import openai
@@ -44,6 +47,17 @@ class PersianLLMManager:
             "persian_accuracy": 0.0
         }
         
+        # Response cache for intents whose answer does not depend on the conversation so far;
+        # their prompts carry no history and only the context fields listed here. Turns that
+        # mention the clock or refer back to earlier turns bypass it
+        self.response_cache = ResponseCache(
+            int(config.get("llm_cache_size", CACHE_SIZE)),
+            float(config.get("llm_cache_ttl_s", CACHE_TTL_S))
+        )
+        self.cache_intents = set(config.get("llm_cache_intents", ["greeting", "help", "question"]))
+        self.cache_context_fields = list(config.get("llm_cache_context_fields", ["device_states", "weather"]))
+        self.cache_bypass_terms = tuple(config.get("llm_cache_bypass_terms", TIME_TERMS + FOLLOW_UP_TERMS))
+        
         # Initialize LLM clients
         self.clients = {}
         self._initialize_llm_clients()
@@ -84,13 +98,15 @@ class PersianLLMManager:
 
 همیشه مؤدب، مفید و دقیق باشید."""
 
-    async def generate_persian_response(self, user_input: str, context: Dict[str, Any] = None) -> str:
+    async def generate_persian_response(self, user_input: str, context: Dict[str, Any] = None,
+                                        use_cache: bool = True) -> str:
         """
         Generate natural Persian response using LLM
         
         Args:
             user_input: User's Persian input text
             context: Additional context (device states, time, etc.)
+            use_cache: False to always call the LLM (only cache_intents are ever cached)
             
         Returns:
             Persian response text
@@ -98,14 +114,18 @@ class PersianLLMManager:
         start_time = time.time()
         
         try:
-            # Prepare conversation context
-            messages = self._prepare_conversation_context(user_input, context)
-            
-            # Generate response using current provider
-            response = await self._call_llm(messages)
-            
-            # Post-process Persian response
-            processed_response = self._post_process_persian_response(response)
+            if use_cache and self._cacheable(user_input, context):
+                # The prompt is built from exactly what the key covers: the text and the answer-relevant context
+                context_info = self._format_context_info(self._answer_context(context))
+                key = response_key(user_input, context_info)
+                processed_response, source = await self.response_cache.get_or_compute(
+                    key, lambda: self._generate_uncached(user_input, context_info, []))
+            else:
+                self.response_cache.stats_counters["bypassed"] += 1
+                context_info = self._format_context_info(context) if context else ""
+                processed_response, _ = await self._generate_uncached(
+                    user_input, context_info, self.conversation_history[-5:])
+                source = "bypass"
             
             # Update conversation history
             self._update_conversation_history(user_input, processed_response)
@@ -114,7 +134,7 @@ class PersianLLMManager:
             latency = time.time() - start_time
             self._update_response_stats(latency, True)
             
-            logger.info(f"Generated Persian response in {latency:.2f}s")
+            logger.info(f"Generated Persian response in {latency:.2f}s ({source})")
             return processed_response
             
         except Exception as e:
@@ -122,22 +142,52 @@ class PersianLLMManager:
             self._update_response_stats(0, False)
             return self._get_fallback_response(user_input)
     
+    async def _generate_uncached(self, user_input: str, context_info: str,
+                                 history: List[Dict[str, str]]) -> Tuple[str, bool]:
+        """One upstream call; returns (response, cacheable)"""
+        # Prepare conversation context
+        messages = self._prepare_messages(user_input, context_info, history)
+        
+        # Generate response using current provider
+        response = await self._call_llm(messages)
+        
+        # Post-process Persian response
+        processed_response = self._post_process_persian_response(response)
+        return processed_response, bool(processed_response)
+    
+    def _cacheable(self, user_input: str, context: Optional[Dict[str, Any]]) -> bool:
+        """
+        Only cache_intents are cached, and only when the text mentions neither the clock nor an
+        earlier turn; anything else (or no intent) bypasses with the full history and context
+        """
+        if not context or context.get("no_cache"):
+            return False
+        intent = context.get("intent") or (context.get("last_intent") or {}).get("intent")
+        return intent in self.cache_intents and not mentions_any(user_input, self.cache_bypass_terms)
+    
+    def _answer_context(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """The context fields that change a cached answer (not the clock, which would split the key every minute)"""
+        return {field: context[field] for field in self.cache_context_fields if field in context}
+    
     def _prepare_conversation_context(self, user_input: str, context: Dict[str, Any] = None) -> List[Dict[str, str]]:
         """Prepare conversation context for LLM"""
+        context_info = self._format_context_info(context) if context else ""
+        return self._prepare_messages(user_input, context_info, self.conversation_history[-5:])  # Last 5 exchanges
+    
+    def _prepare_messages(self, user_input: str, context_info: str,
+                          history: List[Dict[str, str]]) -> List[Dict[str, str]]:
         messages = [
             {"role": "system", "content": self.system_prompt}
         ]
         
         # Add recent conversation history
-        for entry in self.conversation_history[-5:]:  # Last 5 exchanges
+        for entry in history:
             messages.append({"role": "user", "content": entry["user"]})
             messages.append({"role": "assistant", "content": entry["assistant"]})
         
         # Add context information if available
-        if context:
-            context_info = self._format_context_info(context)
-            if context_info:
-                messages.append({"role": "system", "content": f"اطلاعات فعلی: {context_info}"})
+        if context_info:
+            messages.append({"role": "system", "content": f"اطلاعات فعلی: {context_info}"})
         
         # Add current user input
         messages.append({"role": "user", "content": user_input})
@@ -307,6 +357,7 @@ class PersianLLMManager:
             "provider": self.current_provider,
             "model": self.model_name,
             "response_stats": self.response_stats,
+            "response_cache": self.response_cache.stats(),
             "conversation_length": len(self.conversation_history),
             "available_clients": list(self.clients.keys())
         }
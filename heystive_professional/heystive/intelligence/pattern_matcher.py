@@ -0,0 +1,131 @@
+"""
+Multi-pattern keyword matcher (Aho-Corasick)
+Every pattern of every intent category is compiled into one automaton, so a single pass over
+the utterance reports all category hits with their spans, whatever the vocabulary size
+"""
+
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class PatternHit(NamedTuple):
+    """One occurrence of a pattern; start/end index the normalized text"""
+    label: str
+    pattern: str
+    start: int
+    end: int
+
+
+class _Automaton(NamedTuple):
+    goto: List[Dict[str, int]]
+    fail: List[int]
+    output: List[Tuple[Tuple[str, str], ...]]  # (label, pattern) pairs ending at this node
+    output_link: List[int]  # nearest proper suffix node that has output, 0 if none
+    report: List[int]  # the node itself if it has output, else its output_link
+
+
+class AhoCorasickMatcher:
+    """
+    Labelled substring matcher. add() may be called at any time (hot-add); the automaton is
+    rebuilt lazily on the next search, and searches in flight keep using the previous one
+    """
+
+    def __init__(self, patterns: Optional[Dict[str, Iterable[str]]] = None,
+                 normalizer: Optional[Callable[[str], str]] = None):
+        self.normalizer = normalizer or (lambda text: text)
+        self._patterns: Dict[str, Dict[str, None]] = {}  # pattern -> labels, insertion ordered
+        self._automaton: Optional[_Automaton] = None
+        self._lock = threading.Lock()
+        for label, words in (patterns or {}).items():
+            self.add_many(label, words)
+
+    def add(self, label: str, pattern: str) -> bool:
+        """Register pattern under label; returns False if it was already registered"""
+        key = self.normalizer(pattern)
+        if not key:
+            return False
+        with self._lock:
+            labels = self._patterns.setdefault(key, {})
+            if label in labels:
+                return False
+            labels[label] = None
+            self._automaton = None
+        return True
+
+    def add_many(self, label: str, patterns: Iterable[str]) -> int:
+        return sum(self.add(label, pattern) for pattern in patterns)
+
+    def __len__(self) -> int:
+        return sum(len(labels) for labels in self._patterns.values())
+
+    def _compile(self) -> _Automaton:
+        with self._lock:
+            if self._automaton is not None:
+                return self._automaton
+            goto: List[Dict[str, int]] = [{}]
+            output: List[List[Tuple[str, str]]] = [[]]
+            for pattern, labels in self._patterns.items():
+                node = 0
+                for ch in pattern:
+                    nxt = goto[node].get(ch)
+                    if nxt is None:
+                        nxt = goto[node][ch] = len(goto)
+                        goto.append({})
+                        output.append([])
+                    node = nxt
+                output[node].extend((label, pattern) for label in labels)
+
+            # Breadth-first so every node's fail target is finished before its children need it
+            fail = [0] * len(goto)
+            output_link = [0] * len(goto)
+            queue = deque(goto[0].values())
+            while queue:
+                node = queue.popleft()
+                for ch, child in goto[node].items():
+                    state = fail[node]
+                    while state and ch not in goto[state]:
+                        state = fail[state]
+                    fail[child] = goto[state].get(ch, 0)
+                    output_link[child] = fail[child] if output[fail[child]] else output_link[fail[child]]
+                    queue.append(child)
+
+            report = [node if output[node] else output_link[node] for node in range(len(goto))]
+            self._automaton = _Automaton(goto, fail, [tuple(o) for o in output], output_link, report)
+            return self._automaton
+
+    @staticmethod
+    def _scan(automaton: _Automaton, text: str) -> List[Tuple[int, int]]:
+        """(end, node) for every position where some pattern ends; the hot loop, kept minimal"""
+        goto, fail, _, _, report = automaton
+        ends = []
+        node = 0
+        for i, ch in enumerate(text, 1):
+            nxt = goto[node].get(ch)
+            while nxt is None and node:
+                node = fail[node]
+                nxt = goto[node].get(ch)
+            node = nxt or 0
+            if report[node]:
+                ends.append((i, report[node]))
+        return ends
+
+    def iter_hits(self, text: str, normalized: bool = False) -> Iterator[PatternHit]:
+        """Yield every (possibly overlapping) hit in one left-to-right pass"""
+        if not normalized:
+            text = self.normalizer(text)
+        # One automaton for the whole pass: an add() meanwhile only affects later searches
+        automaton = self._automaton or self._compile()
+        output, output_link = automaton.output, automaton.output_link
+        for end, hit in self._scan(automaton, text):
+            while hit:
+                for label, pattern in output[hit]:
+                    yield PatternHit(label, pattern, end - len(pattern), end)
+                hit = output_link[hit]
+
+    def search(self, text: str, normalized: bool = False) -> Dict[str, List[PatternHit]]:
+        """All hits grouped by label, each group ordered by end position"""
+        hits: Dict[str, List[PatternHit]] = {}
+        for hit in self.iter_hits(text, normalized):
+            hits.setdefault(hit.label, []).append(hit)
+        return hits
@@ -0,0 +1,120 @@
+"""
+LLM response cache for the Persian assistant
+TTL + LRU cache keyed by normalized user text and a hash of the prompt-relevant context,
+with single-flight so concurrent identical prompts share one upstream call
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from ..utils.persian_text import normalize_persian
+
+CACHE_SIZE = int(os.environ.get("HEYSTIVE_LLM_CACHE_SIZE", "256"))
+CACHE_TTL_S = float(os.environ.get("HEYSTIVE_LLM_CACHE_TTL_S", "300"))
+# Words that make an answer depend on the clock or on earlier turns; such turns are never cached
+TIME_TERMS = ("ساعت", "زمان", "تاریخ", "وقت", "امروز", "فردا", "دیروز", "الان", "حالا", "چندمه", "چندم")
+FOLLOW_UP_TERMS = ("چرا", "این", "اون", "آن", "اینو", "اونو", "همین", "همون", "دوباره", "بعدش", "قبلی")
+WORD_RE = re.compile(r"\w+")
+
+
+def response_key(user_input: str, context_info: str = "") -> str:
+    """Normalized text (so "ساعت چنده؟" and "ساعت  چنده" collide) plus a context digest"""
+    text = normalize_persian(user_input, "match").lower().rstrip(".!?؟،,؛; ")
+    digest = hashlib.sha256(context_info.encode("utf-8")).hexdigest()[:16] if context_info else "-"
+    return f"{digest}:{text}"
+
+
+def mentions_any(user_input: str, terms) -> bool:
+    """True if the normalized text contains any of terms as a whole word"""
+    words = set(WORD_RE.findall(normalize_persian(user_input, "match").lower()))
+    return any(normalize_persian(term, "match").lower() in words for term in terms)
+
+
+class ResponseCache:
+    """
+    Bounded, expiring response cache. Entries remember the upstream latency they cost, so
+    every hit can be reported as latency saved
+    """
+
+    def __init__(self, max_entries: int = CACHE_SIZE, ttl_s: float = CACHE_TTL_S):
+        self.max_entries = max(0, max_entries)
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[str, Tuple[float, str, float]]" = OrderedDict()  # key -> (expires_at, response, latency)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats_counters = {"hits": 0, "misses": 0, "shared": 0, "bypassed": 0, "evictions": 0, "expired": 0}
+        self.saved_latency_s = 0.0
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response, latency = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats_counters["expired"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats_counters["hits"] += 1
+        self.saved_latency_s += latency
+        return response
+
+    def put(self, key: str, response: str, latency: float = 0.0):
+        if not self.max_entries:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_s, response, latency)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats_counters["evictions"] += 1
+
+    async def _fill(self, key: str, compute: Callable[[], Awaitable[Tuple[str, bool]]]) -> str:
+        start = time.monotonic()
+        try:
+            response, cacheable = await compute()
+            if cacheable:
+                self.put(key, response, time.monotonic() - start)
+            return response
+        finally:
+            self._inflight.pop(key, None)
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Tuple[str, bool]]]) -> Tuple[str, str]:
+        """
+        Cached response, else join an identical in-flight call, else start compute() -> (response,
+        cacheable). Returns (response, source) with source "hit", "shared" or "miss". A failed
+        upstream call is raised to every waiter and nothing is cached
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached, "hit"
+        pending = self._inflight.get(key)
+        if pending is None:
+            self.stats_counters["misses"] += 1
+            # The call runs as its own task, so it outlives whichever waiter happened to start it
+            pending = self._inflight[key] = asyncio.ensure_future(self._fill(key, compute))
+            pending.add_done_callback(lambda task: task.cancelled() or task.exception())
+            source = "miss"
+        else:
+            self.stats_counters["shared"] += 1
+            source = "shared"
+        # shield: one waiter being cancelled must not cancel the call the others share
+        return await asyncio.shield(pending), source
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        c = self.stats_counters
+        lookups = c["hits"] + c["shared"] + c["misses"]
+        return {
+            **c,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl_s,
+            "hit_rate": round((c["hits"] + c["shared"]) / lookups, 4) if lookups else 0.0,
+            "saved_latency_s": round(self.saved_latency_s, 3),
+        }
@@ -18,6 +18,8 @@ This package provides intelligent Persian TTS model management including:
 - بهینه‌سازی و مدیریت فضای ذخیره‌سازی
 """
 
+from typing import Dict, List
+
 from .hardware_detector import HardwareDetector
 from .model_downloader import PersianTTSModelDownloader
 from .intelligent_model_manager import IntelligentModelManager
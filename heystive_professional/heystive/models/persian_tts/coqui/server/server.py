@@ -15,6 +15,13 @@ from TTS.config import load_config
 from TTS.utils.manage import ModelManager
 from TTS.utils.synthesizer import Synthesizer
 
+try:
+    from heystive.engines.tts.vits_batcher import MicroBatcher, VitsBatchRunner, join_sentences
+    batcher_import_error = None
+except ImportError as e:
+    MicroBatcher = None
+    batcher_import_error = e
+
 
 def create_argparser():
     def convert_boolean(x):
@@ -57,6 +64,15 @@ def create_argparser():
     parser.add_argument("--use_cuda", type=convert_boolean, default=False, help="true to use CUDA.")
     parser.add_argument("--debug", type=convert_boolean, default=False, help="true to enable Flask debug mode.")
     parser.add_argument("--show_details", type=convert_boolean, default=False, help="Generate model detail page.")
+    parser.add_argument(
+        "--batch_max_size",
+        type=int,
+        default=1,
+        help="micro-batch up to this many concurrent /api/tts requests into one VITS forward pass (1 disables).",
+    )
+    parser.add_argument(
+        "--batch_max_wait_ms", type=float, default=5.0, help="how long the first request in a batch waits for others."
+    )
     return parser
 
 
@@ -125,6 +141,30 @@ language_manager = getattr(synthesizer.tts_model, "language_manager", None)
 
 # TODO: set this from SpeakerManager
 use_gst = synthesizer.tts_config.get("use_gst", False)
+
+lock = Lock()
+
+# micro-batching is only valid for single-speaker VITS models that produce the waveform directly
+batcher = None
+if args.batch_max_size > 1 and MicroBatcher is None:
+    print(f" > Warning: --batch_max_size ignored, heystive micro-batcher unavailable: {batcher_import_error}")
+elif (
+    args.batch_max_size > 1
+    and type(synthesizer.tts_model).__name__ == "Vits"
+    and synthesizer.vocoder_model is None
+    and not use_multi_speaker
+    and not use_multi_language
+):
+    runner = VitsBatchRunner.from_synthesizer(synthesizer)
+
+    def run_batch(items):
+        with lock:
+            return runner(items)
+
+    batcher = MicroBatcher(run_batch, args.batch_max_size, args.batch_max_wait_ms)
+elif args.batch_max_size > 1:
+    print(" > Warning: --batch_max_size ignored, micro-batching needs a single-speaker VITS model without a vocoder")
+
 app = Flask(__name__)
 
 
@@ -185,16 +225,27 @@ def details():
     )
 
 
-lock = Lock()
+
+def batched_tts(text: str) -> list:
+    """Synthesize sentence by sentence through the micro-batcher, post-processed like Synthesizer.tts"""
+    sentences = [s for s in synthesizer.split_into_sentences(text) if s.strip()] or [text]
+    futures = [batcher.submit(sentence) for sentence in sentences]
+    return list(join_sentences([future.result() for future in futures]))
 
 
 @app.route("/api/tts", methods=["GET", "POST"])
 def tts():
+    text = request.headers.get("text") or request.values.get("text", "")
+    speaker_idx = request.headers.get("speaker-id") or request.values.get("speaker_id", "")
+    language_idx = request.headers.get("language-id") or request.values.get("language_id", "")
+    style_wav = request.headers.get("style-wav") or request.values.get("style_wav", "")
+    if batcher is not None and not (speaker_idx or language_idx or style_wav):
+        print(f" > Model input (batched): {text}")
+        wavs = batched_tts(text)
+        out = io.BytesIO()
+        synthesizer.save_wav(wavs, out)
+        return send_file(out, mimetype="audio/wav")
     with lock:
-        text = request.headers.get("text") or request.values.get("text", "")
-        speaker_idx = request.headers.get("speaker-id") or request.values.get("speaker_id", "")
-        language_idx = request.headers.get("language-id") or request.values.get("language_id", "")
-        style_wav = request.headers.get("style-wav") or request.values.get("style_wav", "")
         style_wav = style_wav_uri_to_dict(style_wav)
 
         print(f" > Model input: {text}")
@@ -206,6 +257,12 @@ def tts():
     return send_file(out, mimetype="audio/wav")
 
 
+@app.route("/api/tts/stats", methods=["GET"])
+def tts_stats():
+    """Micro-batching throughput metrics"""
+    return {"batching": batcher is not None, **(batcher.stats() if batcher is not None else {})}
+
+
 # Basic MaryTTS compatibility layer
 
 
@@ -1033,18 +1033,12 @@ class SteveProfessionalWebInterface:
             engine.setProperty('rate', 150)
             engine.setProperty('volume', 1.0)
             
-            with tempfile.NamedTemporaryFile(suffix=f'.{audio_format}', delete=False) as tmp_file:
-                engine.save_to_file(text, tmp_file.name)
+            # pyttsx3 can only render to a path: unique scratch dir, read back, removed on exit
+            with tempfile.TemporaryDirectory(prefix="heystive_tts_") as tmp_dir:
+                tmp_path = Path(tmp_dir) / f"speech.{audio_format}"
+                engine.save_to_file(text, str(tmp_path))
                 engine.runAndWait()
-                
-                # Read the generated audio file
-                with open(tmp_file.name, 'rb') as f:
-                    audio_data = f.read()
-                
-                # Clean up
-                os.unlink(tmp_file.name)
-                
-                return audio_data
+                return tmp_path.read_bytes()
                 
         except Exception as e:
             logger.error(f"System TTS error: {e}")
@@ -1054,33 +1048,23 @@ class SteveProfessionalWebInterface:
         """Generate audio using Google TTS"""
         try:
             from gtts import gTTS
-            import tempfile
             
             tts = gTTS(text=text, lang='fa', slow=False)
             
-            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp_file:
-                tts.save(tmp_file.name)
-                
-                # Convert to desired format if needed
-                if audio_format == 'wav':
-                    from pydub import AudioSegment
-                    audio = AudioSegment.from_mp3(tmp_file.name)
-                    
-                    wav_file = tmp_file.name.replace('.mp3', '.wav')
-                    audio.export(wav_file, format="wav")
-                    
-                    with open(wav_file, 'rb') as f:
-                        audio_data = f.read()
-                    
-                    os.unlink(tmp_file.name)
-                    os.unlink(wav_file)
-                else:
-                    with open(tmp_file.name, 'rb') as f:
-                        audio_data = f.read()
-                    
-                    os.unlink(tmp_file.name)
+            mp3_buffer = io.BytesIO()
+            tts.write_to_fp(mp3_buffer)
+            mp3_buffer.seek(0)
+            
+            # Convert to desired format if needed
+            if audio_format == 'wav':
+                from pydub import AudioSegment
+                audio = AudioSegment.from_file(mp3_buffer, format="mp3")
                 
-                return audio_data
+                wav_buffer = io.BytesIO()
+                audio.export(wav_buffer, format="wav")
+                return wav_buffer.getvalue()
+            
+            return mp3_buffer.getvalue()
                 
         except Exception as e:
             logger.error(f"Google TTS error: {e}")
@@ -1090,8 +1074,7 @@ class SteveProfessionalWebInterface:
         """Generate mock audio bytes for testing"""
         try:
             import numpy as np
-            import wave
-            import tempfile
+            from ...engines.tts.audio_result import encode_wav
             
             # Generate simple tone based on text
             duration = max(1.0, len(text) * 0.1)
@@ -1118,24 +1101,8 @@ class SteveProfessionalWebInterface:
             envelope = np.exp(-t * 0.3) * (1 - np.exp(-t * 5))
             audio = audio * envelope
             
-            # Convert to 16-bit PCM
-            audio_int16 = (audio * 32767).astype(np.int16)
-            
-            # Create WAV file in memory
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
-                with wave.open(tmp_file.name, 'wb') as wav_file:
-                    wav_file.setnchannels(1)
-                    wav_file.setsampwidth(2)
-                    wav_file.setframerate(sample_rate)
-                    wav_file.writeframes(audio_int16.tobytes())
-                
-                # Read the WAV data
-                with open(tmp_file.name, 'rb') as f:
-                    wav_data = f.read()
-                
-                os.unlink(tmp_file.name)
-                
-                return wav_data
+            # Encode 16-bit PCM WAV in memory
+            return encode_wav(audio, sample_rate)
                 
         except Exception as e:
             logger.error(f"Mock audio generation error: {e}")
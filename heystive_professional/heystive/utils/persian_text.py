@@ -0,0 +1,131 @@
+"""
+Persian text normalization shared by TTS, STT, the API bridge and the voice command extensions
+Character folding is one precompiled str.translate table per profile, whitespace/punctuation/ZWNJ
+cleanup is one combined regex pass, and repeated inputs are served from an LRU
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+PERSIAN_DIGITS = "۰۱۲۳۴۵۶۷۸۹"
+ARABIC_INDIC_DIGITS = "٠١٢٣٤٥٦٧٨٩"
+LATIN_DIGITS = "0123456789"
+
+DIGITS_TO_LATIN = str.maketrans(PERSIAN_DIGITS + ARABIC_INDIC_DIGITS, LATIN_DIGITS * 2)
+DIGITS_TO_PERSIAN = str.maketrans(LATIN_DIGITS + ARABIC_INDIC_DIGITS, PERSIAN_DIGITS * 2)
+
+# Arabic code points that have a distinct Persian form
+ARABIC_LETTERS = {"ي": "ی", "ى": "ی", "ك": "ک", "ة": "ه", **dict(zip(ARABIC_INDIC_DIGITS, PERSIAN_DIGITS))}
+PUNCTUATION_TO_LATIN = {"؟": "?", "،": ",", "؛": ";"}
+# Letters the fallback TTS engines mispronounce, folded to the letter with the same Persian sound
+PHONETIC_FOLDS = {"ض": "ز", "ص": "س", "ث": "س", "ظ": "ز", "ط": "ت", "ق": "غ"}
+
+ZWNJ = "\u200c"
+
+PUNCTUATION = ".,!?:;؟،؛"
+
+# One pass over only the spans that change, so already-clean text costs a single scan:
+# a whitespace/ZWNJ run longer than one character, a lone non-space whitespace character,
+# or a lone space before punctuation. Every branch starts with the same character class,
+# which lets the regex engine skip ahead instead of trying the whole pattern at each position
+CLEANUP_RE = re.compile(r"[\s\u200c](?:[\s\u200c]+|(?<=[^\S ])|(?=[.,!?:;؟،؛]))")
+
+
+PROFILES: Dict[str, Dict] = {
+    # Generic text for synthesis/recognition: ASCII digits and punctuation
+    "text": {"digits": "latin", "punctuation": True},
+    # Fallback TTS engines: ASCII digits plus phonetic letter folding
+    "tts": {"digits": "latin", "phonetic": True},
+    # Text shown to users: Persian letters, Arabic hamza as hamza-above
+    "display": {"hamza": "\u0654"},
+    # Command matching: Persian digits, hamza dropped
+    "match": {"digits": "persian", "hamza": ""},
+}
+
+
+def _compose(*maps: Dict[str, str]) -> Dict[str, str]:
+    """Fold several char maps into one; later maps also apply to earlier outputs"""
+    table: Dict[str, str] = {}
+    for mapping in maps:
+        for src, dst in table.items():
+            table[src] = "".join(mapping.get(ch, ch) for ch in dst)
+        for src, dst in mapping.items():
+            table.setdefault(src, dst)
+    return {src: dst for src, dst in table.items() if src != dst}
+
+
+def _translate_table(mapping: Dict[str, str]) -> List[Optional[str]]:
+    """
+    Dense list table for str.translate: indexing a list is about twice as fast as the dict
+    str.maketrans builds, and code points past its end raise LookupError, which translate
+    treats as "leave unchanged"
+    """
+    size = max((ord(src) for src in mapping), default=-1) + 1
+    table: List[Optional[str]] = [chr(i) for i in range(size)]
+    for src, dst in mapping.items():
+        table[ord(src)] = dst or None
+    return table
+
+
+class PersianNormalizer:
+    """
+    Table-driven normalizer; normalize() is the cached entry point. Instances are cheap to
+    build, but callers should share the per-profile instances from get_normalizer()
+    """
+
+    def __init__(self, digits: Optional[str] = None, punctuation: bool = False, phonetic: bool = False,
+                 arabic_letters: bool = True, hamza: Optional[str] = None, cache_size: int = 2048):
+        maps = []
+        if arabic_letters:
+            maps.append(ARABIC_LETTERS)
+        if hamza is not None:
+            maps.append({"ء": hamza})
+        if digits == "latin":
+            maps.append(dict(zip(PERSIAN_DIGITS + ARABIC_INDIC_DIGITS, LATIN_DIGITS * 2)))
+        elif digits == "persian":
+            maps.append(dict(zip(LATIN_DIGITS + ARABIC_INDIC_DIGITS, PERSIAN_DIGITS * 2)))
+        elif digits is not None:
+            raise ValueError(f"digits must be 'latin', 'persian' or None, not {digits!r}")
+        if punctuation:
+            maps.append(PUNCTUATION_TO_LATIN)
+        if phonetic:
+            maps.append(PHONETIC_FOLDS)
+        folds = _compose(*maps)
+        self.table = _translate_table(folds)
+        # Most input has nothing to fold; a character-class search is far cheaper than translate
+        self._foldable = re.compile("[" + re.escape("".join(folds)) + "]").search if folds else None
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+
+    @staticmethod
+    def _cleanup(match) -> str:
+        run = match.group()
+        if not run.strip(ZWNJ):
+            return ZWNJ  # repeated ZWNJ collapses to one
+        # Whitespace (and any ZWNJ touching it) is dropped before punctuation and at the end
+        # of the text (the empty slice is "in" any string), otherwise it becomes one space
+        end = match.end()
+        return "" if match.string[end:end + 1] in PUNCTUATION else " "
+
+    def _normalize(self, text: str) -> str:
+        if not text:
+            return ""
+        if self._foldable and self._foldable(text):
+            text = text.translate(self.table)
+        return CLEANUP_RE.sub(self._cleanup, text).strip(" " + ZWNJ)
+
+    def cache_info(self):
+        return self.normalize.cache_info()
+
+
+@lru_cache(maxsize=None)
+def get_normalizer(profile: str = "text") -> PersianNormalizer:
+    """Shared normalizer (and LRU) for a named profile"""
+    try:
+        return PersianNormalizer(**PROFILES[profile])
+    except KeyError:
+        raise ValueError(f"Unknown normalization profile: {profile}") from None
+
+
+def normalize_persian(text: str, profile: str = "text") -> str:
+    return get_normalizer(profile).normalize(text)
@@ -1,29 +1,47 @@
-from typing import Tuple, Dict, List
+import logging
+from typing import Tuple, Dict, List, AsyncIterator
 from skills.time_skill import TimeSkill
 from skills.calc_skill import CalcSkill
 from skills.open_url_skill import OpenUrlSkill
 from skills.note_skill import NoteSkill
+from skill_dispatch import SkillDispatcher
+from plan_executor import PlanExecutor
+logger = logging.getLogger(__name__)
 skills = [TimeSkill(), CalcSkill(), OpenUrlSkill(), NoteSkill()]
+dispatcher = SkillDispatcher(skills)
+try:
+    from skills_registry import load_sandbox_skills
+    for s in load_sandbox_skills():
+        dispatcher.register(s)
+except Exception as e:
+    logger.warning("sandbox skills not loaded: %s", e)
 def route_intent(text: str, context: dict) -> Tuple[str, Dict]:
-    for s in skills:
-        if s.can_handle(text):
-            return s.name, s.handle(text, context)
-    return "fallback", {"message": "no matching skill"}
+    return dispatcher.route(text, context)
+
+def step_text(args) -> str:
+    if isinstance(args, str):
+        return args
+    if isinstance(args, dict) and isinstance(args.get("text"), str):
+        return args["text"]
+    return str(args)
+
+def run_step(step: dict, context: dict) -> Dict:
+    args = step.get("args", {})
+    # Structured args stay available to the skill alongside the plain text
+    return dispatcher.execute(step.get("skill", "fallback"), step_text(args), {**context, "args": args})
 
 def execute_plan(plan: List[dict], context: dict) -> List[dict]:
     results = []
     for step in plan:
-        skill_name = step.get("skill", "fallback")
-        args = step.get("args", {})
-        result = {"skill": skill_name, "args": args}
-        for s in skills:
-            if s.name == skill_name:
-                try:
-                    result["result"] = s.handle(str(args), context)
-                except Exception as e:
-                    result["result"] = {"error": str(e)}
-                break
-        else:
-            result["result"] = {"error": "unknown skill"}
+        result = {"skill": step.get("skill", "fallback"), "args": step.get("args", {})}
+        result["result"] = run_step(step, context)
         results.append(result)
-    return results
\ No newline at end of file
+    return results
+
+plan_executor = PlanExecutor(run_step)
+
+def stream_plan(plan: List[dict], context: dict) -> AsyncIterator[dict]:
+    return plan_executor.stream(plan, context)
+
+async def execute_plan_async(plan: List[dict], context: dict) -> List[dict]:
+    return await plan_executor.run(plan, context)
\ No newline at end of file
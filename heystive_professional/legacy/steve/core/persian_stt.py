@@ -15,6 +15,9 @@ from pathlib import Path
 import psutil
 import gc
 
+# legacy/steve runs from heystive_professional, next to the heystive package
+from heystive.utils.persian_text import normalize_persian
+
 logger = logging.getLogger(__name__)
 
 class AdaptivePersianSTT:
@@ -483,46 +486,11 @@ class PersianLanguageProcessor:
 
 
 class PersianTextNormalizer:
-    """Persian text normalization utilities"""
+    """Persian text normalization utilities (ASCII digits and punctuation, collapsed whitespace)"""
     
     def normalize(self, text: str) -> str:
         """Normalize Persian text"""
-        # Normalize Persian digits
-        text = self._normalize_digits(text)
-        
-        # Normalize Persian punctuation
-        text = self._normalize_punctuation(text)
-        
-        # Normalize whitespace
-        text = self._normalize_whitespace(text)
-        
-        return text
-    
-    def _normalize_digits(self, text: str) -> str:
-        """Normalize Persian digits to English"""
-        persian_digits = '۰۱۲۳۴۵۶۷۸۹'
-        english_digits = '0123456789'
-        
-        for p, e in zip(persian_digits, english_digits):
-            text = text.replace(p, e)
-        
-        return text
-    
-    def _normalize_punctuation(self, text: str) -> str:
-        """Normalize Persian punctuation"""
-        # Persian question mark
-        text = text.replace('؟', '?')
-        
-        # Persian comma
-        text = text.replace('،', ',')
-        
-        return text
-    
-    def _normalize_whitespace(self, text: str) -> str:
-        """Normalize whitespace"""
-        import re
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
+        return normalize_persian(text, "text")
 
 
 class AudioPreprocessor:
@@ -0,0 +1,204 @@
+"""
+Concurrent plan execution
+Plan steps form a DAG through "depends_on". Every step whose dependencies have finished runs
+at once (skills are synchronous, so each runs on the executor's own bounded thread pool) under
+its own timeout, and step records are yielded as they complete rather than in plan order
+"""
+
+import asyncio
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List
+
+PLAN_STEP_TIMEOUT_S = float(os.environ.get("HEYSTIVE_PLAN_STEP_TIMEOUT_S", "10"))
+PLAN_STEP_MIN_TIMEOUT_S = 0.01
+PLAN_STEP_MAX_TIMEOUT_S = float(os.environ.get("HEYSTIVE_PLAN_STEP_MAX_TIMEOUT_S", "120"))
+PLAN_MAX_CONCURRENCY = int(os.environ.get("HEYSTIVE_PLAN_MAX_CONCURRENCY", "8"))
+# Threads shared by every plan; larger than one plan's concurrency so a few hung skills leave room
+PLAN_POOL_WORKERS = int(os.environ.get("HEYSTIVE_PLAN_POOL_WORKERS", str(2 * PLAN_MAX_CONCURRENCY)))
+# How long a step may wait for a free thread before it is reported as timed out without running
+PLAN_QUEUE_TIMEOUT_S = float(os.environ.get("HEYSTIVE_PLAN_QUEUE_TIMEOUT_S", "10"))
+
+
+class PlanError(ValueError):
+    """The plan is not a valid DAG (duplicate ids, unknown dependencies or a cycle)"""
+
+
+def normalize_plan(plan: List[dict]) -> List[dict]:
+    """
+    Copy the steps with string ids (the step index when none is given) and list-valued
+    depends_on, rejecting anything that is not a DAG
+    """
+    steps, ids = [], set()
+    for i, step in enumerate(plan):
+        step = dict(step)
+        step["id"] = str(step.get("id", i))
+        if step["id"] in ids:
+            raise PlanError(f"duplicate step id: {step['id']}")
+        ids.add(step["id"])
+        deps = step.get("depends_on")
+        deps = [] if deps is None else deps
+        step["depends_on"] = [str(d) for d in ([deps] if isinstance(deps, (str, int)) else deps)]
+        steps.append(step)
+
+    indegree = {s["id"]: len(s["depends_on"]) for s in steps}
+    dependents: Dict[str, List[str]] = {s["id"]: [] for s in steps}
+    for step in steps:
+        for dep in step["depends_on"]:
+            if dep not in ids:
+                raise PlanError(f"step {step['id']} depends on unknown step {dep}")
+            dependents[dep].append(step["id"])
+    ready = [sid for sid, n in indegree.items() if n == 0]
+    seen = 0
+    while ready:
+        seen += 1
+        for child in dependents[ready.pop()]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+    if seen != len(steps):
+        raise PlanError("plan has a dependency cycle")
+    return steps
+
+
+class PlanExecutor:
+    """
+    Runs plans through run_step(step, context) -> result dict. A step's context carries the
+    results of its dependencies under "results". A step that errors or times out causes its
+    dependents to be skipped; independent branches carry on.
+
+    Steps run on a pool of pool_workers threads owned by the executor and shared by all of its
+    plans, not on the event loop's default executor. A timed-out step keeps its thread until it
+    returns, so hung skills can starve later plans of threads, never other asyncio.to_thread
+    callers. A step's timeout only starts once a thread picks it up, and a step that waits longer
+    than queue_timeout_s for one is reported as timed out without running
+    """
+
+    def __init__(self, run_step: Callable[[dict, dict], dict], max_concurrency: int = PLAN_MAX_CONCURRENCY,
+                 step_timeout_s: float = PLAN_STEP_TIMEOUT_S, pool_workers: int = PLAN_POOL_WORKERS,
+                 queue_timeout_s: float = PLAN_QUEUE_TIMEOUT_S):
+        self.run_step = run_step
+        self.max_concurrency = max(1, max_concurrency)
+        self.step_timeout_s = step_timeout_s
+        self.queue_timeout_s = queue_timeout_s
+        self._pool = ThreadPoolExecutor(max_workers=max(1, pool_workers), thread_name_prefix="plan-step")
+
+    def close(self):
+        """Stop accepting steps; steps already running are left to finish"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _timeout(self, step: dict) -> float:
+        """The step's timeout_s (default step_timeout_s) clamped to a sane range; ValueError if not a number"""
+        raw = step.get("timeout_s")
+        if raw is None:
+            return self.step_timeout_s
+        if isinstance(raw, bool):
+            raise ValueError(f"invalid timeout_s: {raw!r}")
+        try:
+            timeout = float(raw)
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid timeout_s: {raw!r}") from None
+        if math.isnan(timeout):
+            raise ValueError(f"invalid timeout_s: {raw!r}")
+        return min(max(timeout, PLAN_STEP_MIN_TIMEOUT_S), PLAN_STEP_MAX_TIMEOUT_S)
+
+    async def _call(self, step: dict, step_context: dict, timeout: float):
+        loop = asyncio.get_running_loop()
+        started = loop.create_future()
+
+        def mark_started():
+            if not started.done():
+                started.set_result(None)
+
+        def call():
+            loop.call_soon_threadsafe(mark_started)
+            return self.run_step(step, step_context)
+
+        work = loop.run_in_executor(self._pool, call)
+        try:
+            try:
+                await asyncio.wait_for(asyncio.shield(started), self.queue_timeout_s)
+            except asyncio.TimeoutError:
+                raise asyncio.TimeoutError(f"no plan worker free after {self.queue_timeout_s:g}s") from None
+            # The clock starts when a thread runs the step; on timeout the thread cannot be
+            # interrupted and its result is discarded
+            return await asyncio.wait_for(work, timeout)
+        finally:
+            # Drops the step if it is still queued (timed out or the plan was closed)
+            work.cancel()
+
+    async def _run(self, step: dict, context: dict, results: Dict[str, dict], slots: asyncio.Semaphore) -> dict:
+        record = {"id": step["id"], "skill": step.get("skill", "fallback"), "args": step.get("args", {})}
+        step_context = {**context, "results": {dep: results[dep]["result"] for dep in step["depends_on"]}}
+        async with slots:
+            start = time.perf_counter()
+            timeout = None
+            try:
+                timeout = self._timeout(step)
+                result = await self._call(step, step_context, timeout)
+                status = "error" if isinstance(result, dict) and "error" in result else "ok"
+            except asyncio.TimeoutError as e:
+                result, status = {"error": str(e) or f"step timed out after {timeout:g}s"}, "timeout"
+            except Exception as e:
+                result, status = {"error": str(e)}, "error"
+            record.update(result=result, status=status, elapsed_ms=round((time.perf_counter() - start) * 1000, 2))
+        return record
+
+    async def stream(self, plan: List[dict], context: dict) -> AsyncIterator[dict]:
+        """
+        Yield one record per step as it finishes ({id, skill, args, result, status, elapsed_ms}).
+        Closing the generator early cancels the steps that have not finished
+        """
+        steps = {s["id"]: s for s in normalize_plan(plan)}
+        waiting = {sid: set(s["depends_on"]) for sid, s in steps.items()}
+        dependents: Dict[str, List[str]] = {sid: [] for sid in steps}
+        for sid, step in steps.items():
+            for dep in step["depends_on"]:
+                dependents[dep].append(sid)
+        results: Dict[str, dict] = {}
+        slots = asyncio.Semaphore(self.max_concurrency)
+        running: Dict[asyncio.Task, str] = {}
+
+        def start(sid: str):
+            running[asyncio.create_task(self._run(steps[sid], context, results, slots))] = sid
+
+        for sid, deps in waiting.items():
+            if not deps:
+                start(sid)
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    sid = running.pop(task)
+                    record = results[sid] = task.result()
+                    emit = [record]
+                    # Schedule or skip dependents before yielding, so a slow consumer never delays them
+                    if record["status"] == "ok":
+                        for child in dependents[sid]:
+                            waiting[child].discard(sid)
+                            if not waiting[child] and child not in results:
+                                start(child)
+                    else:
+                        blocked = list(dependents[sid])
+                        while blocked:
+                            child = blocked.pop()
+                            if child in results:
+                                continue
+                            results[child] = {"id": child, "skill": steps[child].get("skill", "fallback"),
+                                              "args": steps[child].get("args", {}), "status": "skipped",
+                                              "result": {"error": f"dependency {sid} {record['status']}"}, "elapsed_ms": 0.0}
+                            emit.append(results[child])
+                            blocked.extend(dependents[child])
+                    for item in emit:
+                        yield item
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def run(self, plan: List[dict], context: dict) -> List[dict]:
+        """All step records, in plan order"""
+        order = {s["id"]: i for i, s in enumerate(normalize_plan(plan))}
+        records = [record async for record in self.stream(plan, context)]
+        return sorted(records, key=lambda r: order[r["id"]])
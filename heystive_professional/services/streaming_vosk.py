@@ -1,18 +1,28 @@
-import json
+import json, threading
 try:
     from vosk import Model, KaldiRecognizer
 except Exception:
     Model = None
     KaldiRecognizer = None
 
+_models = {}
+_models_lock = threading.Lock()
+
+def _load_model(model_dir: str):
+    with _models_lock:
+        if model_dir not in _models:
+            _models[model_dir] = Model(model_dir)
+        return _models[model_dir]
+
 class StreamingSTTEngine:
     def __init__(self, model_dir: str, sample_rate: int):
+        self.model_dir = model_dir
         self.sample_rate = sample_rate
         self.enabled = False
         self._acc = bytearray()
         if Model and KaldiRecognizer:
             try:
-                self.model = Model(model_dir)
+                self.model = _load_model(model_dir)
                 self.rec = KaldiRecognizer(self.model, sample_rate)
                 self.enabled = True
             except Exception:
@@ -24,6 +34,10 @@ class StreamingSTTEngine:
             self.rec = None
             self.enabled = False
 
+    @property
+    def engine(self) -> str:
+        return "vosk" if self.enabled else "demo"
+
     def accept(self, pcm_s16le: bytes):
         if self.enabled and self.rec:
             ok = self.rec.AcceptWaveform(pcm_s16le)
@@ -43,4 +57,42 @@ class StreamingSTTEngine:
             res = json.loads(self.rec.FinalResult())
             txt = res.get("text", "").strip()
             return txt
-        return ""
\ No newline at end of file
+        return ""
+
+    def reset(self):
+        self._acc.clear()
+        if self.enabled and self.rec:
+            try:
+                self.rec.Reset()
+            except Exception:
+                self.rec = KaldiRecognizer(self.model, self.sample_rate)
+
+class RecognizerPool:
+    def __init__(self, model_dir: str, max_idle: int = 4):
+        self.model_dir = model_dir
+        self.max_idle = max_idle
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, sample_rate: int) -> StreamingSTTEngine:
+        with self._lock:
+            bucket = self._idle.get(sample_rate)
+            if bucket:
+                self.reused += 1
+                return bucket.pop()
+            self.created += 1
+        return StreamingSTTEngine(self.model_dir, sample_rate)
+
+    def release(self, eng: StreamingSTTEngine):
+        eng.reset()
+        with self._lock:
+            bucket = self._idle.setdefault(eng.sample_rate, [])
+            if len(bucket) < self.max_idle:
+                bucket.append(eng)
+
+    def stats(self) -> dict:
+        with self._lock:
+            idle = sum(len(b) for b in self._idle.values())
+        return {"created": self.created, "reused": self.reused, "idle": idle}
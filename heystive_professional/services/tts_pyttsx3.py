@@ -0,0 +1,88 @@
+import os, shutil, struct, subprocess, tempfile, threading
+from heystive.engines.tts.audio_result import WAV_HEADER_BYTES, AudioResult, encode_wav
+try:
+    import pyttsx3
+except Exception:
+    pyttsx3 = None
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def _espeak(text: str, voice: str = "fa"):
+    exe = shutil.which("espeak-ng") or shutil.which("espeak")
+    if not exe:
+        return None
+    for args in (["-v", voice], []):
+        proc = subprocess.run([exe, "--stdout", "-s", "150", *args, text], capture_output=True, timeout=10)
+        if proc.returncode == 0 and proc.stdout:
+            return AudioResult.from_bytes(proc.stdout, engine="espeak")
+    return None
+
+def _pyttsx3(text: str, tmp_dir=None):
+    global _engine
+    if pyttsx3 is None:
+        return None
+    with _engine_lock:
+        if _engine is None:
+            _engine = pyttsx3.init()
+        # pyttsx3 only renders to a path: private scratch dir, read back, removed on exit
+        with tempfile.TemporaryDirectory(prefix="heystive_tts_", dir=tmp_dir if tmp_dir and os.path.isdir(tmp_dir) else None) as tmp:
+            path = os.path.join(tmp, "speech.wav")
+            _engine.save_to_file(text, path)
+            _engine.runAndWait()
+            if os.path.exists(path) and os.path.getsize(path) > 0:
+                return AudioResult.from_file(path, engine="pyttsx3")
+    return None
+
+def synthesize(text: str, voice=None, tmp_dir=None) -> AudioResult:
+    """In-memory synthesis: espeak --stdout first, pyttsx3 as fallback"""
+    result = _espeak(text, voice or "fa") or _pyttsx3(text, tmp_dir)
+    if result is None:
+        raise RuntimeError("no offline TTS engine available (espeak/pyttsx3)")
+    return result
+
+def _espeak_stream(text: str, voice: str, chunk_bytes: int):
+    exe = shutil.which("espeak-ng") or shutil.which("espeak")
+    if not exe:
+        return None
+    for args in (["-v", voice], []):
+        proc = subprocess.Popen([exe, "--stdout", "-s", "150", *args, text], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        header = proc.stdout.read(WAV_HEADER_BYTES)
+        if len(header) == WAV_HEADER_BYTES and header[:4] == b"RIFF" and header[36:40] == b"data":
+            channels, sample_rate = struct.unpack_from("<HI", header, 22)
+            return sample_rate, channels, _pipe_chunks(proc, chunk_bytes)
+        proc.stdout.close()
+        proc.wait()
+    return None
+
+def _pipe_chunks(proc, chunk_bytes: int):
+    # read1 hands back whatever espeak has flushed so far instead of waiting for a full chunk
+    try:
+        while True:
+            data = proc.stdout.read1(chunk_bytes)
+            if not data:
+                break
+            yield data
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+
+def _buffer_chunks(pcm: bytes, chunk_bytes: int):
+    for i in range(0, len(pcm), chunk_bytes):
+        yield pcm[i:i + chunk_bytes]
+
+def open_pcm_stream(text: str, voice=None, tmp_dir=None, chunk_bytes: int = 4096):
+    """(sample_rate, channels, iterator of 16-bit PCM bytes) flushed as espeak produces them; pyttsx3 is whole-clip"""
+    stream = _espeak_stream(text, voice or "fa", chunk_bytes)
+    if stream is not None:
+        return stream
+    result = _pyttsx3(text, tmp_dir)
+    if result is None:
+        raise RuntimeError("no offline TTS engine available (espeak/pyttsx3)")
+    pcm = encode_wav(result.pcm(), result.sample_rate, result.channels)[WAV_HEADER_BYTES:]
+    return result.sample_rate, result.channels, _buffer_chunks(pcm, chunk_bytes)
+
+def tts_to_base64(text: str, tmp_dir=None) -> str:
+    return synthesize(text, tmp_dir=tmp_dir).to_base64()
@@ -0,0 +1,162 @@
+import atexit, copy, json, os, tempfile, threading, types
+COALESCE_S = float(os.environ.get("HEYSTIVE_SETTINGS_COALESCE_S", "0.05"))
+def freeze(obj):
+    if isinstance(obj, dict):
+        return types.MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(freeze(v) for v in obj)
+    return obj
+def thaw(obj):
+    if isinstance(obj, types.MappingProxyType):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return [thaw(v) for v in obj]
+    return obj
+class SettingsCache:
+    def __init__(self, path: str, coalesce_s: float = COALESCE_S):
+        self.path = os.path.abspath(path)
+        self.coalesce_s = coalesce_s
+        self.version = 0
+        self.loads = 0
+        self.hits = 0
+        self.writes = 0
+        self._lock = threading.RLock()
+        self._flushed = threading.Condition(self._lock)
+        self._flushes = 0
+        self._last_ok = True
+        self._sig = None
+        self._data = {}
+        self._frozen = freeze({})
+        self._pending = False
+        self._timer = None
+        self._revalidated = False
+        self._listeners = []
+    def _signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    def _set(self, data: dict):
+        self._data = data
+        self._frozen = freeze(data)
+        self.version += 1
+        for fn in list(self._listeners):
+            try:
+                fn(self.version)
+            except Exception:
+                pass
+    def _revalidate(self):
+        if self._pending:
+            return
+        sig = self._signature()
+        if self._revalidated and sig == self._sig:
+            self.hits += 1
+            return
+        data = {}
+        if sig is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception:
+                data = {}
+        if not isinstance(data, dict):
+            data = {}
+        self._sig = sig
+        self.loads += 1
+        if not self._revalidated or data != self._data:
+            self._revalidated = True
+            self._set(data)
+    def snapshot(self):
+        with self._lock:
+            self._revalidate()
+            return self._frozen
+    def versioned(self):
+        with self._lock:
+            self._revalidate()
+            return self.version, self._frozen
+    def read(self) -> dict:
+        with self._lock:
+            self._revalidate()
+            return copy.deepcopy(self._data)
+    def write(self, data: dict, sync: bool = False, wait: bool = True) -> bool:
+        # Returns once the disk write holding data has finished (writers arriving within
+        # coalesce_s share it). wait=False returns as soon as readers see data in memory
+        data = copy.deepcopy(dict(data or {}))
+        with self._lock:
+            self._revalidated = True
+            self._set(data)
+            self._pending = True
+            if sync or self.coalesce_s <= 0:
+                return self._flush_locked()
+            if self._timer is None:
+                self._timer = threading.Timer(self.coalesce_s, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+            if not wait:
+                return True
+            target = self._flushes + 1
+            if not self._flushed.wait_for(lambda: self._flushes >= target, timeout=self.coalesce_s + 10.0):
+                return False
+            return self._last_ok
+    def flush(self) -> bool:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            return self._flush_locked()
+    def _flush_locked(self) -> bool:
+        if not self._pending:
+            return True
+        self._pending = False
+        self._last_ok = self._write_file()
+        self._flushes += 1
+        self._flushed.notify_all()
+        return self._last_ok
+    def _write_file(self) -> bool:
+        folder = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(folder, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".settings.", suffix=".tmp", dir=folder)
+        except Exception:
+            return False
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except Exception:
+            try:
+                os.remove(tmp)
+            except Exception:
+                pass
+            return False
+        self._sig = self._signature()
+        self.writes += 1
+        return True
+    def subscribe(self, fn):
+        with self._lock:
+            self._listeners.append(fn)
+    def unsubscribe(self, fn):
+        with self._lock:
+            if fn in self._listeners:
+                self._listeners.remove(fn)
+    def stats(self) -> dict:
+        with self._lock:
+            return {"path": self.path, "version": self.version, "loads": self.loads, "hits": self.hits, "writes": self.writes, "pending": self._pending}
+_caches = {}
+_caches_lock = threading.Lock()
+def get_cache(path: str) -> SettingsCache:
+    key = os.path.abspath(path)
+    with _caches_lock:
+        c = _caches.get(key)
+        if c is None:
+            c = _caches[key] = SettingsCache(key)
+        return c
+def flush_all():
+    with _caches_lock:
+        caches = list(_caches.values())
+    for c in caches:
+        c.flush()
+atexit.register(flush_all)
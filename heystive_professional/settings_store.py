@@ -1,15 +1,13 @@
-import json, os, threading
+import os
+from settings_cache import get_cache
 SETTINGS_PATH = os.environ.get("HEYSTIVE_SETTINGS_PATH", "settings.json")
-_lock = threading.Lock()
+def _cache():
+  return get_cache(SETTINGS_PATH)
+def snapshot():
+  return _cache().snapshot()
 def read_settings():
-  if not os.path.isfile(SETTINGS_PATH):
-    return {}
-  with _lock:
-    try:
-      return json.loads(open(SETTINGS_PATH,"r",encoding="utf-8").read())
-    except Exception:
-      return {}
+  return _cache().read()
 def write_settings(data: dict):
-  with _lock:
-    open(SETTINGS_PATH,"w",encoding="utf-8").write(json.dumps(data, ensure_ascii=False))
-  return True
\ No newline at end of file
+  return _cache().write(data)
+def flush_settings():
+  return _cache().flush()
@@ -0,0 +1,98 @@
+"""
+Indexed skill dispatch
+Skills are looked up by name through a dict, and utterances are routed through one trigger
+index (a single Aho-Corasick pass) that preselects the skills whose can_handle is worth
+asking, so routing cost does not grow with the number of registered skills
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from heystive.intelligence.pattern_matcher import AhoCorasickMatcher
+from skills.base import Skill
+
+
+class SkillDispatcher:
+    """
+    Registry of skills in priority order. A skill with triggers is only asked can_handle when
+    one of them occurs in the lowercased text; a skill without triggers is asked every time
+    """
+
+    def __init__(self, skills: Optional[List[Skill]] = None):
+        self.skills: Dict[str, Skill] = {}
+        self._order: Dict[str, int] = {}
+        self._untriggered: List[str] = []
+        self._index = AhoCorasickMatcher(normalizer=str.lower)
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        for skill in skills or []:
+            self.register(skill)
+
+    def register(self, skill: Skill) -> Skill:
+        with self._lock:
+            if skill.name in self.skills:
+                raise ValueError(f"skill already registered: {skill.name}")
+            self.skills[skill.name] = skill
+            self._order[skill.name] = len(self._order)
+            self._stats[skill.name] = {"candidates": 0, "hits": 0, "errors": 0, "total_ms": 0.0}
+            triggers = [t for t in getattr(skill, "triggers", ()) if t]
+            if triggers:
+                self._index.add_many(skill.name, triggers)
+            else:
+                self._untriggered.append(skill.name)
+        return skill
+
+    def get(self, name: str) -> Optional[Skill]:
+        return self.skills.get(name)
+
+    def candidates(self, text: str) -> List[Skill]:
+        """Skills whose triggers occur in text plus the untriggered ones, in registration order"""
+        names = set(self._index.search(text))
+        names.update(self._untriggered)
+        return [self.skills[n] for n in sorted(names, key=self._order.__getitem__)]
+
+    def _count(self, name: str, **deltas: float):
+        # Plan steps run skills from several pool threads at once
+        with self._lock:
+            stats = self._stats[name]
+            for key, delta in deltas.items():
+                stats[key] += delta
+
+    def _run(self, skill: Skill, text: str, context: dict) -> dict:
+        start = time.perf_counter()
+        failed = 0
+        try:
+            return skill.handle(text, context)
+        except Exception:
+            failed = 1
+            raise
+        finally:
+            self._count(skill.name, hits=1, errors=failed, total_ms=(time.perf_counter() - start) * 1000)
+
+    def route(self, text: str, context: dict) -> Tuple[str, Dict]:
+        for skill in self.candidates(text):
+            self._count(skill.name, candidates=1)
+            if skill.can_handle(text):
+                return skill.name, self._run(skill, text, context)
+        return "fallback", {"message": "no matching skill"}
+
+    def execute(self, name: str, text: str, context: dict) -> Dict:
+        skill = self.skills.get(name)
+        if skill is None and name != "fallback":
+            return {"error": "unknown skill"}
+        try:
+            if skill is None:
+                # Plans use "fallback" for "whichever skill the text routes to"
+                return self.route(text, context)[1]
+            return self._run(skill, text, context)
+        except Exception as e:
+            return {"error": str(e)}
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            snapshot = {name: dict(s) for name, s in self._stats.items()}
+        return {
+            name: {**s, "avg_ms": round(s["total_ms"] / s["hits"], 3) if s["hits"] else 0.0, "total_ms": round(s["total_ms"], 3)}
+            for name, s in snapshot.items()
+        }
@@ -1,5 +1,7 @@
 class Skill:
     name: str = "skill"
+    # Lowercase substrings, one of which must occur for can_handle to be asked; empty = always ask
+    triggers: tuple = ()
     def can_handle(self, text: str) -> bool:
         return False
     def handle(self, text: str, context: dict) -> dict:
@@ -13,6 +13,7 @@ def eval_expr(expr: str):
     return _e(tree)
 class CalcSkill(Skill):
     name = "calc"
+    triggers = ("+", "-", "*", "/")
     def can_handle(self, text: str) -> bool:
         t = text.replace(" ", "")
         if not t: return False
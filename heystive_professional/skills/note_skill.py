@@ -1,11 +1,10 @@
-import sqlite3
-import os
+import time
+from store import get_conn
 from .base import Skill
 
-DB_PATH = os.environ.get("HEYSTIVE_DB", "heystive.db")
-
 class NoteSkill(Skill):
     name = "note"
+    triggers = ("note", "یادداشت", "نوت")
     
     def can_handle(self, text: str) -> bool:
         t = text.lower()
@@ -39,10 +38,7 @@ class NoteSkill(Skill):
         return text.strip()
     
     def _save_note(self, note_text: str) -> int:
-        con = sqlite3.connect(DB_PATH)
-        con.execute("CREATE TABLE IF NOT EXISTS notes (id INTEGER PRIMARY KEY AUTOINCREMENT, text TEXT, created_at REAL)")
-        cursor = con.execute("INSERT INTO notes (text, created_at) VALUES (?, ?)", (note_text, __import__('time').time()))
-        note_id = cursor.lastrowid
-        con.commit()
-        con.close()
-        return note_id
\ No newline at end of file
+        con = get_conn()
+        with con:
+            cursor = con.execute("INSERT INTO notes (text, created_at) VALUES (?, ?)", (note_text, time.time()))
+        return cursor.lastrowid
\ No newline at end of file
@@ -3,6 +3,7 @@ from .base import Skill
 url_re = re.compile(r"(https?://[\w\.-]+[\w\-/\.?=#%&+]*)", re.I)
 class OpenUrlSkill(Skill):
     name = "open_url"
+    triggers = ("http",)
     def can_handle(self, text: str) -> bool:
         t = text.lower()
         return t.startswith("open ") and bool(url_re.search(t))
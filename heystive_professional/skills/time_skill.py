@@ -2,6 +2,7 @@ from datetime import datetime, timezone
 from .base import Skill
 class TimeSkill(Skill):
     name = "time"
+    triggers = ("time", "clock")
     def can_handle(self, text: str) -> bool:
         t = text.lower()
         return "time" in t or "what time" in t or "clock" in t
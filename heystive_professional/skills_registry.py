@@ -1,12 +1,16 @@
-import json, os, sqlite3, subprocess, tempfile, time, shlex, pathlib
+import json, os, re, subprocess, tempfile, time, shlex, pathlib
 from typing import List, Dict, Tuple
-from .store import DB_PATH
+from store import get_conn
+from skills.base import Skill
 
-REG_DIR = "skills_registry"
-pathlib.Path(REG_DIR).mkdir(parents=True, exist_ok=True)
+REG_DIR = os.environ.get("HEYSTIVE_SKILLS_REGISTRY", str(pathlib.Path(__file__).resolve().parent.parent / "skills_registry"))
+# Comma-separated manifest names to expose as skills, or "all"; none are loaded by default
+SANDBOX_SKILLS = {n.strip() for n in os.environ.get("HEYSTIVE_SANDBOX_SKILLS", "").split(",") if n.strip()}
 
 def list_manifests() -> List[Dict]:
     items = []
+    if not os.path.isdir(REG_DIR):
+        return items
     for name in os.listdir(REG_DIR):
         d = os.path.join(REG_DIR, name)
         m = os.path.join(d, "skill.json")
@@ -20,15 +24,11 @@ def list_manifests() -> List[Dict]:
     return items
 
 def permissions_conn():
-    con = sqlite3.connect(DB_PATH)
-    con.execute("CREATE TABLE IF NOT EXISTS permissions (perm TEXT PRIMARY KEY, granted INTEGER)")
-    return con
+    return get_conn()
 
 def is_granted(perm: str) -> bool:
     con = permissions_conn()
-    cur = con.execute("SELECT granted FROM permissions WHERE perm=?", (perm,))
-    row = cur.fetchone()
-    con.close()
+    row = con.execute("SELECT granted FROM permissions WHERE perm=?", (perm,)).fetchone()
     return bool(row and row[0])
 
 def request_permission(perm: str) -> Dict:
@@ -36,9 +36,8 @@ def request_permission(perm: str) -> Dict:
 
 def grant_permission(perm: str) -> Dict:
     con = permissions_conn()
-    con.execute("INSERT OR REPLACE INTO permissions (perm, granted) VALUES (?, ?)", (perm, 1))
-    con.commit()
-    con.close()
+    with con:
+        con.execute("INSERT OR REPLACE INTO permissions (perm, granted) VALUES (?, ?)", (perm, 1))
     return {"permission": perm, "granted": True}
 
 def exec_sandbox(cmd: List[str], payload: Dict, timeout_s: int = 3, skill_name: str = None) -> Tuple[int, str]:
@@ -65,4 +64,33 @@ def exec_sandbox(cmd: List[str], payload: Dict, timeout_s: int = 3, skill_name:
         try:
             os.remove(inpath)
         except Exception:
-            pass
\ No newline at end of file
+            pass
+
+class SandboxSkill(Skill):
+    """A registry manifest exposed as a skill; an utterance must start with one of its "triggers", or a plan step names it"""
+    def __init__(self, manifest: Dict):
+        self.name = manifest["name"]
+        self.triggers = tuple(t.lower() for t in manifest.get("triggers", []) if t)
+        self._command = re.compile(r"(?:%s)(?!\w)" % "|".join(re.escape(t) for t in self.triggers)) if self.triggers else None
+        self.permissions = list(manifest.get("permissions", []))
+        self.entry = list(manifest.get("entry", []))
+        self.timeout_s = int(manifest.get("timeout_s", 3))
+    def can_handle(self, text: str) -> bool:
+        # A trigger mentioned mid-sentence is not a command to run the skill
+        return bool(self._command and self.entry and self._command.match(" ".join(text.lower().split())))
+    def handle(self, text: str, context: dict) -> dict:
+        missing = [p for p in self.permissions if not is_granted(p)]
+        if missing:
+            return {"ok": False, "error": "permission_required", "permissions": missing}
+        code, out = exec_sandbox(self.entry, {"text": text, "context": context}, self.timeout_s, skill_name=self.name)
+        try:
+            data = json.loads(out)
+        except ValueError:
+            data = {"output": out}
+        if code != 0:
+            return {"ok": False, "code": code, "error": data.get("error", out) if isinstance(data, dict) else out}
+        return data if isinstance(data, dict) else {"ok": True, "result": data}
+
+def load_sandbox_skills(enabled=None) -> List[SandboxSkill]:
+    enabled = SANDBOX_SKILLS if enabled is None else set(enabled)
+    return [SandboxSkill(m) for m in list_manifests() if m.get("entry") and ("all" in enabled or m["name"] in enabled)]
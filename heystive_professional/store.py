@@ -1,11 +1,208 @@
-import os, time, json, sqlite3
+import os, time, json, queue, sqlite3, threading, atexit, logging
 DB_PATH = os.environ.get("HEYSTIVE_DB", "heystive.db")
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS messages (id INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL, role TEXT, text TEXT, skill TEXT, result TEXT)",
+    "CREATE TABLE IF NOT EXISTS memory (id INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL, text TEXT, tags TEXT)",
+    "CREATE TABLE IF NOT EXISTS permissions (perm TEXT PRIMARY KEY, granted INTEGER)",
+    "CREATE TABLE IF NOT EXISTS notes (id INTEGER PRIMARY KEY AUTOINCREMENT, text TEXT, created_at REAL)",
+]
+INSERT_MESSAGE = "INSERT INTO messages (ts, role, text, skill, result) VALUES (?, ?, ?, ?, ?)"
+SELECT_MESSAGES = "SELECT id, ts, role, text, skill, result FROM messages ORDER BY id DESC LIMIT ?"
+STATEMENT_CACHE = 128
+WRITE_BEHIND = os.environ.get("HEYSTIVE_LOG_WRITE_BEHIND", "1") != "0"
+FLUSH_BATCH = int(os.environ.get("HEYSTIVE_LOG_FLUSH_BATCH", "64"))
+FLUSH_INTERVAL_S = float(os.environ.get("HEYSTIVE_LOG_FLUSH_INTERVAL_S", "0.25"))
+QUEUE_MAX = int(os.environ.get("HEYSTIVE_LOG_QUEUE_MAX", "10000"))
+WRITE_RETRIES = int(os.environ.get("HEYSTIVE_LOG_WRITE_RETRIES", "3"))
+RETRY_BACKOFF_S = float(os.environ.get("HEYSTIVE_LOG_RETRY_BACKOFF_S", "0.05"))
+logger = logging.getLogger(__name__)
+_local = threading.local()
+_migrated = set()
+_migrate_lock = threading.Lock()
+def migrate(path: str = None):
+    path = path or DB_PATH
+    with _migrate_lock:
+        if path in _migrated:
+            return
+        con = sqlite3.connect(path)
+        try:
+            con.execute("PRAGMA journal_mode=WAL")
+            for stmt in SCHEMA:
+                con.execute(stmt)
+            con.commit()
+        finally:
+            con.close()
+        _migrated.add(path)
+def _open(path: str) -> sqlite3.Connection:
+    con = sqlite3.connect(path, timeout=5.0, cached_statements=STATEMENT_CACHE)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    return con
+def get_conn(path: str = None) -> sqlite3.Connection:
+    path = path or DB_PATH
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    con = conns.get(path)
+    if con is None:
+        migrate(path)
+        con = conns[path] = _open(path)
+    return con
+def close_conn():
+    conns = getattr(_local, "conns", None) or {}
+    for con in conns.values():
+        try:
+            con.close()
+        except Exception:
+            pass
+    conns.clear()
 def init_db():
-    con = sqlite3.connect(DB_PATH)
-    con.execute("CREATE TABLE IF NOT EXISTS messages (id INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL, role TEXT, text TEXT, skill TEXT, result TEXT)")
-    con.commit(); con.close()
+    migrate()
+class MessageWriter:
+    def __init__(self, path: str = None, batch: int = FLUSH_BATCH, interval_s: float = FLUSH_INTERVAL_S, maxsize: int = QUEUE_MAX):
+        self.path = path or DB_PATH
+        self.batch = batch
+        self.interval_s = interval_s
+        self._q = queue.Queue(maxsize=maxsize)
+        self._stopped = False
+        # Guards _stopped against submit(), so no row is queued after stop() has begun
+        self._lock = threading.Lock()
+        self.written = 0
+        self.batches = 0
+        self.overflow = 0
+        self.retries = 0
+        self.failed = 0
+        self._thread = threading.Thread(target=self._run, name="heystive-log-writer", daemon=True)
+        self._thread.start()
+    def submit(self, row: tuple, path: str = None):
+        path = path or self.path
+        with self._lock:
+            if not self._stopped:
+                try:
+                    self._q.put_nowait((path, row))
+                    return
+                except queue.Full:
+                    self.overflow += 1
+        _write_rows(path, [row])
+    def flush(self, timeout: float = 5.0):
+        if self._stopped:
+            return
+        done = threading.Event()
+        self._q.put(done)
+        done.wait(timeout)
+    def stop(self, timeout: float = 5.0):
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+        self._q.put(None)
+        self._thread.join(timeout)
+        self._drain()
+    def _drain(self):
+        # Whatever is still queued once the worker has gone: rows are written, flush waiters released
+        rows = []
+        while True:
+            try:
+                item = self._q.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                item.set()
+            elif isinstance(item, tuple) and item:
+                rows.append(item)
+        self._write_grouped(rows)
+    def _write_grouped(self, rows: list):
+        by_path = {}
+        for path, row in rows:
+            by_path.setdefault(path, []).append(row)
+        for path, batch in by_path.items():
+            self._write_batch(path, batch)
+    def _run(self):
+        rows, waiters = [], []
+        deadline = None
+        while True:
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._q.get(timeout=wait)
+            except queue.Empty:
+                item = ()
+            stop = item is None
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif isinstance(item, tuple) and item:
+                rows.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.interval_s
+            if rows and (stop or waiters or len(rows) >= self.batch or time.monotonic() >= deadline):
+                self._write_grouped(rows)
+                rows, deadline = [], None
+            for w in waiters:
+                w.set()
+            waiters = []
+            if stop:
+                close_conn()
+                return
+    def _write_batch(self, path: str, batch: list):
+        for attempt in range(WRITE_RETRIES + 1):
+            try:
+                _write_rows(path, batch)
+                self.written += len(batch)
+                self.batches += 1
+                return
+            except sqlite3.OperationalError as e:
+                # "database is locked"/"busy" is transient: back off and retry the whole batch
+                if attempt == WRITE_RETRIES:
+                    logger.warning("message batch of %d rows failed after %d retries: %s", len(batch), attempt, e)
+                    break
+                self.retries += 1
+                time.sleep(RETRY_BACKOFF_S * (2 ** attempt))
+            except Exception as e:
+                logger.warning("message batch of %d rows failed: %s", len(batch), e)
+                break
+        # Row by row, so one bad row or a persistent lock costs only the rows that cannot be written
+        for row in batch:
+            try:
+                _write_rows(path, [row])
+                self.written += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error("dropped message row for %s: %s", path, e)
+    def stats(self) -> dict:
+        return {"queued": self._q.qsize(), "written": self.written, "batches": self.batches, "overflow": self.overflow,
+                "retries": self.retries, "failed": self.failed}
+_writer = None
+_writer_lock = threading.Lock()
+_atexit_registered = False
+def _write_rows(path: str, rows: list):
+    con = get_conn(path)
+    with con:
+        con.executemany(INSERT_MESSAGE, rows)
+def get_writer() -> MessageWriter:
+    global _writer, _atexit_registered
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = MessageWriter()
+                if not _atexit_registered:
+                    atexit.register(stop_writer)
+                    _atexit_registered = True
+    return _writer
+def stop_writer():
+    global _writer
+    with _writer_lock:
+        w, _writer = _writer, None
+    if w:
+        w.stop()
+def flush_messages():
+    if _writer:
+        _writer.flush()
 def log_message(role: str, text: str, skill: str, result: dict):
-    con = sqlite3.connect(DB_PATH)
-    con.execute("INSERT INTO messages (ts, role, text, skill, result) VALUES (?, ?, ?, ?, ?)", (time.time(), role, text, skill, json.dumps(result, ensure_ascii=False)))
-    con.commit(); con.close()
-init_db()
\ No newline at end of file
+    row = (time.time(), role, text, skill, json.dumps(result, ensure_ascii=False))
+    if WRITE_BEHIND:
+        get_writer().submit(row, DB_PATH)
+    else:
+        _write_rows(DB_PATH, [row])
+def fetch_messages(limit: int):
+    flush_messages()
+    return get_conn().execute(SELECT_MESSAGES, (limit,)).fetchall()
+init_db()
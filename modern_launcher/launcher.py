@@ -366,9 +366,12 @@ class HeystiveLauncher:
                 messagebox.showerror("خطا", f"رابط دسکتاپ مدرن یافت نشد:\n{self.desktop_path}")
                 return
             
+            # The desktop client imports api_bridge from the project root
+            env = dict(os.environ)
+            env["PYTHONPATH"] = os.pathsep.join(p for p in (str(self.project_root), env.get("PYTHONPATH")) if p)
             self.interface_process = subprocess.Popen([
                 sys.executable, str(self.desktop_path)
-            ], cwd=str(self.desktop_path.parent))
+            ], cwd=str(self.desktop_path.parent), env=env)
             
         except Exception as e:
             messagebox.showerror("خطا", f"خطا در راه‌اندازی رابط دسکتاپ:\n{str(e)}")
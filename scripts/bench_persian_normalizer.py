@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Persian Normalizer Benchmark
+Throughput (chars/sec) of the shared table-driven normalizer, uncached and with a warm LRU,
+against the per-call str.replace loops it replaced
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "heystive_professional"))
+
+from heystive.utils.persian_text import PROFILES, PersianNormalizer, get_normalizer
+
+SENTENCES = [
+    "سلام!  ساعت  چنده؟",
+    "امروز هوا آفتابی است و دمای هوا ۲۵ درجه است ،  لطفاً پنجره را باز کن.",
+    "علي و فاطمه ساعت ۱۵:۳۰ به جلسه مي‌روند ؛ یادآوری را تنظیم کن",
+    "من دستیار صوتی هوشمند شما هستم و به زبان فارسی صحبت می‌کنم.\tچطور می‌توانم کمک کنم؟",
+    "قیمت طلا امروز ۳۲۰۰۰۰۰ تومان است و ضریب تغییرات صفر درصد بود.",
+]
+
+
+def replace_loop_text(text: str) -> str:
+    """The old persian_tts/STT normalizer: one str.replace per digit and punctuation mark"""
+    for p, e in zip('۰۱۲۳۴۵۶۷۸۹', '0123456789'):
+        text = text.replace(p, e)
+    text = text.replace('؟', '?').replace('،', ',')
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def replace_loop_tts(text: str) -> str:
+    """The old manager normalizer: digit loop plus a phonetic replacement loop"""
+    for p, e in zip('۰۱۲۳۴۵۶۷۸۹', '0123456789'):
+        text = text.replace(p, e)
+    for src, dst in {"ض": "ز", "ص": "س", "ث": "س", "ظ": "ز", "ط": "ت", "ق": "غ"}.items():
+        text = text.replace(src, dst)
+    return text.strip()
+
+
+BASELINES = {"text": replace_loop_text, "tts": replace_loop_tts}
+
+
+def throughput(normalize, texts, repeats: int) -> float:
+    chars = sum(len(t) for t in texts) * repeats
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for text in texts:
+            normalize(text)
+    return chars / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Persian text normalization throughput")
+    parser.add_argument("--repeats", type=int, default=2000, help="passes over the sentence set")
+    parser.add_argument("--unique", type=int, default=200, help="distinct inputs for the uncached run")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    # Distinct inputs so the uncached numbers are not flattered by repeated strings
+    unique = [f"{SENTENCES[i % len(SENTENCES)]} {i}" for i in range(args.unique)]
+    passes = max(1, args.repeats * len(SENTENCES) // len(unique))
+    results = {}
+    for profile, options in PROFILES.items():
+        uncached = PersianNormalizer(**options, cache_size=0).normalize
+        row = {
+            "uncached_chars_per_s": round(throughput(uncached, unique, passes)),
+            "cached_chars_per_s": round(throughput(get_normalizer(profile).normalize, SENTENCES, args.repeats)),
+        }
+        if profile in BASELINES:
+            row["replace_loop_chars_per_s"] = round(throughput(BASELINES[profile], unique, passes))
+            row["uncached_speedup"] = round(row["uncached_chars_per_s"] / row["replace_loop_chars_per_s"], 2)
+        results[profile] = row
+
+    if args.json:
+        print(json.dumps(results))
+        return
+    for profile, row in results.items():
+        line = f"{profile:<8}: {row['uncached_chars_per_s']:>12,} chars/s uncached, {row['cached_chars_per_s']:>12,} cached"
+        if "replace_loop_chars_per_s" in row:
+            line += f"  (replace loops {row['replace_loop_chars_per_s']:,}, {row['uncached_speedup']:.2f}x)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
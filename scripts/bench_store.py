@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+SQLite Storage Benchmark
+Compares per-call connect/commit/close logging with the pooled WAL store and the write-behind queue
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "heystive_professional"))
+
+
+def bench_connect_per_call(db_path: str, n: int) -> float:
+    """Original pattern: connect, create table, insert, commit, close on every call"""
+    start = time.perf_counter()
+    for i in range(n):
+        con = sqlite3.connect(db_path)
+        con.execute("CREATE TABLE IF NOT EXISTS messages (id INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL, role TEXT, text TEXT, skill TEXT, result TEXT)")
+        con.execute("INSERT INTO messages (ts, role, text, skill, result) VALUES (?, ?, ?, ?, ?)", (time.time(), "user", f"message {i}", "bench", json.dumps({"i": i})))
+        con.commit()
+        con.close()
+    return n / (time.perf_counter() - start)
+
+
+def bench_pooled(db_path: str, n: int) -> float:
+    """Pooled thread-local WAL connection from store"""
+    os.environ["HEYSTIVE_DB"] = db_path
+    import store
+    store.DB_PATH = db_path
+    store.migrate(db_path)
+    start = time.perf_counter()
+    for i in range(n):
+        store._write_rows(db_path, [(time.time(), "user", f"message {i}", "bench", json.dumps({"i": i}))])
+    rate = n / (time.perf_counter() - start)
+    store.close_conn()
+    return rate
+
+
+def bench_write_behind(db_path: str, n: int) -> tuple:
+    """Write-behind queue: caller-side enqueue rate and end-to-end rate including the final drain"""
+    import store
+    store.migrate(db_path)
+    writer = store.MessageWriter(db_path)
+    start = time.perf_counter()
+    for i in range(n):
+        writer.submit((time.time(), "user", f"message {i}", "bench", json.dumps({"i": i})))
+    enqueued = time.perf_counter() - start
+    writer.stop()
+    total = time.perf_counter() - start
+    return n / enqueued, n / total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark message inserts/sec before and after the pooled store")
+    parser.add_argument("-n", type=int, default=2000, help="number of inserts per run")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before = bench_connect_per_call(os.path.join(tmp, "before.db"), args.n)
+        after = bench_pooled(os.path.join(tmp, "after.db"), args.n)
+        enqueue, drained = bench_write_behind(os.path.join(tmp, "behind.db"), args.n)
+
+    result = {
+        "inserts": args.n,
+        "before_per_sec": round(before, 1),
+        "after_per_sec": round(after, 1),
+        "write_behind_enqueue_per_sec": round(enqueue, 1),
+        "write_behind_drained_per_sec": round(drained, 1),
+        "speedup": round(after / before, 2),
+    }
+    if args.json:
+        print(json.dumps(result))
+        return
+    print(f"connect-per-call      : {result['before_per_sec']:>12.1f} inserts/sec")
+    print(f"pooled WAL store      : {result['after_per_sec']:>12.1f} inserts/sec")
+    print(f"write-behind enqueue  : {result['write_behind_enqueue_per_sec']:>12.1f} inserts/sec")
+    print(f"write-behind drained  : {result['write_behind_drained_per_sec']:>12.1f} inserts/sec")
+    print(f"speedup (pooled)      : {result['speedup']:>12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+TTS Engine Benchmark Suite
+Runs every engine registered in PersianMultiTTSManager (mock/fallback engines included, so it
+works offline) over a fixed Persian corpus and reports real-time factor, time to first chunk,
+peak RSS and throughput under concurrent requests as JSON, one isolated process per engine
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import platform
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "heystive_professional"))
+
+SCHEMA_VERSION = 1
+
+# Fixed corpus: changing it changes corpus_sha256, so reports from different corpora are never diffed by accident
+CORPUS = {
+    "short": [
+        "سلام!",
+        "ساعت چنده؟",
+        "چراغ رو روشن کن.",
+    ],
+    "medium": [
+        "امروز هوا آفتابی است و دمای هوا بیست و پنج درجه است.",
+        "لطفاً یک یادآور برای جلسه ساعت سه بعدازظهر تنظیم کن.",
+        "من دستیار صوتی هوشمند شما هستم و به زبان فارسی صحبت می‌کنم.",
+    ],
+    "long": [
+        "سلام، صبح بخیر! امروز سه‌شنبه است و تقویم شما دو جلسه دارد. "
+        "جلسه اول ساعت ده صبح با تیم طراحی است و جلسه دوم ساعت چهار بعدازظهر. "
+        "هوای تهران امروز آفتابی است، اما برای عصر احتمال باد وجود دارد.",
+        "برای صرفه‌جویی در مصرف انرژی، چراغ‌های اتاق خواب و آشپزخانه را خاموش کردم. "
+        "دمای ترموستات روی بیست و یک درجه تنظیم شد و پرده‌های اتاق نشیمن بسته شدند. "
+        "اگر چیز دیگری لازم دارید، فقط کافی است بگویید هی استیو.",
+    ],
+}
+
+SEGMENT_RE = re.compile(r"(?<=[.!?؟،؛])\s+")
+
+
+def corpus_sha256() -> str:
+    return hashlib.sha256(json.dumps(CORPUS, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process plus reaped children (ru_maxrss is KiB on Linux, bytes on macOS)"""
+    scale = 1.0 / (1024 * 1024) if sys.platform == "darwin" else 1.0 / 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+    return round(max(own, children), 1)
+
+
+def audio_seconds(result) -> float:
+    """Duration of an AudioResult, decoding compressed formats when a decoder is installed"""
+    duration = result.duration
+    if duration is None:
+        try:
+            import io
+            import soundfile as sf
+            info = sf.info(io.BytesIO(result.to_bytes()))
+            duration = info.frames / float(info.samplerate)
+        except Exception:
+            return 0.0
+    return float(duration)
+
+
+def synthesize(manager, engine: str, text: str):
+    result = manager.synthesize_persian(text, engine, use_cache=False)
+    if result is None:
+        raise RuntimeError(f"{engine} returned no audio")
+    return result
+
+
+def measure_text(manager, engine: str, text: str) -> dict:
+    """Full-utterance latency/RTF, and time to first chunk when synthesized sentence by sentence"""
+    start = time.perf_counter()
+    result = synthesize(manager, engine, text)
+    latency = time.perf_counter() - start
+    seconds = audio_seconds(result)
+
+    segments = [s for s in SEGMENT_RE.split(text) if s.strip()] or [text]
+    start = time.perf_counter()
+    synthesize(manager, engine, segments[0])
+    first_chunk = time.perf_counter() - start
+    return {"latency_s": latency, "audio_s": seconds, "first_chunk_s": first_chunk, "chars": len(text)}
+
+
+def summarize(samples: list) -> dict:
+    latency = sum(s["latency_s"] for s in samples)
+    audio = sum(s["audio_s"] for s in samples)
+    first = sorted(s["first_chunk_s"] for s in samples)
+    return {
+        "utterances": len(samples),
+        "rtf": round(latency / audio, 4) if audio else None,
+        "mean_latency_ms": round(1000 * latency / len(samples), 2),
+        "time_to_first_chunk_ms": {
+            "mean": round(1000 * sum(first) / len(first), 2),
+            "p50": round(1000 * first[len(first) // 2], 2),
+            "max": round(1000 * first[-1], 2),
+        },
+        "chars_per_s": round(sum(s["chars"] for s in samples) / latency, 1) if latency else None,
+    }
+
+
+def measure_concurrency(manager, engine: str, concurrency: int, requests: int) -> dict:
+    texts = [t for group in CORPUS.values() for t in group]
+    jobs = [texts[i % len(texts)] for i in range(requests)]
+    errors = 0
+    audio = 0.0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(synthesize, manager, engine, text) for text in jobs]:
+            try:
+                audio += audio_seconds(future.result())
+            except Exception:
+                errors += 1
+    wall = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "wall_s": round(wall, 3),
+        "requests_per_s": round((requests - errors) / wall, 2) if wall else None,
+        "audio_s_per_s": round(audio / wall, 2) if wall else None,
+    }
+
+
+def run_engine(engine: str, repeats: int, concurrency: int, concurrent_requests: int, output_dir: str) -> dict:
+    """Benchmark one engine in this process; engine chatter goes to stderr so stdout stays JSON"""
+    report = {"engine": engine}
+    with contextlib.redirect_stdout(sys.stderr):
+        from heystive.engines.tts.persian_multi_tts_manager import PersianMultiTTSManager
+        manager = PersianMultiTTSManager(lazy=True, warmup=[], output_dir=Path(output_dir))
+        start = time.perf_counter()
+        loaded = manager._ensure_engine(engine)
+        report["load_s"] = round(time.perf_counter() - start, 3)
+        if not loaded:
+            report.update({"status": "unavailable", "peak_rss_mb": peak_rss_mb()})
+            return report
+        info = manager.engines[engine]
+        report.update({"status": "ok", "name": info.get("name"), "engine_type": info.get("engine_type", "")})
+        synthesize(manager, engine, CORPUS["short"][0])  # warm-up, not measured
+        report["by_length"] = {}
+        for length, texts in CORPUS.items():
+            samples = [measure_text(manager, engine, text) for _ in range(repeats) for text in texts]
+            report["by_length"][length] = summarize(samples)
+        report["throughput"] = measure_concurrency(manager, engine, concurrency, concurrent_requests)
+    report["peak_rss_mb"] = peak_rss_mb()
+    return report
+
+
+def registered_engines() -> list:
+    from heystive.engines.tts.persian_multi_tts_manager import PersianMultiTTSManager
+    return list(PersianMultiTTSManager.ENGINE_PRIORITY)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root, capture_output=True, text=True, timeout=5).stdout.strip()
+    except Exception:
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every registered Persian TTS engine and emit JSON")
+    parser.add_argument("--engines", default="", help="comma-separated engine names (default: all registered)")
+    parser.add_argument("--repeats", type=int, default=2, help="passes over the corpus per engine")
+    parser.add_argument("--concurrency", type=int, default=4, help="concurrent requests for the throughput run")
+    parser.add_argument("--requests", type=int, default=16, help="total requests in the throughput run")
+    parser.add_argument("--output", default="", help="write the JSON report here instead of stdout")
+    parser.add_argument("--child", default="", help=argparse.SUPPRESS)
+    parser.add_argument("--output-dir", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_engine(args.child, args.repeats, args.concurrency, args.requests, args.output_dir), ensure_ascii=False))
+        return
+
+    engines = [e for e in args.engines.split(",") if e] or registered_engines()
+    env = dict(os.environ, PYTHONHASHSEED="0")
+    results = []
+    with tempfile.TemporaryDirectory(prefix="heystive_tts_bench_") as scratch:
+        for engine in engines:
+            # One process per engine so peak RSS and load time are not polluted by earlier engines
+            cmd = [sys.executable, __file__, "--child", engine, "--repeats", str(args.repeats),
+                   "--concurrency", str(args.concurrency), "--requests", str(args.requests),
+                   "--output-dir", os.path.join(scratch, engine)]
+            proc = subprocess.run(cmd, capture_output=True, text=True, env=env)
+            lines = proc.stdout.strip().splitlines()
+            try:
+                results.append(json.loads(lines[-1]))
+            except (IndexError, json.JSONDecodeError):
+                results.append({"engine": engine, "status": "error", "returncode": proc.returncode, "stderr": proc.stderr[-2000:]})
+            print(f"{engine}: {results[-1].get('status')}", file=sys.stderr)
+
+    report = {
+        "schema_version": SCHEMA_VERSION,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "corpus_sha256": corpus_sha256(),
+        "host": {"platform": platform.platform(), "python": platform.python_version(), "cpu_count": os.cpu_count()},
+        "settings": {"repeats": args.repeats, "concurrency": args.concurrency, "requests": args.requests},
+        "engines": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Streaming TTS Time-to-First-Audio Benchmark
+Compares whole-response synthesis with sentence-streamed synthesis in ElitePersianTTS, using a
+stub model whose synthesis time grows with the segment length
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "heystive_professional"))
+
+TEXT = ("سلام، امروز هوا آفتابی است. دمای هوا بیست و پنج درجه است و باد ملایمی می‌وزد. "
+        "برای عصر احتمال بارش باران وجود دارد، پس چتر همراه داشته باشید. روز خوبی داشته باشید!")
+
+
+def stub_model(seconds_per_10_chars: float, sample_rate: int):
+    async def synthesize(text, emotion, speed):
+        await asyncio.sleep(seconds_per_10_chars * len(text) / 10)
+        return np.zeros(int(sample_rate * len(text) * 0.06), dtype=np.float32)
+    return {"name": "stub", "type": "fallback", "synthesize": synthesize}
+
+
+async def bench(seconds_per_10_chars: float) -> dict:
+    from heystive.engines.tts.persian_tts import ElitePersianTTS
+    tts = ElitePersianTTS({"ram_gb": 8, "cpu_cores": 4, "gpu_available": False})
+    tts.active_model = stub_model(seconds_per_10_chars, tts.sample_rate)
+
+    start = time.perf_counter()
+    await tts.synthesize_premium_persian(TEXT)
+    whole = time.perf_counter() - start
+
+    start = time.perf_counter()
+    first = None
+    async for _ in tts.stream_premium_persian(TEXT):
+        if first is None:
+            first = time.perf_counter() - start
+    streamed_total = time.perf_counter() - start
+    return {"whole_ttfa_s": round(whole, 3), "stream_ttfa_s": round(first, 3), "stream_total_s": round(streamed_total, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark time-to-first-audio for whole vs streamed synthesis")
+    parser.add_argument("--cost", type=float, default=0.05, help="stub synthesis seconds per 10 characters")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    result = {"cost_per_10_chars_s": args.cost, **asyncio.run(bench(args.cost))}
+    if args.json:
+        print(json.dumps(result))
+        return
+    print(f"whole response TTFA   : {result['whole_ttfa_s']:>8.3f}s")
+    print(f"streamed TTFA         : {result['stream_ttfa_s']:>8.3f}s")
+    print(f"streamed total        : {result['stream_total_s']:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
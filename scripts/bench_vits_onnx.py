@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+VITS CPU Backend Benchmark
+Real-time factor (synthesis seconds / audio seconds, lower is faster) of the PyTorch eager
+path against the ONNX Runtime export, fp32 and dynamically quantized int8
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "heystive_professional"))
+
+from heystive.engines.tts.onnx_vits import OnnxVitsEngine, physical_cores
+
+SENTENCES = [
+    "سلام! حال شما چطور است؟",
+    "امروز هوا آفتابی است و دمای هوا بیست و پنج درجه است.",
+    "لطفاً چراغ اتاق نشیمن را خاموش کن.",
+    "من دستیار صوتی هوشمند شما هستم و به زبان فارسی صحبت می‌کنم.",
+]
+
+
+def measure(synthesize, sample_rate: int, sentences, repeats: int) -> dict:
+    """Warm up once, then time every sentence `repeats` times"""
+    synthesize(sentences[0])
+    synth_s = audio_s = 0.0
+    for _ in range(repeats):
+        for text in sentences:
+            start = time.perf_counter()
+            wav = synthesize(text)
+            synth_s += time.perf_counter() - start
+            audio_s += len(wav) / float(sample_rate)
+    return {"synth_s": round(synth_s, 3), "audio_s": round(audio_s, 3), "rtf": round(synth_s / audio_s, 4) if audio_s else None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare PyTorch and ONNX Runtime RTF for a Coqui VITS model on CPU")
+    parser.add_argument("--model", default="Kamtera/persian-tts-female-vits", help="Coqui model name")
+    parser.add_argument("--repeats", type=int, default=3, help="passes over the sentence set")
+    parser.add_argument("--threads", type=int, default=0, help="intra-op threads for both backends (0 = physical cores)")
+    parser.add_argument("--cache-dir", default="", help="where exported graphs are cached (default: a temp dir)")
+    parser.add_argument("--no-int8", action="store_true", help="skip the int8 quantized variant")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    import torch
+    from TTS.api import TTS
+
+    threads = args.threads or physical_cores()
+    torch.set_num_threads(threads)
+    tts_engine = TTS(args.model, gpu=False)
+    sample_rate = getattr(tts_engine.synthesizer, "output_sample_rate", 22050)
+    cache_dir = Path(args.cache_dir) if args.cache_dir else Path(tempfile.mkdtemp(prefix="heystive_onnx_"))
+
+    results = {"torch": measure(lambda t: tts_engine.tts(text=t), sample_rate, SENTENCES, args.repeats)}
+    for quantize in ([False] if args.no_int8 else [False, True]):
+        start = time.perf_counter()
+        engine = OnnxVitsEngine.from_coqui(tts_engine, args.model, cache_dir, quantize=quantize, intra_op_threads=threads).load()
+        load_s = time.perf_counter() - start
+        results[engine.variant] = {
+            **measure(engine.tts, sample_rate, SENTENCES, args.repeats),
+            "load_s": round(load_s, 2),
+            "graph_mb": round(os.path.getsize(engine.session_path) / 1e6, 1),
+        }
+
+    torch_rtf = results["torch"]["rtf"]
+    for variant in results.values():
+        variant["speedup_vs_torch"] = round(torch_rtf / variant["rtf"], 2) if variant["rtf"] else None
+    report = {"model": args.model, "threads": threads, "sentences": len(SENTENCES) * args.repeats, "results": results}
+    if args.json:
+        print(json.dumps(report))
+        return
+    print(f"model   : {args.model} ({threads} threads, CPU)")
+    for name, r in results.items():
+        extra = f"  load {r['load_s']}s, {r['graph_mb']} MB" if "load_s" in r else ""
+        print(f"{name:<10}: RTF {r['rtf']:.4f}  ({r['speedup_vs_torch']:.2f}x vs torch){extra}")
+
+
+if __name__ == "__main__":
+    main()
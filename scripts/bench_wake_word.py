@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Wake Word Pipeline Benchmark
+Compares the per-callback full-window VAD and librosa feature pass with the streaming ring buffer,
+cached VAD flags and frame-cached features; reports CPU% per audio-second
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "heystive_professional"))
+
+from heystive.engines.wake_word.streaming_features import AudioRingBuffer, StreamingFeatureExtractor, StreamingVAD
+
+SAMPLE_RATE = 16000
+MIN_AUDIO_S = 1.0
+MAX_AUDIO_S = 3.0
+
+
+def make_vad():
+    """webrtcvad in aggressive mode when installed, otherwise an RMS stand-in with the same call shape"""
+    try:
+        import webrtcvad
+        return webrtcvad.Vad(3).is_speech, "webrtcvad"
+    except ImportError:
+        def is_speech(frame: bytes, sample_rate: int) -> bool:
+            pcm = np.frombuffer(frame, dtype=np.int16).astype(np.float32) / 32768.0
+            return float(np.sqrt(np.mean(pcm * pcm))) >= 0.02
+        return is_speech, "rms"
+
+
+def make_audio(seconds: float, seed: int = 0) -> np.ndarray:
+    """Alternating silence and voiced-like bursts as int16 PCM"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    carrier = 0.3 * np.sin(2 * np.pi * 180 * t) * (1 + 0.5 * np.sin(2 * np.pi * 3 * t))
+    gate = (np.floor(t / 1.5) % 2 == 1).astype(np.float32)
+    audio = carrier * gate + 0.002 * rng.standard_normal(len(t))
+    return (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+
+
+def bench_before(audio: np.ndarray, chunk: int, is_speech) -> dict:
+    """Original pattern: list buffer, float copy of the whole window, Python VAD loop and full librosa features per callback"""
+    import librosa
+    buffer = []
+    max_buffer = int(SAMPLE_RATE * MAX_AUDIO_S)
+    min_buffer = int(SAMPLE_RATE * MIN_AUDIO_S)
+    checks = 0
+    start_cpu, start = time.process_time(), time.perf_counter()
+    for i in range(0, len(audio) - chunk + 1, chunk):
+        buffer.extend(audio[i:i + chunk])
+        if len(buffer) > max_buffer:
+            buffer = buffer[-max_buffer:]
+        if len(buffer) < min_buffer:
+            continue
+        window = np.array(buffer, dtype=np.float32) / 32768.0
+        pcm = (window * 32767).astype(np.int16)
+        size = int(0.01 * SAMPLE_RATE)
+        voiced = False
+        for j in range(0, len(pcm) - size, size):
+            if is_speech(pcm[j:j + size].tobytes(), SAMPLE_RATE):
+                voiced = True
+                break
+        if not voiced:
+            continue
+        checks += 1
+        mfccs = librosa.feature.mfcc(y=window, sr=SAMPLE_RATE, n_mfcc=13, n_fft=2048, hop_length=512)
+        librosa.feature.delta(mfccs)
+        librosa.feature.delta(mfccs, order=2)
+        librosa.feature.spectral_centroid(y=window, sr=SAMPLE_RATE)
+        librosa.feature.zero_crossing_rate(window)
+        np.mean(window ** 2)
+    return {"cpu_s": time.process_time() - start_cpu, "wall_s": time.perf_counter() - start, "checks": checks}
+
+
+def bench_after(audio: np.ndarray, chunk: int, is_speech, speech_ratio: float) -> dict:
+    """Streaming pattern: ring buffer, per-frame VAD flags and features analysed once per frame"""
+    ring = AudioRingBuffer(int(SAMPLE_RATE * MAX_AUDIO_S))
+    vad = StreamingVAD(SAMPLE_RATE, max_seconds=MAX_AUDIO_S, is_speech=is_speech)
+    extractor = StreamingFeatureExtractor(SAMPLE_RATE, max_seconds=MAX_AUDIO_S)
+    min_buffer = int(SAMPLE_RATE * MIN_AUDIO_S)
+    checks = 0
+    start_cpu, start = time.process_time(), time.perf_counter()
+    for i in range(0, len(audio) - chunk + 1, chunk):
+        pcm = audio[i:i + chunk]
+        samples = pcm.astype(np.float32) / 32768.0
+        ring.append(samples)
+        vad.push(pcm)
+        extractor.push(samples)
+        if len(ring) < min_buffer or vad.speech_ratio() < speech_ratio:
+            continue
+        checks += 1
+        extractor.features()
+    return {"cpu_s": time.process_time() - start_cpu, "wall_s": time.perf_counter() - start, "checks": checks, "vad_frames_gated": vad.frames_gated}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark wake word CPU cost per audio-second before and after streaming features")
+    parser.add_argument("--seconds", type=float, default=30.0, help="seconds of synthetic audio")
+    parser.add_argument("--chunk", type=int, default=1024, help="samples per audio callback")
+    parser.add_argument("--speech-ratio", type=float, default=0.1, help="speech ratio threshold for the streaming gate")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    is_speech, vad_name = make_vad()
+    audio = make_audio(args.seconds)
+    before = bench_before(audio, args.chunk, is_speech)
+    after = bench_after(audio, args.chunk, is_speech, args.speech_ratio)
+
+    result = {
+        "audio_seconds": args.seconds,
+        "chunk": args.chunk,
+        "vad": vad_name,
+        "before_cpu_pct_per_audio_s": round(100 * before["cpu_s"] / args.seconds, 3),
+        "after_cpu_pct_per_audio_s": round(100 * after["cpu_s"] / args.seconds, 3),
+        "before_checks": before["checks"],
+        "after_checks": after["checks"],
+        "after_vad_frames_gated": after["vad_frames_gated"],
+        "speedup": round(before["cpu_s"] / max(after["cpu_s"], 1e-9), 2),
+    }
+    if args.json:
+        print(json.dumps(result))
+        return
+    print(f"vad                   : {vad_name}")
+    print(f"full-window per chunk : {result['before_cpu_pct_per_audio_s']:>10.3f} CPU% per audio-second ({before['checks']} feature passes)")
+    print(f"streaming             : {result['after_cpu_pct_per_audio_s']:>10.3f} CPU% per audio-second ({after['checks']} window checks)")
+    print(f"speedup               : {result['speedup']:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,14 +7,17 @@ from pydantic import BaseModel, Field
 from typing import Callable, Dict, Any, List, Optional
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
+import logging
 import subprocess
 import shutil
 import os
 import platform
 import time
+from pathlib import Path
 import psutil
 
 router = APIRouter()
+logger = logging.getLogger("heystive.commands")  # child of the logging_setup logger
 REGISTRY: Dict[str, Dict[str, Any]] = {}
 
 class Command(BaseModel):
@@ -91,10 +94,10 @@ def cmd_memory_search(q: str, k: int = 5):
 def cmd_os_list():
     """List files in whitelisted directories"""
     try:
-        from server.settings_store import load
+        from server.settings_store import snapshot
         from server.os_skills import fs_list as os_fs_list
         
-        s = load()
+        s = snapshot()
         roots = s.os_whitelist_paths
         out = []
         
@@ -114,9 +117,9 @@ def cmd_os_list():
 def cmd_app_open(name: str):
     """Open an application from whitelist"""
     try:
-        from server.settings_store import load
+        from server.settings_store import snapshot
         
-        s = load()
+        s = snapshot()
         if name not in s.os_whitelist_apps:
             return fail("Application not in whitelist", 403)
             
@@ -141,22 +144,18 @@ def cmd_theme_toggle():
         return {"error": str(e)}
 
 @register("files.search", "Search Files", "Search filenames in whitelist roots")
-def cmd_files_search(q: str):
+def cmd_files_search(q: str, offset: int = 0, limit: int = 200):
     """Search for files in whitelisted directories"""
     try:
-        from server.settings_store import load
+        from server.settings_store import snapshot
+        from server.file_index import retain, search as index_search
         
-        s = load()
+        s = snapshot()
         roots = s.os_whitelist_paths
-        hits = []
+        limit = max(1, min(int(limit), 200))
+        retain(roots)
         
-        for root in roots:
-            for dirpath, dirnames, filenames in os.walk(root):
-                for f in filenames:
-                    if q.lower() in f.lower():
-                        hits.append(os.path.join(dirpath, f))
-                        
-        return {"matches": hits[:200]}  # Limit to 200 results
+        return index_search(roots, q, offset=int(offset), limit=limit)
     except Exception as e:
         return {"error": str(e)}
 
@@ -172,16 +171,33 @@ def cmd_intent_mute():
 
 # Additional Commands
 
+def _notes_path() -> Path:
+    """notes.md inside the directory rag_lite indexes (HEYSTIVE_KNOWLEDGE_DIR)"""
+    try:
+        from server.rag_lite import KNOWLEDGE_DIR
+    except ImportError:
+        # rag_lite needs scikit-learn; without it notes still go where it would look
+        KNOWLEDGE_DIR = Path(os.environ.get("HEYSTIVE_KNOWLEDGE_DIR", "knowledge"))
+    return KNOWLEDGE_DIR / "notes.md"
+
 @register("note.add", "Add Note", "Append a note to knowledge/notes.md")
 def cmd_note_add(text: str):
     """Add a note to the knowledge base"""
     try:
-        p = "knowledge/notes.md"
-        os.makedirs("knowledge", exist_ok=True)
+        p = _notes_path()
+        p.parent.mkdir(parents=True, exist_ok=True)
         
         with open(p, "a", encoding="utf-8") as f:
             f.write(text.strip() + "\n")
             
+        try:
+            from server.rag_lite import refresh as rag_refresh
+            rag_refresh([str(p)])
+        except ImportError:
+            pass
+        except Exception as e:
+            logger.warning("note saved but not indexed: %s", e)
+            
         return {"ok": True, "message": "Note added successfully"}
     except Exception as e:
         return {"error": str(e)}
@@ -190,8 +206,8 @@ def cmd_note_add(text: str):
 def cmd_note_search(q: str):
     """Search in notes"""
     try:
-        p = "knowledge/notes.md"
-        if not os.path.exists(p):
+        p = _notes_path()
+        if not p.exists():
             return {"matches": []}
             
         hits = []
@@ -208,9 +224,9 @@ def cmd_note_search(q: str):
 def cmd_open_path(path: str):
     """Open a path in the system file manager"""
     try:
-        from server.settings_store import load
+        from server.settings_store import snapshot
         
-        s = load()
+        s = snapshot()
         ok = False
         
         for r in s.os_whitelist_paths:
@@ -236,9 +252,9 @@ def cmd_open_path(path: str):
 def cmd_files_move_safe(src: str, dst: str):
     """Safely move a file within whitelisted paths"""
     try:
-        from server.settings_store import load
+        from server.settings_store import snapshot
         
-        s = load()
+        s = snapshot()
         
         def allowed(p):
             for r in s.os_whitelist_paths:
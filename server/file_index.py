@@ -0,0 +1,283 @@
+"""
+Filename Index for Heystive Server
+In-memory trigram index over whitelisted roots, kept fresh by directory mtime diffing
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+REFRESH_INTERVAL_S = float(os.environ.get("HEYSTIVE_FILE_INDEX_REFRESH_S", "30"))
+
+logger = logging.getLogger("heystive.file_index")  # child of the logging_setup logger
+
+
+def trigrams(s: str) -> Set[str]:
+    """Return the set of 3-character substrings of s"""
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+class FileIndex:
+    """Filename index for a single root directory"""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self._entries: List[Optional[Tuple[str, str, str]]] = []
+        self._free: List[int] = []
+        self._grams: Dict[str, Set[int]] = {}
+        self._dirs: Dict[str, Dict] = {}
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self.ready = False
+        self.built_at = 0.0
+        self.refreshed_at = 0.0
+
+    def build(self):
+        """Walk the whole root into a fresh index outside the lock, then swap it in"""
+        fresh = FileIndex(self.root)
+        if os.path.isdir(self.root):
+            fresh._add_scans(self._walk(self.root))
+        with self._lock:
+            self._entries, self._free, self._grams, self._dirs = fresh._entries, fresh._free, fresh._grams, fresh._dirs
+            self.ready = True
+            self.built_at = self.refreshed_at = time.time()
+
+    def _mtime(self, path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def refresh(self) -> int:
+        """Rescan directories whose mtime changed; returns number of rescanned dirs"""
+        with self._refresh_lock:
+            # Only the refresher mutates the index, so the stat/scan pass can run unlocked and
+            # searches wait just for the short apply step below
+            with self._lock:
+                known = {path: (info["mtime"], info["subdirs"]) for path, info in self._dirs.items()}
+            changes = []
+            for path, (mtime, subdirs) in known.items():
+                current = self._mtime(path)
+                if current == mtime:
+                    continue
+                scanned = self._scan(path) if current is not None else None
+                new_trees = [] if scanned is None else [scan for d in scanned[2] - subdirs for scan in self._walk(d)]
+                changes.append((path, scanned, new_trees))
+            root_scans = self._walk(self.root) if not known and os.path.isdir(self.root) else []
+            with self._lock:
+                for path, scanned, new_trees in changes:
+                    if path not in self._dirs:
+                        continue
+                    if scanned is None:
+                        self._remove_tree(path)
+                    else:
+                        self._apply_rescan(path, scanned, new_trees)
+                if root_scans and not self._dirs:
+                    self._add_scans(root_scans)
+                self.refreshed_at = time.time()
+        return len(changes) + bool(root_scans)
+
+    def _scan(self, path: str):
+        files, subdirs = [], set()
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.add(entry.path)
+                        else:
+                            files.append(entry.name)
+                    except OSError:
+                        pass
+        except OSError:
+            return None
+        return mtime, files, subdirs
+
+    def _add_file(self, dirpath: str, name: str) -> int:
+        lower = name.lower()
+        item = (dirpath, name, lower)
+        if self._free:
+            i = self._free.pop()
+            self._entries[i] = item
+        else:
+            i = len(self._entries)
+            self._entries.append(item)
+        for g in trigrams(lower):
+            self._grams.setdefault(g, set()).add(i)
+        return i
+
+    def _remove_file(self, i: int):
+        item = self._entries[i]
+        if item is None:
+            return
+        for g in trigrams(item[2]):
+            ids = self._grams.get(g)
+            if ids is not None:
+                ids.discard(i)
+                if not ids:
+                    del self._grams[g]
+        self._entries[i] = None
+        self._free.append(i)
+
+    def _walk(self, top: str) -> List[Tuple[str, int, List[str], Set[str]]]:
+        """Scan every directory under top; touches only the filesystem, never the index"""
+        scans, stack = [], [top]
+        while stack:
+            path = stack.pop()
+            scanned = self._scan(path)
+            if scanned is None:
+                continue
+            scans.append((path, *scanned))
+            stack.extend(scanned[2])
+        return scans
+
+    def _add_scans(self, scans):
+        for path, mtime, files, subdirs in scans:
+            self._dirs[path] = {"mtime": mtime, "files": {n: self._add_file(path, n) for n in files}, "subdirs": subdirs}
+
+    def _remove_tree(self, top: str):
+        stack = [top]
+        while stack:
+            info = self._dirs.pop(stack.pop(), None)
+            if info is None:
+                continue
+            for i in info["files"].values():
+                self._remove_file(i)
+            stack.extend(info["subdirs"])
+
+    def _apply_rescan(self, path: str, scanned, new_trees):
+        mtime, files, subdirs = scanned
+        info = self._dirs[path]
+        names = set(files)
+        for name in [n for n in info["files"] if n not in names]:
+            self._remove_file(info["files"].pop(name))
+        for name in names:
+            if name not in info["files"]:
+                info["files"][name] = self._add_file(path, name)
+        for d in info["subdirs"] - subdirs:
+            self._remove_tree(d)
+        self._add_scans(scan for scan in new_trees if scan[0] not in self._dirs)
+        info["subdirs"] = subdirs
+        info["mtime"] = mtime
+
+    def search(self, q: str, skip: int = 0, limit: int = 200) -> Tuple[List[str], int, bool]:
+        """Return (matches, skipped, more) for filenames containing q, in index order"""
+        q = q.lower()
+        hits = []
+        with self._lock:
+            if len(q) >= 3:
+                sets = sorted((self._grams.get(g, set()) for g in trigrams(q)), key=len)
+                cand = set(sets[0])
+                for s in sets[1:]:
+                    cand &= s
+                    if not cand:
+                        break
+                ids = sorted(cand)
+            else:
+                ids = range(len(self._entries))
+            for i in ids:
+                item = self._entries[i]
+                if item is None or q not in item[2]:
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                if len(hits) == limit:
+                    return hits, skip, True
+                hits.append(os.path.join(item[0], item[1]))
+        return hits, skip, False
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"root": self.root, "files": len(self._entries) - len(self._free), "dirs": len(self._dirs), "grams": len(self._grams), "built_at": self.built_at, "refreshed_at": self.refreshed_at}
+
+
+_indexes: Dict[str, FileIndex] = {}
+_lock = threading.Lock()
+_wake = threading.Event()
+_refresher: Optional[threading.Thread] = None
+
+
+def _refresh_loop():
+    """Builds new indexes as soon as they are requested and refreshes the rest periodically"""
+    last = time.monotonic()
+    periodic = REFRESH_INTERVAL_S > 0
+    while True:
+        _wake.wait(REFRESH_INTERVAL_S if periodic else None)
+        _wake.clear()
+        due = periodic and time.monotonic() - last >= REFRESH_INTERVAL_S
+        with _lock:
+            items = list(_indexes.values())
+        for idx in items:
+            try:
+                if not idx.ready:
+                    idx.build()
+                elif due:
+                    idx.refresh()
+            except Exception as e:
+                logger.warning("file index %s: %s", idx.root, e)
+        if due:
+            last = time.monotonic()
+
+
+def get_index(root: str) -> FileIndex:
+    """Return the index for root; a new index is built in the background, so it may not be ready yet"""
+    global _refresher
+    key = os.path.abspath(root)
+    with _lock:
+        idx = _indexes.get(key)
+        if idx is None:
+            idx = _indexes[key] = FileIndex(key)
+        if _refresher is None:
+            _refresher = threading.Thread(target=_refresh_loop, name="heystive-file-index", daemon=True)
+            _refresher.start()
+    if not idx.ready:
+        _wake.set()
+    return idx
+
+
+def retain(roots: List[str]):
+    """Drop the indexes of roots that are no longer whitelisted"""
+    keep = {os.path.abspath(r) for r in roots}
+    with _lock:
+        for key in [k for k in _indexes if k not in keep]:
+            del _indexes[key]
+
+
+def scan_search(root: str, q: str, skip: int = 0, limit: int = 200) -> Tuple[List[str], int, bool]:
+    """Direct filesystem walk with the same paging contract as FileIndex.search, used while an index builds"""
+    q = q.lower()
+    hits = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if q not in name.lower():
+                continue
+            if skip:
+                skip -= 1
+                continue
+            if len(hits) == limit:
+                return hits, skip, True
+            hits.append(os.path.join(dirpath, name))
+    return hits, skip, False
+
+
+def search(roots: List[str], q: str, offset: int = 0, limit: int = 200) -> Dict:
+    """Search filenames across roots with paging; stops as soon as the page is full"""
+    matches = []
+    skip = max(0, offset)
+    more = False
+    indexing = False
+    for root in roots:
+        idx = get_index(root)
+        if idx.ready:
+            hits, skip, more = idx.search(q, skip, limit - len(matches))
+        else:
+            indexing = True
+            hits, skip, more = scan_search(idx.root, q, skip, limit - len(matches))
+        matches.extend(hits)
+        if more:
+            break
+    return {"matches": matches, "offset": offset, "limit": limit, "more": more, "indexing": indexing}
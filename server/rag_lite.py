@@ -1,40 +1,324 @@
+import hashlib, json, os, re, shutil, threading
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import List
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
+from scipy import sparse
 from fastapi import APIRouter, Query
 from fastapi.responses import JSONResponse
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
 router = APIRouter()
-INDEX = {"files": [], "texts": [], "vecs": None, "model": None}
+KNOWLEDGE_DIR = Path(os.environ.get("HEYSTIVE_KNOWLEDGE_DIR", "knowledge"))
+INDEX_DIR = Path(os.environ.get("HEYSTIVE_RAG_INDEX_DIR", str(KNOWLEDGE_DIR / ".index")))
+N_FEATURES = 2 ** 18
+SUFFIXES = {".txt", ".md"}
+MAX_PASSAGE_CHARS = 1000
+SNIPPET_CHARS = 300
+INDEX_FORMAT = 4
+TAIL_MIN_ROWS = 64
+TAIL_FRACTION = 0.1
+PASSAGE_CACHE_FILES = 32
+PARA_RE = re.compile(r"\n[ \t]*\n")
+TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+VECTORIZER = HashingVectorizer(n_features=N_FEATURES, alternate_sign=False, norm=None, dtype=np.float32)
+INDEX = {"files": [], "meta": {}, "rows": {}, "df": None, "view": None, "loaded": False, "synced": False}
+_lock = threading.Lock()
+def _read(p: Path) -> str:
+    try:
+        return p.read_text(encoding="utf-8")
+    except Exception:
+        return p.read_text(errors="ignore")
+def _indexable(p: Path) -> bool:
+    if p.suffix.lower() not in SUFFIXES or not p.is_file():
+        return False
+    try:
+        rel = p.relative_to(KNOWLEDGE_DIR)
+    except ValueError:
+        return False
+    return not any(part.startswith(".") for part in rel.parts)
 def load_corpus():
-    base = Path("knowledge")
-    files = []
-    texts = []
-    for p in base.rglob("*"):
-        if p.suffix.lower() in [".txt",".md"]:
-            try:
-                t = p.read_text(encoding="utf-8")
-            except:
-                t = p.read_text(errors="ignore")
-            files.append(str(p))
-            texts.append(t)
-    return files, texts
+    files = [p for p in sorted(KNOWLEDGE_DIR.rglob("*")) if _indexable(p)]
+    return [str(p) for p in files], [_read(p) for p in files]
+def _trim(text: str, start: int, end: int) -> Tuple[int, int]:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+def split_passages(text: str) -> List[Tuple[int, int]]:
+    spans = []
+    start = 0
+    for m in chain(PARA_RE.finditer(text), [None]):
+        end = m.start() if m else len(text)
+        s, e = _trim(text, start, end)
+        while e - s > MAX_PASSAGE_CHARS:
+            cut = text.rfind("\n", s + 1, s + MAX_PASSAGE_CHARS)
+            if cut <= s:
+                cut = text.rfind(" ", s + 1, s + MAX_PASSAGE_CHARS)
+            if cut <= s:
+                cut = s + MAX_PASSAGE_CHARS
+            a, b = _trim(text, s, cut)
+            if b > a:
+                spans.append((a, b))
+            s, e = _trim(text, cut, e)
+        if e > s:
+            spans.append((s, e))
+        if m:
+            start = m.end()
+    return spans
+def _empty_df():
+    return np.zeros(N_FEATURES, dtype=np.int32)
+def _presence(rows) -> np.ndarray:
+    return np.bincount(rows.indices, minlength=N_FEATURES).astype(np.int32)
+def _rebuild_vecs():
+    """
+    Build a fresh search view. Its "base" (vectors plus row -> (file, passage) maps) is never
+    modified afterwards; _patch_view layers a tail, a dead-row mask and per-file overrides on top
+    """
+    files = list(INDEX["files"])
+    blocks = [INDEX["rows"][f] for f in files]
+    sizes = [b.shape[0] for b in blocks]
+    n = sum(sizes)
+    if not n:
+        INDEX["view"] = None
+        return
+    counts = sparse.vstack(blocks, format="csr")
+    starts = np.cumsum([0] + sizes)
+    owner = np.repeat(np.arange(len(files), dtype=np.int32), sizes)
+    idf = (np.log((1.0 + n) / (1.0 + INDEX["df"])) + 1.0).astype(np.float32)
+    vecs = normalize(counts.multiply(idf).tocsr()).astype(np.float32).tocsc()
+    base = {"files": files, "digests": [INDEX["meta"][f]["sha1"] for f in files], "idf": idf, "vecs": vecs, "owner": owner,
+            "local": (np.arange(n) - starts[owner]).astype(np.int32),
+            "rows_of": {f: range(starts[i], starts[i + 1]) for i, f in enumerate(files) if sizes[i]}}
+    INDEX["view"] = {"base": base, "tail": None, "tail_rows": (), "rows_of": {}, "digests": {}, "dead": frozenset()}
+def _patch_view(path: str, keep: int):
+    """
+    Replace a file's passages after the first keep in the search view without touching the
+    rest: replaced rows are masked out and new rows are appended to a small CSR tail weighted
+    with the view's idf. Once the tail and mask outgrow TAIL_FRACTION of the view the whole
+    view is rebuilt, which also refreshes the idf. Views are published whole and never mutated:
+    the new one shares the base and copies only the tail, the mask and the per-file overrides,
+    all bounded by the rebuild threshold
+    """
+    cur = INDEX["view"]
+    if cur is None:
+        _rebuild_vecs()
+        return
+    base = cur["base"]
+    old = cur["rows_of"].get(path, base["rows_of"].get(path, ()))
+    dead = cur["dead"].union(old[keep:])
+    live = list(old[:keep])
+    tail, tail_rows = cur["tail"], cur["tail_rows"]
+    rows = INDEX["rows"].get(path)
+    if rows is not None and rows.shape[0] > keep:
+        block = normalize(rows[keep:].multiply(base["idf"]).tocsr()).astype(np.float32).tocsr()
+        start = base["vecs"].shape[0] + len(tail_rows)
+        tail = block if tail is None else sparse.vstack([tail, block], format="csr")
+        tail_rows = tail_rows + tuple((path, p) for p in range(keep, rows.shape[0]))
+        live += range(start, start + block.shape[0])
+    digest = INDEX["meta"][path]["sha1"] if path in INDEX["meta"] else None
+    if len(tail_rows) + len(dead) > max(TAIL_MIN_ROWS, TAIL_FRACTION * base["vecs"].shape[0]):
+        _rebuild_vecs()
+        return
+    INDEX["view"] = {"base": base, "tail": tail, "tail_rows": tail_rows, "rows_of": {**cur["rows_of"], path: live},
+                     "digests": {**cur["digests"], path: digest}, "dead": dead}
+def _file_key(path: str) -> str:
+    return hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+def _save(changed: Iterable[str] = (), removed: Iterable[str] = ()):
+    """
+    Each file's counts, spans and passage texts live in their own rows/<key>.npz, so an
+    update rewrites only the files that changed plus the small meta.json. Passage texts are
+    handed over by _update and dropped from memory once written
+    """
+    rows_dir = INDEX_DIR / "rows"
+    rows_dir.mkdir(parents=True, exist_ok=True)
+    for path in changed:
+        meta, rows = INDEX["meta"].get(path), INDEX["rows"].get(path)
+        if meta is None or rows is None or "texts" not in meta:
+            continue
+        tmp = rows_dir / f"{_file_key(path)}.tmp.npz"
+        np.savez(tmp, data=rows.data, indices=rows.indices, indptr=rows.indptr, shape=np.array(rows.shape),
+                 spans=np.array(meta["passages"], dtype=np.int64).reshape(-1, 2), texts=np.array(meta.pop("texts"), dtype=str),
+                 sha1=np.array(meta["sha1"]))
+        os.replace(tmp, rows_dir / f"{_file_key(path)}.npz")
+    for path in removed:
+        try:
+            (rows_dir / f"{_file_key(path)}.npz").unlink()
+        except FileNotFoundError:
+            pass
+    files = {f: {k: v for k, v in INDEX["meta"][f].items() if k not in ("passages", "texts")} for f in INDEX["files"]}
+    tmp = INDEX_DIR / "meta.tmp.json"
+    tmp.write_text(json.dumps({"n_features": N_FEATURES, "unit": "passage", "format": INDEX_FORMAT, "files": files}, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, INDEX_DIR / "meta.json")
+@lru_cache(maxsize=PASSAGE_CACHE_FILES)
+def _stored_passages(path: str, digest: str):
+    """(spans, texts) of a file as indexed at digest, read from its rows/<key>.npz; None once it has changed"""
+    try:
+        with np.load(INDEX_DIR / "rows" / f"{_file_key(path)}.npz") as z:
+            if str(z["sha1"]) != digest:
+                return None
+            return z["spans"], z["texts"]
+    except (OSError, KeyError, ValueError):
+        return None
+def _load() -> bool:
+    try:
+        meta = json.loads((INDEX_DIR / "meta.json").read_text(encoding="utf-8"))
+        if meta.get("n_features") != N_FEATURES or meta.get("unit") != "passage" or meta.get("format") != INDEX_FORMAT:
+            return False
+        files, rows, df = sorted(meta["files"]), {}, _empty_df()
+        for f in files:
+            with np.load(INDEX_DIR / "rows" / f"{_file_key(f)}.npz") as z:
+                rows[f] = sparse.csr_matrix((z["data"], z["indices"], z["indptr"]), shape=tuple(z["shape"]))
+                meta["files"][f]["passages"] = z["spans"].tolist()
+            df += _presence(rows[f])
+    except Exception:
+        return False
+    INDEX.update({"files": files, "meta": meta["files"], "rows": rows, "df": df})
+    _rebuild_vecs()
+    return True
+def _ensure_loaded():
+    if not INDEX["loaded"]:
+        if not _load():
+            INDEX.update({"files": [], "meta": {}, "rows": {}, "df": _empty_df()})
+        INDEX["loaded"] = True
+def _drop(path: str):
+    rows = INDEX["rows"].pop(path, None)
+    if rows is not None:
+        INDEX["df"] -= _presence(rows)
+    INDEX["meta"].pop(path, None)
+def _vectorize(texts: List[str]):
+    return VECTORIZER.transform(texts).tocsr() if texts else sparse.csr_matrix((0, N_FEATURES), dtype=np.float32)
+def _update(p: Path) -> Optional[Tuple[str, int]]:
+    """(change, kept) where kept counts the leading passages that are still valid, or None"""
+    path = str(p)
+    st = p.stat()
+    old = INDEX["meta"].get(path)
+    if old and old["mtime_ns"] == st.st_mtime_ns and old["size"] == st.st_size:
+        return None
+    text = _read(p)
+    digest = hashlib.sha1(text.encode("utf-8", "ignore")).hexdigest()
+    if old and old["sha1"] == digest:
+        old.update({"mtime_ns": st.st_mtime_ns, "size": st.st_size})
+        return None
+    keep, spans = 0, None
+    chars = old.get("chars", -1) if old else -1
+    if 0 <= chars < len(text) and hashlib.sha1(text[:chars].encode("utf-8", "ignore")).hexdigest() == old["sha1"]:
+        # Appended to (note.add): only the last passage can have changed, so re-split from its start
+        keep = max(0, len(old["passages"]) - 1)
+        tail = old["passages"][keep][0] if old["passages"] else 0
+        spans = [list(s) for s in old["passages"][:keep]] + [[s + tail, e + tail] for s, e in split_passages(text[tail:])]
+        old_rows = INDEX["rows"][path]
+        INDEX["df"] -= _presence(old_rows[keep:])
+        new_rows = _vectorize([text[s:e] for s, e in spans[keep:]])
+        rows = sparse.vstack([old_rows[:keep], new_rows], format="csr")
+        INDEX["df"] += _presence(new_rows)
+    else:
+        _drop(path)
+        spans = [list(s) for s in split_passages(text)]
+        rows = _vectorize([text[s:e] for s, e in spans])
+        INDEX["df"] += _presence(rows)
+    INDEX["rows"][path] = rows
+    # Passage text is stored with the index (not kept in memory), so results never depend on the file as it is now
+    INDEX["meta"][path] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha1": digest, "chars": len(text),
+                           "passages": spans, "texts": [text[s:e] for s, e in spans]}
+    return ("updated" if old else "added"), keep
+def refresh(paths: Optional[Iterable[str]] = None, full: bool = False):
+    with _lock:
+        if full:
+            INDEX.update({"files": [], "meta": {}, "rows": {}, "df": _empty_df(), "view": None, "loaded": True})
+            shutil.rmtree(INDEX_DIR / "rows", ignore_errors=True)
+        _ensure_loaded()
+        stats = {"added": 0, "updated": 0, "removed": 0}
+        changed, removed = {}, []
+        if paths is None:
+            INDEX["synced"] = True
+            current = {str(p): p for p in sorted(KNOWLEDGE_DIR.rglob("*")) if _indexable(p)}
+            removed = [f for f in INDEX["meta"] if f not in current]
+        else:
+            current = {}
+            for raw in paths:
+                p = Path(raw)
+                if _indexable(p):
+                    current[str(p)] = p
+                elif str(p) in INDEX["meta"]:
+                    removed.append(str(p))
+        for path in removed:
+            _drop(path)
+            stats["removed"] += 1
+        for path, p in current.items():
+            change = _update(p)
+            if change:
+                stats[change[0]] += 1
+                changed[path] = change[1]
+        if any(stats.values()) or full:
+            INDEX["files"] = sorted(INDEX["rows"])
+            # Written before the view that points at them is published
+            _save(changed, removed)
+            if full or INDEX["view"] is None:
+                _rebuild_vecs()
+            else:
+                for path in removed:
+                    _patch_view(path, 0)
+                for path, keep in changed.items():
+                    _patch_view(path, keep)
+        passages = sum(len(INDEX["meta"][f]["passages"]) for f in INDEX["files"])
+        return {"count": len(INDEX["files"]), "passages": passages, **stats}
+def _ensure_ready():
+    # An empty corpus stays "synced"; new files are picked up by /index or refresh(paths)
+    if not INDEX["synced"]:
+        refresh()
+    return INDEX["view"]
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    cand = np.flatnonzero(scores > 0)
+    if len(cand) > k:
+        cand = cand[np.argpartition(scores[cand], -k)[-k:]]
+    return cand[np.argsort(-scores[cand], kind="stable")]
+def _snippet(text: str, terms: set):
+    hits = [(m.start(), m.end()) for m in TOKEN_RE.finditer(text) if m.group().lower() in terms]
+    lo = 0
+    if len(text) > SNIPPET_CHARS and hits:
+        lo = max(0, min(hits[0][0] - SNIPPET_CHARS // 4, len(text) - SNIPPET_CHARS))
+    hi = lo + SNIPPET_CHARS
+    return lo, text[lo:hi], [[s - lo, e - lo] for s, e in hits if s >= lo and e <= hi]
 @router.post("/index")
-def build_index():
-    files, texts = load_corpus()
-    if not texts:
-        INDEX.update({"files": [], "texts": [], "vecs": None, "model": None})
-        return {"ok": True, "count": 0}
-    vec = TfidfVectorizer(max_features=20000)
-    X = vec.fit_transform(texts)
-    INDEX.update({"files": files, "texts": texts, "vecs": X, "model": vec})
-    return {"ok": True, "count": len(files)}
+def build_index(full: bool = False):
+    stats = refresh(full=full)
+    return {"ok": True, **stats}
 @router.get("/search")
 def search(q: str = Query(...), k: int = 5):
-    if INDEX["vecs"] is None or INDEX["model"] is None:
+    view = _ensure_ready()
+    if view is None:
         return JSONResponse(status_code=400, content={"ok": False, "error": "no_index"})
-    qv = INDEX["model"].transform([q])
-    sims = cosine_similarity(qv, INDEX["vecs"]).ravel()
-    idx = sims.argsort()[::-1][:k]
-    results = [{"file": INDEX["files"][i], "score": float(sims[i])} for i in idx]
-    return {"ok": True, "results": results}
\ No newline at end of file
+    base = view["base"]
+    qv = VECTORIZER.transform([q]).multiply(base["idf"]).tocsr()
+    qv.sum_duplicates()
+    if not qv.nnz or k <= 0:
+        return {"ok": True, "results": []}
+    weights = (qv.data / np.linalg.norm(qv.data)).astype(np.float32)
+    n_base = base["vecs"].shape[0]
+    scores = np.asarray(base["vecs"][:, qv.indices] @ weights).ravel()
+    if view["tail"] is not None:
+        scores = np.concatenate([scores, np.asarray(view["tail"][:, qv.indices] @ weights).ravel()])
+    if view["dead"]:
+        scores[np.fromiter(view["dead"], dtype=np.int64)] = 0
+    terms = {t.lower() for t in TOKEN_RE.findall(q)}
+    results = []
+    for i in top_k(scores, k):
+        if i < n_base:
+            fid = base["owner"][i]
+            path, p = base["files"][fid], int(base["local"][i])
+            digest = view["digests"].get(path, base["digests"][fid])
+        else:
+            path, p = view["tail_rows"][i - n_base]
+            digest = view["digests"][path]
+        stored = _stored_passages(path, digest)
+        if stored is None:
+            # Rewritten by a refresh since this view was taken; the next search sees the new one
+            continue
+        spans, texts = stored
+        start = int(spans[p][0])
+        off, snippet, highlights = _snippet(str(texts[p]), terms)
+        results.append({"file": path, "score": float(scores[i]), "start": start + off, "end": start + off + len(snippet), "snippet": snippet, "highlights": highlights})
+    return {"ok": True, "results": results}
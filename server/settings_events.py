@@ -0,0 +1,90 @@
+"""
+Settings Subscription Channel for Heystive Server
+Versioned settings reads and Server-Sent Events pushing diffs on change
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from typing import Any, Dict, Tuple
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from server.settings_store import current, subscribe, unsubscribe
+
+router = APIRouter()
+POLL_S = float(os.environ.get("HEYSTIVE_SETTINGS_POLL_S", "1.0"))
+HEARTBEAT_S = float(os.environ.get("HEYSTIVE_SETTINGS_HEARTBEAT_S", "15"))
+
+
+def diff_settings(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Top-level diff between two settings payloads"""
+    changed = {k: v for k, v in new.items() if k not in old or old[k] != v}
+    removed = [k for k in old if k not in new]
+    return {"set": changed, "removed": removed}
+
+
+def settings_version(data: Dict[str, Any]) -> str:
+    """
+    Version clients see (ETag, X-Settings-Version, event "version"): a digest of the payload.
+    The cache's change counter restarts with the process, so it would let a client's stale
+    ETag match again after a server restart
+    """
+    canonical = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def _event(version: str, payload: Dict[str, Any]) -> str:
+    return f"id: {version}\nevent: settings\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+@router.get("")
+def get_settings(request: Request):
+    """Current settings with their content digest as ETag; answers 304 when unchanged"""
+    _, data = current()
+    version = settings_version(data)
+    etag = f'"{version}"'
+    headers = {"ETag": etag, "X-Settings-Version": version}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(data, headers=headers)
+
+
+@router.get("/stream")
+async def stream_settings(request: Request):
+    """Push the full settings once, then versioned diffs whenever they change"""
+    loop = asyncio.get_running_loop()
+    changed = asyncio.Event()
+
+    def on_change(_version: int):
+        loop.call_soon_threadsafe(changed.set)
+
+    async def events():
+        subscribe(on_change)
+        last: Tuple[int, Dict[str, Any]] = (-1, {})
+        idle = 0.0
+        try:
+            while not await request.is_disconnected():
+                version, data = current()
+                if version != last[0]:
+                    tag = settings_version(data)
+                    if last[0] < 0:
+                        yield _event(tag, {"version": tag, "full": True, "settings": data})
+                    else:
+                        delta = diff_settings(last[1], data)
+                        if delta["set"] or delta["removed"]:
+                            yield _event(tag, {"version": tag, "full": False, **delta})
+                    last = (version, data)
+                    idle = 0.0
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=POLL_S)
+                except asyncio.TimeoutError:
+                    idle += POLL_S
+                    if idle >= HEARTBEAT_S:
+                        idle = 0.0
+                        yield ": ping\n\n"
+                changed.clear()
+        finally:
+            unsubscribe(on_change)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -1,16 +1,37 @@
 """
 Settings Store for Heystive Server
-Manages application settings with thread safety
+Manages application settings through the shared mtime-validated settings cache
 """
 
-import json
+import importlib.util
 import os
+import sys
 import threading
-from typing import Dict, Any, List
-from pydantic import BaseModel
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from pydantic import BaseModel, ConfigDict
+
+def _import_settings_cache():
+    """
+    Load heystive_professional/settings_cache.py by path, without putting that directory on
+    sys.path. It is registered under the name the backend imports it by, so both stores share
+    one cache (and one pending write) per settings file
+    """
+    module = sys.modules.get("settings_cache")
+    if module is None:
+        path = Path(__file__).resolve().parents[1] / "heystive_professional" / "settings_cache.py"
+        spec = importlib.util.spec_from_file_location("settings_cache", path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["settings_cache"] = module
+        spec.loader.exec_module(module)
+    return module
+
+_settings_cache = _import_settings_cache()
+get_cache, thaw = _settings_cache.get_cache, _settings_cache.thaw
 
 SETTINGS_PATH = os.environ.get("HEYSTIVE_SETTINGS_PATH", "settings.json")
 _lock = threading.Lock()
+_frozen: Optional[Tuple[int, "FrozenSettings"]] = None
 
 class Settings(BaseModel):
     """Application settings model"""
@@ -28,34 +49,57 @@ class Settings(BaseModel):
     wakeword_enabled: bool = True
     wakeword_keyword: str = "hey steve"
     wakeword_sensitivity: float = 0.5
-    wakeword_device_index: int = None
+    wakeword_device_index: Optional[int] = None
+
+class FrozenSettings(Settings):
+    """Immutable settings snapshot shared between readers; list fields become tuples"""
+    model_config = ConfigDict(frozen=True)
+    os_whitelist_paths: Tuple[str, ...] = tuple(Settings.model_fields["os_whitelist_paths"].default)
+    os_whitelist_apps: Tuple[str, ...] = tuple(Settings.model_fields["os_whitelist_apps"].default)
+
+def _cache():
+    return get_cache(SETTINGS_PATH)
 
 def read_settings() -> Dict[str, Any]:
-    """Read settings from file"""
-    if not os.path.isfile(SETTINGS_PATH):
-        return {}
-    
-    with _lock:
-        try:
-            with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
-                return json.loads(f.read())
-        except Exception:
-            return {}
+    """Read settings (served from cache, revalidated on file change)"""
+    return _cache().read()
 
 def write_settings(data: Dict[str, Any]) -> bool:
-    """Write settings to file"""
+    """Write settings atomically; returns after the (possibly coalesced) write reached disk"""
+    try:
+        return _cache().write(data)
+    except Exception:
+        return False
+
+def flush_settings() -> bool:
+    """Persist any coalesced write immediately"""
+    return _cache().flush()
+
+def snapshot() -> FrozenSettings:
+    """Return the immutable Settings snapshot for the current version"""
+    global _frozen
+    version, data = _cache().versioned()
     with _lock:
-        try:
-            with open(SETTINGS_PATH, "w", encoding="utf-8") as f:
-                f.write(json.dumps(data, ensure_ascii=False, indent=2))
-            return True
-        except Exception:
-            return False
+        if _frozen is None or _frozen[0] != version:
+            _frozen = (version, FrozenSettings(**thaw(data)))
+        return _frozen[1]
+
+def current() -> Tuple[int, Dict[str, Any]]:
+    """Return (version, settings payload) exactly as stored in the settings file, without model defaults"""
+    version, data = _cache().versioned()
+    return version, thaw(data)
+
+def subscribe(fn) -> None:
+    """Call fn(version) whenever the settings version changes"""
+    _cache().subscribe(fn)
+
+def unsubscribe(fn) -> None:
+    """Stop calling fn on settings changes"""
+    _cache().unsubscribe(fn)
 
 def load() -> Settings:
-    """Load settings as Settings object"""
-    data = read_settings()
-    return Settings(**data)
+    """Load settings as a mutable Settings object"""
+    return Settings(**snapshot().model_dump())
 
 def save(settings: Settings) -> bool:
     """Save Settings object to file"""
@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
+import os
 import subprocess
 import sys
 from pathlib import Path
 
 # Start desktop interface
 desktop_path = Path(__file__).parent / "ui_modern_desktop" / "main_desktop.py"
-subprocess.run([sys.executable, str(desktop_path)])
+# The desktop client imports api_bridge from the project root
+env = dict(os.environ)
+env["PYTHONPATH"] = os.pathsep.join(p for p in (str(Path(__file__).resolve().parent), env.get("PYTHONPATH")) if p)
+subprocess.run([sys.executable, str(desktop_path)], env=env)
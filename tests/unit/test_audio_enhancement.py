@@ -0,0 +1,56 @@
+"""
+Unit Tests for the streaming TTS post-processing chain
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "heystive_professional"))
+
+from heystive.engines.tts.audio_enhancement import EnhancementPipeline, EnhancementStream, highpass_sos
+
+
+def speech_like(sample_rate=22050, seconds=1.0):
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    rng = np.random.default_rng(0)
+    return (0.5 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(t.size) + 0.1).astype(np.float32)
+
+
+class TestEnhancementStream:
+    """Test that chunked processing is seamless and bounded"""
+
+    def test_chunked_matches_one_shot(self):
+        audio = speech_like()
+        whole = EnhancementStream(22050, gain=0.9).process(audio.copy())
+        stream = EnhancementStream(22050, gain=0.9)
+        # Blocks both shorter and longer than the 50 ms reverb delay
+        bounds = [0, 300, 700, 5000, 5100, 12000, audio.size]
+        chunked = np.concatenate([stream.process(audio[a:b].copy()) for a, b in zip(bounds, bounds[1:])])
+        assert chunked.dtype == np.float32
+        assert np.allclose(chunked, whole, atol=1e-5)
+
+    def test_output_is_limited(self):
+        stream = EnhancementStream(16000)
+        out = stream.process(speech_like(16000) * 4)
+        assert np.max(np.abs(out)) <= 1.0
+        assert stream.gain < 1.0
+
+    def test_sos_cached_per_sample_rate(self):
+        assert highpass_sos(22050) is highpass_sos(22050)
+        assert highpass_sos(16000) is not highpass_sos(22050)
+
+
+class TestEnhancementPipeline:
+    """Test whole-clip enhancement"""
+
+    def test_enhance_normalizes(self):
+        out = EnhancementPipeline().enhance(speech_like() * 3, 22050)
+        assert out.dtype == np.float32
+        assert 0.5 < np.max(np.abs(out)) <= 1.0
+
+    def test_silence_and_empty(self):
+        pipeline = EnhancementPipeline()
+        assert not pipeline.enhance(np.zeros(100, dtype=np.float32), 22050).any()
+        assert pipeline.enhance(np.array([], dtype=np.float32), 22050).size == 0
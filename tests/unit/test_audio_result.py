@@ -0,0 +1,63 @@
+"""
+Unit Tests for the in-memory TTS audio result
+"""
+
+import io
+import sys
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "heystive_professional"))
+
+from heystive.engines.tts.audio_result import AudioResult, decode_wav, encode_wav, sniff_format
+
+
+class TestEncodeWav:
+    """Test WAV encoding straight into memory"""
+
+    def test_header_and_pcm_match_wave_module(self):
+        samples = np.sin(np.linspace(0, 20, 1000)).astype(np.float32) * 0.5
+        data = encode_wav(samples, 16000)
+        with wave.open(io.BytesIO(data), "rb") as wf:
+            assert (wf.getnchannels(), wf.getsampwidth(), wf.getframerate(), wf.getnframes()) == (1, 2, 16000, 1000)
+            pcm = np.frombuffer(wf.readframes(1000), dtype=np.int16)
+        assert np.array_equal(pcm, (samples * 32767).astype(np.int16))
+
+    def test_round_trip_and_clipping(self):
+        samples = np.array([0.0, 0.5, -0.5, 2.0, -2.0], dtype=np.float32)
+        decoded, sample_rate, channels = decode_wav(encode_wav(samples, 22050))
+        assert (sample_rate, channels) == (22050, 1)
+        assert np.allclose(decoded, [0.0, 0.5, -0.5, 1.0, -1.0], atol=1e-4)
+
+
+class TestAudioResult:
+    """Test lazy encoding, format sniffing and explicit persistence"""
+
+    def test_samples_encode_once(self):
+        result = AudioResult(samples=np.zeros(2205), sample_rate=22050)
+        data = result.to_bytes()
+        assert result.to_bytes() is data
+        assert len(result) == 44 + 2 * 2205
+        assert result.duration == pytest.approx(0.1)
+        assert result.mimetype == "audio/wav"
+
+    def test_from_bytes_sniffs_format(self):
+        wav = AudioResult.from_bytes(encode_wav(np.zeros(100), 8000))
+        assert (wav.format, wav.sample_rate) == ("wav", 8000)
+        assert wav.pcm().shape == (100,)
+        mp3 = AudioResult.from_bytes(b"ID3\x03\x00" + b"\x00" * 20)
+        assert mp3.format == "mp3" and mp3.duration is None
+        assert sniff_format(b"nope") == "bin"
+        with pytest.raises(ValueError):
+            mp3.pcm()
+
+    def test_save_is_the_only_disk_write(self, tmp_path):
+        result = AudioResult(samples=np.zeros(10), sample_rate=16000)
+        assert list(tmp_path.iterdir()) == []
+        path = result.save(tmp_path / "out.wav")
+        assert path.read_bytes() == result.to_bytes()
+        with pytest.raises(ValueError):
+            AudioResult()
@@ -0,0 +1,155 @@
+"""
+Unit Tests for the streaming STT and TTS endpoints
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "heystive_professional"))
+os.environ.setdefault("HEYSTIVE_DB", os.path.join(tempfile.mkdtemp(), "heystive.db"))
+
+fastapi = pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client():
+    import backend_min
+    return TestClient(backend_min.app)
+
+
+class TestStreamEndpoint:
+    """Test the streaming STT WebSocket"""
+
+    def test_start_ack_and_final(self, client):
+        """Binary frames are accepted and stop yields a final transcript"""
+        with client.websocket_connect("/ws/stream") as ws:
+            ws.send_json({"type": "start", "sr": 16000})
+            ack = ws.receive_json()
+            assert ack["type"] == "ack"
+            assert ack["engine"] in ("vosk", "demo")
+            for _ in range(10):
+                ws.send_bytes(b"\x00" * 640)
+            ws.send_json({"type": "stop"})
+            final = ws.receive_json()
+            assert final["type"] == "final"
+            assert isinstance(final["text"], str)
+
+    def test_legacy_base64_chunks(self, client):
+        """JSON pcm_b64 chunks still work"""
+        with client.websocket_connect("/ws/stream") as ws:
+            ws.send_json({"type": "start", "sr": 16000})
+            ws.receive_json()
+            ws.send_json({"type": "chunk", "pcm_b64": "AAAAAA=="})
+            ws.send_json({"type": "stop"})
+            assert ws.receive_json()["type"] == "final"
+
+    def test_invalid_sample_rate(self, client):
+        """A bad sr is rejected without closing the socket"""
+        with client.websocket_connect("/ws/stream") as ws:
+            ws.send_json({"type": "start", "sr": "fast"})
+            assert ws.receive_json() == {"type": "error", "error": "invalid_sr"}
+            ws.send_json({"type": "start", "sr": 16000})
+            assert ws.receive_json()["type"] == "ack"
+
+    def test_recognizer_failure(self, client, monkeypatch):
+        """A recognizer that raises reports stt_failed, does not stall pushes and is not pooled"""
+        import backend_min
+        from services.streaming_vosk import RecognizerPool
+
+        class BrokenEngine:
+            engine, sample_rate = "demo", 16000
+
+            def accept(self, pcm):
+                raise RuntimeError("decoder crashed")
+
+            def finalize(self):
+                return ""
+
+            def reset(self):
+                pass
+
+        pool = RecognizerPool("missing-model-dir")
+        monkeypatch.setattr(pool, "acquire", lambda sr: BrokenEngine())
+        monkeypatch.setattr(backend_min, "_stt_pool", pool)
+        with client.websocket_connect("/ws/stream") as ws:
+            ws.send_json({"type": "start", "sr": 16000})
+            ws.receive_json()
+            for _ in range(backend_min.STREAM_QUEUE_FRAMES + 8):
+                ws.send_bytes(b"\x00" * 640)
+            error = ws.receive_json()
+            assert error["type"] == "error" and error["error"] == "stt_failed"
+            assert error["detail"] == "decoder crashed"
+            ws.send_json({"type": "stop"})
+        assert pool.stats()["idle"] == 0
+
+    def test_acquire_runs_off_the_event_loop(self, client, monkeypatch):
+        """A slow or failing recognizer build neither blocks the loop nor closes the socket"""
+        import asyncio
+        import backend_min
+        from services.streaming_vosk import RecognizerPool
+
+        on_loop = []
+
+        def acquire(sr):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            raise RuntimeError("model missing")
+
+        pool = RecognizerPool("missing-model-dir")
+        monkeypatch.setattr(pool, "acquire", acquire)
+        monkeypatch.setattr(backend_min, "_stt_pool", pool)
+        with client.websocket_connect("/ws/stream") as ws:
+            ws.send_json({"type": "start", "sr": 16000})
+            assert ws.receive_json() == {"type": "error", "error": "stt_unavailable", "detail": "model missing"}
+            ws.send_bytes(b"\x00" * 640)
+            assert ws.receive_json()["error"] == "stt_unavailable"
+            monkeypatch.setattr(pool, "acquire", RecognizerPool.acquire.__get__(pool))
+            ws.send_json({"type": "start", "sr": 16000})
+            assert ws.receive_json()["type"] == "ack"
+            ws.send_json({"type": "stop"})
+            assert ws.receive_json()["type"] == "final"
+        assert on_loop == [False, False]
+
+    def test_recognizer_pool_reuse(self):
+        """Released recognizers are handed out again"""
+        from services.streaming_vosk import RecognizerPool
+        pool = RecognizerPool("missing-model-dir")
+        eng = pool.acquire(16000)
+        pool.release(eng)
+        assert pool.acquire(16000) is eng
+        assert pool.stats()["reused"] == 1
+
+
+class TestTTSStreamEndpoint:
+    """Test the chunked audio/wav TTS response"""
+
+    def test_streams_header_then_pcm(self, client, monkeypatch):
+        import services.tts_pyttsx3 as tts_service
+        chunks = [b"\x01\x00" * 100, b"\x02\x00" * 50]
+        monkeypatch.setattr(tts_service, "open_pcm_stream", lambda text, **kw: (16000, 1, iter(chunks)))
+        response = client.post("/api/tts/stream", json={"text": "سلام"})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "audio/wav"
+        body = response.content
+        assert body[:4] == b"RIFF" and body[36:40] == b"data"
+        assert body[40:44] == b"\xff\xff\xff\xff"
+        assert body[44:] == b"".join(chunks)
+
+    def test_unavailable_engine_is_503(self, client, monkeypatch):
+        import services.tts_pyttsx3 as tts_service
+
+        def unavailable(text, **kw):
+            raise RuntimeError("no engine")
+
+        monkeypatch.setattr(tts_service, "open_pcm_stream", unavailable)
+        response = client.post("/api/tts/stream", json={"text": "سلام"})
+        assert response.status_code == 503
+        assert response.json()["note"] == "no engine"
@@ -0,0 +1,136 @@
+"""
+Unit Tests for the background filename index
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from server import file_index
+from server.file_index import FileIndex
+
+
+def _touch(path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("x", encoding="utf-8")
+
+
+def _bump(path: Path):
+    """Force a visible directory mtime change even on coarse-grained filesystems"""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    _touch(tmp_path / "report.txt")
+    _touch(tmp_path / "docs" / "Report-2024.md")
+    _touch(tmp_path / "docs" / "deep" / "notes.md")
+    return tmp_path
+
+
+class TestFileIndex:
+    """Test building, searching and refreshing a single root"""
+
+    def test_search_matches_substring_case_insensitively(self, tree):
+        idx = FileIndex(str(tree))
+        idx.build()
+        hits, _, more = idx.search("report")
+        assert sorted(os.path.basename(h) for h in hits) == ["Report-2024.md", "report.txt"]
+        assert not more
+        assert [os.path.basename(h) for h in idx.search("no")[0]] == ["notes.md"]
+
+    def test_paging(self, tree):
+        idx = FileIndex(str(tree))
+        idx.build()
+        first, _, more = idx.search("re", limit=1)
+        assert len(first) == 1 and more
+        second, _, more = idx.search("re", skip=1, limit=5)
+        assert len(second) == 1 and not more and second != first
+
+    def test_refresh_tracks_changes(self, tree):
+        idx = FileIndex(str(tree))
+        idx.build()
+        _touch(tree / "docs" / "new_report.txt")
+        _touch(tree / "docs" / "fresh" / "report_draft.md")
+        (tree / "report.txt").unlink()
+        for d in (tree, tree / "docs"):
+            _bump(d)
+        assert idx.refresh() == 2
+        names = sorted(os.path.basename(h) for h in idx.search("report")[0])
+        assert names == ["Report-2024.md", "new_report.txt", "report_draft.md"]
+
+    def test_removed_subtree_is_dropped(self, tree):
+        idx = FileIndex(str(tree))
+        idx.build()
+        for p in sorted((tree / "docs").rglob("*"), reverse=True):
+            p.unlink() if p.is_file() else p.rmdir()
+        (tree / "docs").rmdir()
+        _bump(tree)
+        idx.refresh()
+        assert idx.search("md")[0] == []
+        assert idx.stats()["dirs"] == 1
+
+    def test_refresh_does_not_block_searches(self, tree, monkeypatch):
+        idx = FileIndex(str(tree))
+        idx.build()
+        in_stat, release = threading.Event(), threading.Event()
+        real_mtime = idx._mtime
+
+        def slow_mtime(path):
+            in_stat.set()
+            release.wait(5)
+            return real_mtime(path)
+
+        monkeypatch.setattr(idx, "_mtime", slow_mtime)
+        worker = threading.Thread(target=idx.refresh)
+        worker.start()
+        assert in_stat.wait(5)
+        start = time.monotonic()
+        assert idx.search("report")[0]
+        assert time.monotonic() - start < 1.0
+        release.set()
+        worker.join(5)
+
+
+class TestIndexRegistry:
+    """Test background builds, the scan fallback and whitelist pruning"""
+
+    def test_search_falls_back_until_built(self, tree, monkeypatch):
+        built = threading.Event()
+        real_build = FileIndex.build
+
+        def gated_build(self):
+            built.wait(5)
+            real_build(self)
+
+        monkeypatch.setattr(FileIndex, "build", gated_build)
+        monkeypatch.setattr(file_index, "_indexes", {})
+        result = file_index.search([str(tree)], "report")
+        assert result["indexing"] is True
+        assert len(result["matches"]) == 2
+        built.set()
+        idx = file_index.get_index(str(tree))
+        deadline = time.monotonic() + 5
+        while not idx.ready and time.monotonic() < deadline:
+            time.sleep(0.01)
+        result = file_index.search([str(tree)], "report")
+        assert result["indexing"] is False and len(result["matches"]) == 2
+
+    def test_scan_search_paging_matches_index(self, tree):
+        hits, skip, more = file_index.scan_search(str(tree), "re", skip=1, limit=5)
+        assert (len(hits), skip, more) == (1, 0, False)
+
+    def test_retain_drops_unlisted_roots(self, tree, tmp_path_factory, monkeypatch):
+        other = tmp_path_factory.mktemp("other")
+        monkeypatch.setattr(file_index, "_indexes", {})
+        file_index.get_index(str(tree))
+        file_index.get_index(str(other))
+        file_index.retain([str(tree)])
+        assert list(file_index._indexes) == [os.path.abspath(tree)]
@@ -0,0 +1,69 @@
+"""
+Unit Tests for the ONNX Runtime VITS backend wrapper
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "heystive_professional"))
+
+from heystive.engines.tts.onnx_vits import OnnxVitsEngine, model_fingerprint
+from heystive.engines.tts.vits_batcher import SENTENCE_GAP
+
+
+class FakeVits:
+    """Stands in for a Coqui Vits: counts exports and tokenizes one id per character"""
+
+    inference_noise_scale, length_scale, inference_noise_scale_dp = 0.667, 1.0, 0.8
+
+    def __init__(self):
+        self.exports = 0
+        self.tokenizer = SimpleNamespace(text_to_ids=lambda text: [1] * len(text))
+
+    def export_onnx(self, output_path, verbose=True):
+        self.exports += 1
+        Path(output_path).write_bytes(b"graph")
+
+
+class FakeSession:
+    def __init__(self):
+        self.feeds = []
+
+    def run(self, outputs, feeds):
+        self.feeds.append(feeds)
+        return [np.ones((1, 1, 100 * feeds["input"].shape[1]), dtype=np.float32)]
+
+
+class TestOnnxVitsEngine:
+    """Test graph caching and sentence-wise synthesis"""
+
+    def test_export_is_cached(self, tmp_path):
+        model = FakeVits()
+        engine = OnnxVitsEngine(model, tmp_path, "abc")
+        assert engine.export() == tmp_path / "vits_abc.onnx"
+        OnnxVitsEngine(model, tmp_path, "abc").export()
+        assert model.exports == 1
+        assert OnnxVitsEngine(model, tmp_path, "abc", quantize=True).session_path.name == "vits_abc.int8.onnx"
+
+    def test_tts_joins_sentences_with_gap(self, tmp_path):
+        engine = OnnxVitsEngine(FakeVits(), tmp_path, "abc", split_sentences=lambda t: t.split("|"))
+        engine.session = FakeSession()
+        wav = engine.tts(text="ab|cde")
+        assert wav.dtype == np.float32
+        assert len(wav) == 200 + SENTENCE_GAP + 300 + SENTENCE_GAP
+        assert not wav[200:200 + SENTENCE_GAP].any() and not wav[-SENTENCE_GAP:].any()
+        feeds = engine.session.feeds[0]
+        assert feeds["input"].dtype == np.int64 and feeds["input_lengths"].tolist() == [2]
+        assert np.allclose(feeds["scales"], [0.667, 1.0, 0.8])
+        assert "sid" not in feeds
+
+    def test_fingerprint_tracks_checkpoint_file(self, tmp_path):
+        ckpt = tmp_path / "model.pth"
+        ckpt.write_bytes(b"1")
+        first = model_fingerprint("name", str(ckpt))
+        ckpt.write_bytes(b"22")
+        assert model_fingerprint("name", str(ckpt)) != first
+        assert model_fingerprint("name", None) == model_fingerprint("name", None)
@@ -0,0 +1,94 @@
+"""
+Unit Tests for the Aho-Corasick intent keyword matcher
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "heystive_professional"))
+
+from heystive.intelligence.conversation_flow import ConversationState, PersianConversationFlow
+from heystive.intelligence.pattern_matcher import AhoCorasickMatcher
+
+
+class TestAhoCorasickMatcher:
+    """Test single-pass multi-pattern matching"""
+
+    def test_overlapping_hits_with_spans(self):
+        matcher = AhoCorasickMatcher({"a": ["he", "she", "hers"], "b": ["his"]})
+        hits = sorted((h.label, h.pattern, h.start, h.end) for h in matcher.iter_hits("ushers"))
+        assert hits == [("a", "he", 2, 4), ("a", "hers", 2, 6), ("a", "she", 1, 4)]
+
+    def test_same_pattern_under_two_labels(self):
+        matcher = AhoCorasickMatcher({"x": ["کم"], "y": ["کم"]})
+        assert set(matcher.search("کمک")) == {"x", "y"}
+
+    def test_hot_add(self):
+        matcher = AhoCorasickMatcher({"lights": ["چراغ"]})
+        assert "fans" not in matcher.search("پنکه رو روشن کن")
+        assert matcher.add("fans", "پنکه")
+        assert not matcher.add("fans", "پنکه")
+        assert matcher.search("پنکه رو روشن کن")["fans"][0].start == 0
+        assert len(matcher) == 2
+
+    def test_add_between_compile_and_scan(self, monkeypatch):
+        matcher = AhoCorasickMatcher({"a": ["ab"]})
+        real_compile = matcher._compile
+
+        def compile_then_add():
+            automaton = real_compile()
+            matcher.add("z", "xyzab")
+            return automaton
+
+        monkeypatch.setattr(matcher, "_compile", compile_then_add)
+        assert [(h.label, h.end) for h in matcher.iter_hits("xyzab")] == [("a", 5)]
+        monkeypatch.setattr(matcher, "_compile", real_compile)
+        assert {h.label for h in matcher.iter_hits("xyzab")} == {"a", "z"}
+
+    def test_normalizer_applies_to_patterns_and_text(self):
+        matcher = AhoCorasickMatcher({"k": ["كتاب"]}, normalizer=lambda t: t.replace("ك", "ک"))
+        assert "k" in matcher.search("کتاب")
+
+
+class TestConversationFlowMatching:
+    """Test intent classification on top of the matcher"""
+
+    def setup_method(self):
+        self.flow = PersianConversationFlow(llm_manager=None, tts_engine=None)
+
+    def test_device_control_with_spans(self):
+        intent = self.flow._pattern_match_intent("لطفا چراغ رو روشن کن")
+        assert (intent["intent"], intent["device"], intent["action"]) == ("device_control", "lights", "turn_on")
+        assert intent["spans"]["device_control.lights"] == [(5, 9)]
+
+    def test_priority_order(self):
+        assert self.flow._pattern_match_intent("سلام، چراغ رو روشن کن")["intent"] == "greeting"
+        assert self.flow._pattern_match_intent("ساعت چنده")["intent"] == "question"
+        assert self.flow._pattern_match_intent("بله")["intent"] == "other"
+        self.flow.current_state = ConversationState.WAITING_CONFIRMATION
+        assert self.flow._pattern_match_intent("بله")["confirmation"] is True
+
+    def test_add_intent_pattern(self):
+        assert self.flow._pattern_match_intent("کولر رو روشن کن")["intent"] == "other"
+        self.flow.add_intent_pattern("device_control", "کولر", "air_conditioner")
+        assert self.flow._pattern_match_intent("کولر رو روشن کن")["device"] == "air_conditioner"
+
+    def test_add_intent_pattern_to_flat_category(self):
+        assert self.flow._pattern_match_intent("هی استیو")["intent"] == "other"
+        assert self.flow.add_intent_pattern("greetings", "هی")
+        assert self.flow._pattern_match_intent("هی استیو")["intent"] == "greeting"
+
+    def test_add_intent_pattern_rejects_unreadable_targets(self):
+        with pytest.raises(ValueError):
+            self.flow.add_intent_pattern("greetings", "هی", "casual")
+        with pytest.raises(ValueError):
+            self.flow.add_intent_pattern("weather", "بارون")
+        with pytest.raises(ValueError):
+            self.flow.add_intent_pattern("actions", "روشن")
+        with pytest.raises(ValueError):
+            self.flow.add_intent_pattern("confirmations", "شاید", "maybe")
+        assert "weather" not in self.flow.persian_patterns
+        assert "maybe" not in self.flow.persian_patterns["confirmations"]
+        assert self.flow.add_intent_pattern("confirmations", "حتما", "yes")
@@ -0,0 +1,94 @@
+"""
+Unit Tests for the shared Persian text normalizer
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "heystive_professional"))
+
+from heystive.utils.persian_text import DIGITS_TO_LATIN, PersianNormalizer, get_normalizer, normalize_persian
+
+ZWNJ = "‌"
+
+
+class TestProfiles:
+    """Test the per-caller normalization profiles"""
+
+    def test_text_profile(self):
+        assert normalize_persian("  ساعت ۱۲ ، چنده ؟ ") == "ساعت 12, چنده?"
+
+    def test_tts_profile_folds_letters(self):
+        assert normalize_persian("ضابط قصر ۳", "tts") == "زابت غسر 3"
+
+    def test_display_profile_keeps_persian_digits(self):
+        assert normalize_persian("علي  ٤٥ ء", "display") == "علی ۴۵ ٔ"
+
+    def test_match_profile(self):
+        assert normalize_persian("سلام استيو ساعت 12 ء", "match") == "سلام استیو ساعت ۱۲"
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError):
+            get_normalizer("nope")
+
+
+class TestCleanup:
+    """Test the combined whitespace/punctuation/ZWNJ pass"""
+
+    def test_whitespace_collapses(self):
+        assert normalize_persian("a \t b\n\nc  ") == "a b c"
+
+    def test_zwnj(self):
+        assert normalize_persian(f"می{ZWNJ}{ZWNJ}روم") == f"می{ZWNJ}روم"
+        assert normalize_persian(f"می {ZWNJ} روم") == "می روم"
+        assert normalize_persian(f"{ZWNJ}خانه{ZWNJ}") == "خانه"
+
+    def test_clean_text_unchanged(self):
+        text = f"من دستیار صوتی هستم و فارسی صحبت می{ZWNJ}کنم."
+        assert normalize_persian(text, "display") == text
+
+    def test_repeated_input_is_cached(self):
+        normalizer = PersianNormalizer(digits="latin")
+        normalizer.normalize("سلام ۱")
+        normalizer.normalize("سلام ۱")
+        assert normalizer.cache_info().hits == 1
+
+
+class TestClientNormalizer:
+    """Test that the clients and extensions use the shared normalizer itself"""
+
+    SAMPLES = ["ساعت ١٢ و 30 دقيقه", "كتاب  مدرسة", "مسئله ء  ۴۵", "  يك   دو  ", "می\u200c\u200cخواهم ، نه"]
+
+    def test_api_bridge_uses_the_shared_module(self):
+        sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+        from api_bridge import persian_text as bridge
+        assert bridge.get_normalizer is get_normalizer
+        assert bridge.DIGITS_TO_LATIN is DIGITS_TO_LATIN
+
+    def test_loads_by_path_without_the_backend_tree(self, monkeypatch):
+        sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+        from api_bridge import persian_text as bridge
+        for name in ("heystive", "heystive.utils", "heystive.utils.persian_text"):
+            monkeypatch.setitem(sys.modules, name, None)
+        monkeypatch.delitem(sys.modules, bridge.MODULE_NAME, raising=False)
+        module = bridge._import_persian_text()
+        assert module.__name__ == bridge.MODULE_NAME
+        for text in self.SAMPLES:
+            assert module.normalize_persian(text, "display") == normalize_persian(text, "display")
+
+    def test_feature_extensions_use_the_match_profile(self):
+        sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+        from enhancements.integrations.feature_extensions import VoiceCommandExtensions
+        extensions = VoiceCommandExtensions.__new__(VoiceCommandExtensions)
+        for text in self.SAMPLES:
+            assert extensions._normalize_persian_text(text) == normalize_persian(text, "match")
+
+    def test_shared_client_uses_the_display_profile(self):
+        pytest.importorskip("websockets")
+        sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+        from api_bridge.shared_client import PersianTextProcessor
+        processor = PersianTextProcessor()
+        for text in self.SAMPLES:
+            assert processor.normalize_persian_text(text) == normalize_persian(text, "display")
@@ -0,0 +1,179 @@
+"""
+Unit Tests for concurrent DAG plan execution
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "heystive_professional"))
+os.environ.setdefault("HEYSTIVE_DB", os.path.join(tempfile.mkdtemp(), "heystive.db"))
+
+from plan_executor import PlanError, PlanExecutor, normalize_plan
+
+
+def sleepy_step(step, context):
+    """args: {"sleep": seconds, "fail": bool}; echoes the dependency results it saw"""
+    args = step.get("args", {})
+    time.sleep(args.get("sleep", 0))
+    if args.get("fail"):
+        raise RuntimeError("boom")
+    return {"id": step["id"], "deps": context["results"]}
+
+
+def collect(executor, plan):
+    async def go():
+        return [record async for record in executor.stream(plan, {})]
+    return asyncio.run(go())
+
+
+class TestNormalizePlan:
+    """Test plan validation"""
+
+    def test_default_ids_and_deps(self):
+        steps = normalize_plan([{"skill": "a"}, {"skill": "b", "depends_on": 0}])
+        assert [s["id"] for s in steps] == ["0", "1"]
+        assert steps[1]["depends_on"] == ["0"]
+
+    @pytest.mark.parametrize("plan", [
+        [{"id": "a"}, {"id": "a"}],
+        [{"id": "a", "depends_on": ["missing"]}],
+        [{"id": "a", "depends_on": ["b"]}, {"id": "b", "depends_on": ["a"]}],
+    ])
+    def test_invalid_plans(self, plan):
+        with pytest.raises(PlanError):
+            normalize_plan(plan)
+
+
+class TestPlanExecutor:
+    """Test concurrency, dependencies, timeouts and streaming"""
+
+    def test_independent_steps_run_concurrently(self):
+        plan = [{"id": str(i), "args": {"sleep": 0.2}} for i in range(4)]
+        start = time.perf_counter()
+        records = collect(PlanExecutor(sleepy_step), plan)
+        assert time.perf_counter() - start < 0.6
+        assert all(r["status"] == "ok" for r in records)
+
+    def test_results_stream_in_completion_order(self):
+        plan = [{"id": "slow", "args": {"sleep": 0.3}}, {"id": "fast", "args": {"sleep": 0.0}}]
+        assert [r["id"] for r in collect(PlanExecutor(sleepy_step), plan)] == ["fast", "slow"]
+
+    def test_dependencies_see_parent_results(self):
+        plan = [{"id": "a"}, {"id": "b", "depends_on": ["a"]}]
+        records = asyncio.run(PlanExecutor(sleepy_step).run(plan, {}))
+        assert records[1]["result"]["deps"] == {"a": {"id": "a", "deps": {}}}
+
+    def test_timeout_and_error_skip_dependents(self):
+        plan = [
+            {"id": "slow", "args": {"sleep": 0.5}, "timeout_s": 0.05},
+            {"id": "after_slow", "depends_on": ["slow"]},
+            {"id": "bad", "args": {"fail": True}},
+            {"id": "after_bad", "depends_on": ["bad"]},
+            {"id": "leaf", "depends_on": ["after_bad"]},
+            {"id": "ok"},
+        ]
+        status = {r["id"]: r["status"] for r in collect(PlanExecutor(sleepy_step), plan)}
+        assert status == {"slow": "timeout", "after_slow": "skipped", "bad": "error",
+                          "after_bad": "skipped", "leaf": "skipped", "ok": "ok"}
+
+    def test_closing_stream_cancels_pending_steps(self):
+        started = []
+        lock = threading.Lock()
+
+        def step(step, context):
+            with lock:
+                started.append(step["id"])
+            time.sleep(0.05)
+            return {}
+
+        plan = [{"id": "a"}, {"id": "b", "depends_on": ["a"]}]
+
+        async def go():
+            stream = PlanExecutor(step).stream(plan, {})
+            first = await stream.__anext__()
+            await stream.aclose()
+            await asyncio.sleep(0.1)
+            return first
+
+        assert asyncio.run(go())["id"] == "a"
+        assert started == ["a"]
+
+    def test_timed_out_steps_stay_on_the_bounded_pool(self):
+        release = threading.Event()
+        threads = set()
+
+        def stuck(step, context):
+            threads.add(threading.current_thread().name)
+            release.wait(5)
+            return {}
+
+        executor = PlanExecutor(stuck, max_concurrency=4, step_timeout_s=0.05, pool_workers=2, queue_timeout_s=0.2)
+        try:
+            records = collect(executor, [{"id": str(i)} for i in range(4)])
+            assert {r["status"] for r in records} == {"timeout"}
+            assert sum("no plan worker free" in r["result"]["error"] for r in records) == 2
+            assert len(threads) == 2
+            assert all(name.startswith("plan-step") for name in threads)
+        finally:
+            release.set()
+            executor.close()
+
+    def test_queue_time_does_not_count_against_the_timeout(self):
+        executor = PlanExecutor(sleepy_step, max_concurrency=2, pool_workers=1)
+        try:
+            plan = [{"id": str(i), "args": {"sleep": 0.1}, "timeout_s": 0.15} for i in range(2)]
+            assert [r["status"] for r in collect(executor, plan)] == ["ok", "ok"]
+        finally:
+            executor.close()
+
+    @pytest.mark.parametrize("timeout_s, status", [("soon", "error"), ([1], "error"), (True, "error"),
+                                                   (0, "ok"), (-1, "ok"), (10 ** 9, "ok")])
+    def test_timeout_is_validated_and_clamped(self, timeout_s, status):
+        record = collect(PlanExecutor(sleepy_step), [{"id": "a", "timeout_s": timeout_s}])[0]
+        assert record["status"] == status
+        if status == "error":
+            assert "invalid timeout_s" in record["result"]["error"]
+
+
+class TestIntentEndpoint:
+    """Test /api/intent plan execution"""
+
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        pytest.importorskip("fastapi")
+        import store
+        monkeypatch.setattr(store, "DB_PATH", str(tmp_path / "heystive.db"))
+        from fastapi.testclient import TestClient
+        import backend_min
+        return TestClient(backend_min.app)
+
+    def test_plan_results_in_plan_order(self, client):
+        plan = [{"id": "t", "skill": "calc", "args": {"text": "2*3"}}, {"id": "u", "skill": "nope", "depends_on": ["t"]}]
+        body = client.post("/api/intent", json={"plan": plan}).json()
+        assert [r["id"] for r in body["results"]] == ["t", "u"]
+        assert body["results"][0]["result"]["result"] == 6
+        assert body["results"][1]["status"] == "error"
+
+    def test_plan_streams_ndjson(self, client):
+        plan = [{"skill": "calc", "args": "1+1"}, {"skill": "calc", "args": "2+2"}]
+        with client.stream("POST", "/api/intent", json={"plan": plan, "stream": True}) as response:
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            lines = [line for line in response.iter_lines() if line]
+        assert len(lines) == 2
+
+    def test_bad_step_timeout_is_a_step_error(self, client):
+        plan = [{"skill": "calc", "args": "1+1", "timeout_s": "soon"}]
+        response = client.post("/api/intent", json={"plan": plan})
+        assert response.status_code == 200
+        assert response.json()["results"][0]["status"] == "error"
+
+    def test_cyclic_plan_rejected(self, client):
+        plan = [{"id": "a", "depends_on": ["b"]}, {"id": "b", "depends_on": ["a"]}]
+        assert client.post("/api/intent", json={"plan": plan}).status_code == 400
@@ -0,0 +1,217 @@
+"""
+Unit Tests for the incremental rag_lite index
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+pytest.importorskip("sklearn")
+pytest.importorskip("fastapi")
+
+
+@pytest.fixture
+def rag(tmp_path, monkeypatch):
+    from server import rag_lite
+    kdir = tmp_path / "knowledge"
+    kdir.mkdir()
+    monkeypatch.setattr(rag_lite, "KNOWLEDGE_DIR", kdir)
+    monkeypatch.setattr(rag_lite, "INDEX_DIR", kdir / ".index")
+    monkeypatch.setattr(rag_lite, "INDEX", {"files": [], "meta": {}, "rows": {}, "df": None, "view": None, "loaded": False, "synced": False})
+    return rag_lite, kdir
+
+
+class TestIncrementalIndex:
+    """Test incremental refresh and persistence"""
+
+    def test_only_changed_files_are_revectorized(self, rag):
+        rag_lite, kdir = rag
+        (kdir / "a.md").write_text("apples and oranges", encoding="utf-8")
+        (kdir / "b.txt").write_text("سلام دنیا", encoding="utf-8")
+        assert rag_lite.refresh()["added"] == 2
+        again = rag_lite.refresh()
+        assert (again["count"], again["added"], again["updated"], again["removed"]) == (2, 0, 0, 0)
+        (kdir / "a.md").write_text("bananas only", encoding="utf-8")
+        (kdir / "b.txt").unlink()
+        stats = rag_lite.refresh()
+        assert stats["updated"] == 1 and stats["removed"] == 1
+        assert rag_lite.search(q="bananas", k=1)["results"][0]["file"].endswith("a.md")
+
+    def test_index_persists_across_restart(self, rag):
+        rag_lite, kdir = rag
+        (kdir / "notes.md").write_text("buy milk\n", encoding="utf-8")
+        rag_lite.refresh()
+        rag_lite.INDEX.update({"files": [], "meta": {}, "rows": {}, "df": None, "view": None, "loaded": False, "synced": False})
+        assert rag_lite._load() is True
+        assert rag_lite.INDEX["files"] == [str(kdir / "notes.md")]
+
+    def test_refresh_single_path(self, rag):
+        rag_lite, kdir = rag
+        p = kdir / "notes.md"
+        p.write_text("first note\n", encoding="utf-8")
+        rag_lite.refresh([str(p)])
+        with open(p, "a", encoding="utf-8") as f:
+            f.write("second note about tea\n")
+        assert rag_lite.refresh([str(p)])["updated"] == 1
+        assert rag_lite.search(q="tea", k=1)["results"][0]["score"] > 0
+
+    def test_appended_note_patches_the_view(self, rag, monkeypatch):
+        rag_lite, kdir = rag
+        (kdir / "a.md").write_text("apples and oranges", encoding="utf-8")
+        notes = kdir / "notes.md"
+        notes.write_text("first note\n\nbuy milk\n", encoding="utf-8")
+        rag_lite.refresh()
+        rebuilds = []
+        real_rebuild = rag_lite._rebuild_vecs
+        monkeypatch.setattr(rag_lite, "_rebuild_vecs", lambda: rebuilds.append(1) or real_rebuild())
+        with open(notes, "a", encoding="utf-8") as f:
+            f.write("and green tea\n")
+        stats = rag_lite.refresh([str(notes)])
+        assert stats["updated"] == 1 and stats["passages"] == 3
+        assert rebuilds == []
+        hit = rag_lite.search(q="tea", k=5)["results"]
+        assert [h["snippet"] for h in hit] == ["buy milk\nand green tea"]
+        assert rag_lite.search(q="apples", k=1)["results"][0]["file"].endswith("a.md")
+        assert rag_lite.INDEX["meta"][str(notes)]["passages"] == [list(s) for s in rag_lite.split_passages(notes.read_text(encoding="utf-8"))]
+
+    def test_patched_views_share_the_base(self, rag):
+        rag_lite, kdir = rag
+        (kdir / "a.md").write_text("apples and oranges", encoding="utf-8")
+        notes = kdir / "notes.md"
+        notes.write_text("buy milk\n", encoding="utf-8")
+        rag_lite.refresh()
+        first = rag_lite.INDEX["view"]
+        with open(notes, "a", encoding="utf-8") as f:
+            f.write("\ncall mom\n")
+        rag_lite.refresh([str(notes)])
+        second = rag_lite.INDEX["view"]
+        assert second is not first and second["base"] is first["base"]
+        assert first["tail"] is None and second["tail"].shape[0] == 2
+        assert [h["snippet"] for h in rag_lite.search(q="milk", k=5)["results"]] == ["buy milk"]
+        assert rag_lite.search(q="apples", k=1)["results"][0]["file"].endswith("a.md")
+
+    def test_appended_note_is_persisted(self, rag):
+        rag_lite, kdir = rag
+        notes = kdir / "notes.md"
+        notes.write_text("buy milk\n", encoding="utf-8")
+        rag_lite.refresh()
+        with open(notes, "a", encoding="utf-8") as f:
+            f.write("\ncall mom\n")
+        rag_lite.refresh([str(notes)])
+        rag_lite.INDEX.update({"files": [], "meta": {}, "rows": {}, "df": None, "view": None, "loaded": False, "synced": True})
+        assert rag_lite._load() is True
+        assert "texts" not in rag_lite.INDEX["meta"][str(notes)]
+        spans, texts = rag_lite._stored_passages(str(notes), rag_lite.INDEX["meta"][str(notes)]["sha1"])
+        assert texts.tolist() == ["buy milk", "call mom"] and spans.tolist() == [[0, 8], [10, 18]]
+        assert rag_lite.search(q="mom", k=1)["results"][0]["snippet"] == "call mom"
+
+    def test_search_during_refresh_sees_a_consistent_view(self, rag):
+        import threading
+        rag_lite, kdir = rag
+        notes = kdir / "notes.md"
+        notes.write_text("first note about tea\n", encoding="utf-8")
+        rag_lite.refresh()
+        published = rag_lite.INDEX["view"]
+        before = (published["tail_rows"], dict(published["rows_of"]), published["dead"])
+        errors, done = [], threading.Event()
+
+        def searcher():
+            while not done.is_set():
+                try:
+                    rag_lite.search(q="tea", k=5)
+                except Exception as e:
+                    errors.append(e)
+                    return
+
+        threads = [threading.Thread(target=searcher) for _ in range(4)]
+        for t in threads:
+            t.start()
+        try:
+            for i in range(200):
+                with open(notes, "a", encoding="utf-8") as f:
+                    f.write(f"\nnote {i} about green tea\n")
+                rag_lite.refresh([str(notes)])
+        finally:
+            done.set()
+            for t in threads:
+                t.join()
+        assert errors == []
+        assert (published["tail_rows"], published["rows_of"], published["dead"]) == before
+        assert rag_lite.search(q="note", k=1)["results"]
+
+
+class TestPassageSearch:
+    """Test passage-level retrieval"""
+
+    def test_split_passages_offsets(self):
+        from server.rag_lite import split_passages
+        text = "first para\nline two\n\n  second para  \n\n\nthird"
+        spans = split_passages(text)
+        assert [text[s:e] for s, e in spans] == ["first para\nline two", "second para", "third"]
+
+    def test_long_paragraph_is_windowed(self, rag):
+        rag_lite, _ = rag
+        text = "\n".join(f"line {i} " + "x" * 40 for i in range(100))
+        spans = rag_lite.split_passages(text)
+        assert len(spans) > 1
+        assert all(e - s <= rag_lite.MAX_PASSAGE_CHARS for s, e in spans)
+
+    def test_search_returns_snippet_and_highlights(self, rag):
+        rag_lite, kdir = rag
+        (kdir / "a.md").write_text("intro text\n\nremember to buy green tea\n\nclosing words", encoding="utf-8")
+        hit = rag_lite.search(q="tea", k=3)["results"][0]
+        assert hit["snippet"] == "remember to buy green tea"
+        s, e = hit["highlights"][0]
+        assert hit["snippet"][s:e] == "tea"
+        text = (kdir / "a.md").read_text(encoding="utf-8")
+        assert text[hit["start"]:hit["end"]] == hit["snippet"]
+
+    def test_snippet_comes_from_the_index(self, rag):
+        rag_lite, kdir = rag
+        p = kdir / "a.md"
+        p.write_text("remember to buy green tea", encoding="utf-8")
+        rag_lite.refresh()
+        p.write_text("XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX", encoding="utf-8")
+        hit = rag_lite.search(q="tea", k=1)["results"][0]
+        assert hit["snippet"] == "remember to buy green tea"
+
+    def test_empty_corpus_is_not_rewalked(self, rag, monkeypatch):
+        rag_lite, _ = rag
+        assert rag_lite.search(q="tea", k=1).status_code == 400
+        calls = []
+        monkeypatch.setattr(rag_lite, "refresh", lambda *a, **kw: calls.append(a))
+        rag_lite.search(q="tea", k=1)
+        assert calls == []
+
+    def test_top_k_matches_full_sort(self):
+        import numpy as np
+        from server.rag_lite import top_k
+        scores = np.random.default_rng(0).random(1000).astype(np.float32)
+        assert list(top_k(scores, 7)) == list(np.argsort(-scores)[:7])
+
+
+class TestNoteCommand:
+    """Test that note.add writes into the indexed knowledge directory"""
+
+    def test_note_is_indexed_under_the_knowledge_dir(self, rag):
+        from server import commands
+        rag_lite, kdir = rag
+        assert commands.cmd_note_add("remember the green tea")["ok"] is True
+        assert (kdir / "notes.md").read_text(encoding="utf-8") == "remember the green tea\n"
+        assert rag_lite.search(q="tea", k=1)["results"][0]["file"] == str(kdir / "notes.md")
+        assert commands.cmd_note_search("green")["matches"][0]["line"] == 1
+
+    def test_refresh_failure_is_logged(self, rag, monkeypatch, caplog):
+        from server import commands
+        rag_lite, kdir = rag
+
+        def broken(paths=None, full=False):
+            raise RuntimeError("index locked")
+
+        monkeypatch.setattr(rag_lite, "refresh", broken)
+        with caplog.at_level("WARNING", logger="heystive.commands"):
+            assert commands.cmd_note_add("buy milk")["ok"] is True
+        assert "index locked" in caplog.text
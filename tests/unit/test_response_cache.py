@@ -0,0 +1,171 @@
+"""
+Unit Tests for the LLM response cache and single-flight
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "heystive_professional"))
+
+from heystive.intelligence.llm_manager import PersianLLMManager
+from heystive.intelligence.response_cache import ResponseCache, response_key
+
+
+class TestResponseCache:
+    """Test keys, TTL and LRU eviction"""
+
+    def test_mentions_any_matches_whole_words(self):
+        from heystive.intelligence.response_cache import mentions_any, TIME_TERMS, FOLLOW_UP_TERMS
+        assert mentions_any("ساعت چنده؟", TIME_TERMS)
+        assert mentions_any("چرا؟", FOLLOW_UP_TERMS)
+        assert not mentions_any("هوا چطوره", TIME_TERMS + FOLLOW_UP_TERMS)
+        assert not mentions_any("آنتن", FOLLOW_UP_TERMS)
+
+    def test_key_normalizes_text_and_hashes_context(self):
+        assert response_key("ساعت چنده؟") == response_key("  ساعت   چنده ")
+        assert response_key("ساعت چنده", "زمان: 10:00") != response_key("ساعت چنده", "زمان: 10:01")
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2, ttl_s=60)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+        assert cache.get("b") is None and cache.get("a") == "1"
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        cache = ResponseCache(max_entries=2, ttl_s=0)
+        cache.put("a", "1")
+        assert cache.get("a") is None
+        assert cache.stats()["expired"] == 1
+
+    def test_failed_call_is_not_cached(self):
+        cache = ResponseCache()
+
+        async def boom():
+            raise RuntimeError("upstream down")
+
+        async def go():
+            try:
+                await cache.get_or_compute("k", boom)
+            except RuntimeError:
+                pass
+            return cache.get("k")
+
+        assert asyncio.run(go()) is None
+
+
+class TestLLMManagerCaching:
+    """Test generate_persian_response against a fake upstream"""
+
+    def setup_method(self):
+        self.manager = PersianLLMManager({"llm_provider": "test"})
+        self.calls = 0
+
+        async def fake_llm(messages):
+            self.calls += 1
+            await asyncio.sleep(0.05)
+            return "سلام"
+
+        self.manager._call_llm = fake_llm
+
+    def test_concurrent_identical_prompts_share_one_call(self):
+        async def go():
+            return await asyncio.gather(*[self.manager.generate_persian_response("سلام", {"intent": "greeting"})
+                                          for _ in range(5)])
+
+        assert asyncio.run(go()) == ["سلام"] * 5
+        assert self.calls == 1
+        stats = self.manager.get_performance_stats()["response_cache"]
+        assert stats["shared"] == 4 and stats["misses"] == 1
+
+    def test_repeat_in_one_live_conversation_hits(self):
+        asyncio.run(self.manager.generate_persian_response("سلام؟", {"intent": "greeting", "time": "10:59"}))
+        asyncio.run(self.manager.generate_persian_response("چراغ را روشن کن", {"intent": "device_control", "time": "10:59"}))
+        asyncio.run(self.manager.generate_persian_response("سلام", {"intent": "greeting", "time": "11:00"}))
+        assert self.calls == 2
+        stats = self.manager.get_performance_stats()["response_cache"]
+        assert stats["hits"] == 1 and stats["saved_latency_s"] > 0
+        assert self.manager.get_performance_stats()["conversation_length"] == 3
+
+    def test_cached_prompts_carry_no_history_or_clock(self):
+        prompts = []
+
+        async def fake_llm(messages):
+            prompts.append(messages)
+            return "سلام"
+
+        self.manager._call_llm = fake_llm
+        asyncio.run(self.manager.generate_persian_response("چراغ را روشن کن"))
+        asyncio.run(self.manager.generate_persian_response("سلام", {"intent": "greeting", "time": "10:01", "weather": "آفتابی"}))
+        assert [m["role"] for m in prompts[1]] == ["system", "system", "user"]
+        assert "آفتابی" in prompts[1][1]["content"] and "10:01" not in prompts[1][1]["content"]
+
+    def test_time_question_is_not_served_a_stale_answer(self):
+        prompts = []
+
+        async def fake_llm(messages):
+            prompts.append(messages)
+            return messages[-2]["content"]
+
+        self.manager._call_llm = fake_llm
+        first = asyncio.run(self.manager.generate_persian_response("ساعت چنده؟", {"intent": "question", "time": "10:01"}))
+        self.manager.clear_conversation_history()
+        second = asyncio.run(self.manager.generate_persian_response("ساعت چنده؟", {"intent": "question", "time": "10:04"}))
+        assert len(prompts) == 2
+        assert "10:01" in first and "10:04" in second
+        assert self.manager.get_performance_stats()["response_cache"]["bypassed"] == 2
+
+    def test_follow_up_question_keeps_its_history(self):
+        prompts = []
+
+        async def fake_llm(messages):
+            prompts.append(messages)
+            return "چون خواستید"
+
+        self.manager._call_llm = fake_llm
+        asyncio.run(self.manager.generate_persian_response("چراغ را روشن کن", {"intent": "device_control"}))
+        asyncio.run(self.manager.generate_persian_response("چرا؟", {"intent": "question"}))
+        self.manager.clear_conversation_history()
+        asyncio.run(self.manager.generate_persian_response("تلویزیون را خاموش کن", {"intent": "device_control"}))
+        asyncio.run(self.manager.generate_persian_response("چرا؟", {"intent": "question"}))
+        assert len(prompts) == 4
+        assert prompts[1][1]["content"] == "چراغ را روشن کن"
+        assert prompts[3][1]["content"] == "تلویزیون را خاموش کن"
+        assert self.manager.get_performance_stats()["response_cache"]["bypassed"] == 4
+
+    def test_answer_context_splits_the_key(self):
+        asyncio.run(self.manager.generate_persian_response("هوا چطوره", {"intent": "question", "weather": "آفتابی"}))
+        asyncio.run(self.manager.generate_persian_response("هوا چطوره", {"intent": "question", "weather": "بارانی"}))
+        assert self.calls == 2
+
+    def test_history_dependent_turns_bypass(self):
+        prompts = []
+
+        async def fake_llm(messages):
+            prompts.append(messages)
+            return "باشه"
+
+        self.manager._call_llm = fake_llm
+        asyncio.run(self.manager.generate_persian_response("چراغ را روشن کن"))
+        asyncio.run(self.manager.generate_persian_response("دوباره"))
+        asyncio.run(self.manager.generate_persian_response("دوباره"))
+        assert len(prompts) == 3
+        assert prompts[1][1]["content"] == "چراغ را روشن کن"
+        assert self.manager.get_performance_stats()["response_cache"]["bypassed"] == 3
+
+    def test_context_intents_bypass(self):
+        context = {"last_intent": {"intent": "device_control"}}
+        asyncio.run(self.manager.generate_persian_response("سلام", context))
+        asyncio.run(self.manager.generate_persian_response("سلام", context))
+        asyncio.run(self.manager.generate_persian_response("سلام", {"intent": "greeting"}, use_cache=False))
+        assert self.calls == 3
+        assert self.manager.get_performance_stats()["response_cache"]["bypassed"] == 3
+
+    def test_clearing_history_keeps_the_cache(self):
+        asyncio.run(self.manager.generate_persian_response("سلام", {"intent": "greeting"}))
+        self.manager.clear_conversation_history()
+        asyncio.run(self.manager.generate_persian_response("سلام", {"intent": "greeting"}))
+        assert self.calls == 1
@@ -0,0 +1,150 @@
+"""
+Unit Tests for the shared settings cache
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "heystive_professional"))
+
+from settings_cache import SettingsCache
+
+
+class TestSettingsCache:
+    """Test mtime revalidation, snapshots and coalesced writes"""
+
+    def test_snapshot_cached_until_file_changes(self, tmp_path):
+        p = tmp_path / "settings.json"
+        p.write_text(json.dumps({"theme": "light"}), encoding="utf-8")
+        c = SettingsCache(str(p))
+        first = c.snapshot()
+        assert c.snapshot() is first
+        assert c.loads == 1
+        p.write_text(json.dumps({"theme": "dark", "extra": 1}), encoding="utf-8")
+        assert c.snapshot()["theme"] == "dark"
+        assert c.loads == 2
+
+    def test_snapshot_is_immutable(self, tmp_path):
+        c = SettingsCache(str(tmp_path / "settings.json"))
+        c.write({"paths": ["/tmp"], "web": {"theme": "dark"}}, sync=True)
+        snap = c.snapshot()
+        with pytest.raises(TypeError):
+            snap["web"]["theme"] = "light"
+        assert snap["paths"] == ("/tmp",)
+
+    def test_writes_are_coalesced_and_atomic(self, tmp_path):
+        p = tmp_path / "settings.json"
+        c = SettingsCache(str(p), coalesce_s=0.05)
+        for i in range(50):
+            c.write({"n": i}, wait=False)
+        assert c.read() == {"n": 49}
+        c.flush()
+        assert json.loads(p.read_text(encoding="utf-8")) == {"n": 49}
+        assert c.writes == 1
+        assert [f.name for f in tmp_path.iterdir()] == ["settings.json"]
+
+    def test_write_returns_after_shared_flush(self, tmp_path):
+        import threading
+        p = tmp_path / "settings.json"
+        c = SettingsCache(str(p), coalesce_s=0.05)
+        seen = []
+
+        def writer(i):
+            assert c.write({"n": i})
+            seen.append(json.loads(p.read_text(encoding="utf-8")))
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(seen) == 8 and c.writes <= 2
+        assert json.loads(p.read_text(encoding="utf-8")) == c.read()
+
+
+class TestServerSettingsStore:
+    """Test the server store on top of the shared cache"""
+
+    @pytest.fixture
+    def store(self, tmp_path, monkeypatch):
+        pytest.importorskip("pydantic")
+        sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+        from server import settings_store
+        monkeypatch.setattr(settings_store, "SETTINGS_PATH", str(tmp_path / "settings.json"))
+        return settings_store
+
+    def test_shares_the_backend_cache_module(self, store):
+        import settings_cache
+        assert store.get_cache is settings_cache.get_cache
+
+    def test_snapshot_lists_are_tuples(self, store):
+        assert store.write_settings({"os_whitelist_paths": ["/srv"]})
+        snap = store.snapshot()
+        assert snap.os_whitelist_paths == ("/srv",)
+        assert isinstance(store.Settings().os_whitelist_apps, list)
+        assert isinstance(snap.os_whitelist_apps, tuple)
+        assert store.load().os_whitelist_paths == ["/srv"]
+        assert store.current()[1]["os_whitelist_paths"] == ["/srv"]
+
+
+class TestSettingsEvents:
+    """Test settings diffs and change notifications"""
+
+    def test_diff_settings(self):
+        pytest.importorskip("fastapi")
+        sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+        from server.settings_events import diff_settings
+        old = {"theme": "light", "web": {"a": 1}, "gone": True}
+        new = {"theme": "dark", "web": {"a": 1}, "added": 2}
+        assert diff_settings(old, new) == {"set": {"theme": "dark", "added": 2}, "removed": ["gone"]}
+
+    def test_listeners_see_version_changes(self, tmp_path):
+        c = SettingsCache(str(tmp_path / "settings.json"), coalesce_s=0)
+        seen = []
+        c.subscribe(seen.append)
+        c.write({"theme": "dark"})
+        c.unsubscribe(seen.append)
+        c.write({"theme": "light"})
+        assert seen == [c.version - 1]
+
+    def test_get_returns_stored_payload(self, tmp_path, monkeypatch):
+        pytest.importorskip("fastapi")
+        sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from server import settings_events, settings_store
+        monkeypatch.setattr(settings_store, "SETTINGS_PATH", str(tmp_path / "settings.json"))
+        settings_store.write_settings({"theme": "dark", "wakeword_keyword": "hey steve"})
+        app = FastAPI()
+        app.include_router(settings_events.router, prefix="/api/settings")
+        client = TestClient(app)
+        first = client.get("/api/settings")
+        assert first.json() == {"theme": "dark", "wakeword_keyword": "hey steve"}
+        assert client.get("/api/settings", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+        settings_store.write_settings({"theme": "dark"})
+        second = client.get("/api/settings").json()
+        assert settings_events.diff_settings(first.json(), second)["removed"] == ["wakeword_keyword"]
+
+    def test_etag_follows_content_not_the_counter(self, tmp_path, monkeypatch):
+        pytest.importorskip("fastapi")
+        sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from server import settings_events, settings_store
+        path = tmp_path / "settings.json"
+        monkeypatch.setattr(settings_store, "SETTINGS_PATH", str(path))
+        settings_store.write_settings({"theme": "dark"})
+        app = FastAPI()
+        app.include_router(settings_events.router, prefix="/api/settings")
+        client = TestClient(app)
+        before = client.get("/api/settings")
+        assert before.headers["X-Settings-Version"] == settings_events.settings_version({"theme": "dark"})
+        # A restarted server with different settings on disk starts its counter over
+        path.write_text(json.dumps({"theme": "light"}), encoding="utf-8")
+        monkeypatch.setattr(settings_store._settings_cache, "_caches", {})
+        after = client.get("/api/settings", headers={"If-None-Match": before.headers["ETag"]})
+        assert after.status_code == 200 and after.json() == {"theme": "light"}
+        assert after.headers["ETag"] != before.headers["ETag"]
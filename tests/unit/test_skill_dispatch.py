@@ -0,0 +1,111 @@
+"""
+Unit Tests for indexed skill dispatch
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "heystive_professional"))
+
+from skill_dispatch import SkillDispatcher
+from skills.base import Skill
+
+
+class KeywordSkill(Skill):
+    def __init__(self, name, triggers=(), handles=True):
+        self.name = name
+        self.triggers = triggers
+        self.handles = handles
+        self.asked = 0
+
+    def can_handle(self, text):
+        self.asked += 1
+        return self.handles
+
+    def handle(self, text, context):
+        return {"skill": self.name, "text": text, "args": context.get("args")}
+
+
+class TestSkillDispatcher:
+    """Test trigger preselection, name lookup and counters"""
+
+    def test_only_triggered_skills_are_asked(self):
+        skills = [KeywordSkill(f"s{i}", (f"<word{i}>",)) for i in range(300)]
+        dispatcher = SkillDispatcher(skills)
+        assert dispatcher.route("please <word250> now", {})[0] == "s250"
+        assert sum(s.asked for s in skills) == 1
+
+    def test_registration_order_is_priority(self):
+        dispatcher = SkillDispatcher([KeywordSkill("first", ("time",), handles=False), KeywordSkill("second", ("time",)),
+                                      KeywordSkill("any")])
+        assert dispatcher.route("what time", {})[0] == "second"
+        assert dispatcher.route("hello", {})[0] == "any"
+
+    def test_fallback_and_duplicates(self):
+        dispatcher = SkillDispatcher([KeywordSkill("time", ("time",))])
+        assert dispatcher.route("hello", {}) == ("fallback", {"message": "no matching skill"})
+        with pytest.raises(ValueError):
+            dispatcher.register(KeywordSkill("time"))
+
+    def test_execute_by_name_and_stats(self):
+        dispatcher = SkillDispatcher([KeywordSkill("echo", ("echo",))])
+        assert dispatcher.execute("echo", "hi", {"args": {"x": 1}})["args"] == {"x": 1}
+        assert dispatcher.execute("missing", "hi", {}) == {"error": "unknown skill"}
+        stats = dispatcher.stats()["echo"]
+        assert stats["hits"] == 1 and stats["errors"] == 0
+
+    def test_counters_survive_concurrent_plan_steps(self):
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        class YieldingCounters(dict):
+            # Gives up the GIL between the read and the write of every +=
+            def __setitem__(self, key, value):
+                time.sleep(0)
+                super().__setitem__(key, value)
+
+        dispatcher = SkillDispatcher([KeywordSkill("echo", ("echo",))])
+        dispatcher._stats["echo"] = YieldingCounters(dispatcher._stats["echo"])
+        with ThreadPoolExecutor(16) as pool:
+            list(pool.map(lambda _: dispatcher.execute("fallback", "echo", {}), range(2000)))
+        stats = dispatcher.stats()["echo"]
+        assert stats["hits"] == 2000 and stats["candidates"] == 2000
+
+
+class TestSandboxSkills:
+    """Test that registry skills are opt-in and need an explicit command"""
+
+    def _manifests(self, root):
+        skill = root / "file_write"
+        skill.mkdir()
+        (skill / "skill.json").write_text('{"triggers": ["write file"], "entry": ["python3", "skill.py"]}', encoding="utf-8")
+
+    def test_import_leaves_cwd_alone(self, tmp_path, monkeypatch):
+        import importlib
+        import skills_registry
+        monkeypatch.chdir(tmp_path)
+        importlib.reload(skills_registry)
+        assert list(tmp_path.iterdir()) == []
+        assert Path(skills_registry.REG_DIR).is_absolute()
+
+    def test_skills_are_opt_in(self, tmp_path, monkeypatch):
+        import skills_registry
+        self._manifests(tmp_path)
+        monkeypatch.setattr(skills_registry, "REG_DIR", str(tmp_path))
+        monkeypatch.setattr(skills_registry, "SANDBOX_SKILLS", set())
+        assert skills_registry.load_sandbox_skills() == []
+        assert [s.name for s in skills_registry.load_sandbox_skills(["file_write"])] == ["file_write"]
+        monkeypatch.setattr(skills_registry, "REG_DIR", str(tmp_path / "missing"))
+        assert skills_registry.load_sandbox_skills(["all"]) == []
+
+    def test_trigger_must_lead_the_utterance(self):
+        from skills_registry import SandboxSkill
+        skill = SandboxSkill({"name": "file_write", "triggers": ["Write File"], "entry": ["python3", "skill.py"]})
+        assert skill.can_handle("write file buy tea")
+        assert skill.can_handle("  Write   file: buy tea")
+        assert not skill.can_handle("how do I write file headers")
+        assert not skill.can_handle("write files")
+        dispatcher = SkillDispatcher([skill, KeywordSkill("any")])
+        assert dispatcher.route("please write file later", {})[0] == "any"
@@ -0,0 +1,135 @@
+"""
+Unit Tests for the pooled SQLite store
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "heystive_professional"))
+os.environ.setdefault("HEYSTIVE_DB", os.path.join(tempfile.mkdtemp(), "heystive.db"))
+
+import store
+
+
+class TestStore:
+    """Test thread-local pooled connections"""
+
+    def test_connection_reused_per_thread(self, tmp_path):
+        """Same thread gets the same connection, other threads get their own"""
+        db = str(tmp_path / "t.db")
+        a = store.get_conn(db)
+        assert store.get_conn(db) is a
+        other = []
+        t = threading.Thread(target=lambda: other.append(store.get_conn(db)))
+        t.start(); t.join()
+        assert other[0] is not a
+
+    def test_wal_and_schema(self, tmp_path):
+        """Schema is migrated once and the journal runs in WAL mode"""
+        db = str(tmp_path / "t.db")
+        con = store.get_conn(db)
+        assert con.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+        tables = {r[0] for r in con.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        assert {"messages", "memory", "permissions", "notes"} <= tables
+
+    def test_log_and_fetch(self, tmp_path, monkeypatch):
+        """Logged messages come back newest first"""
+        monkeypatch.setattr(store, "DB_PATH", str(tmp_path / "t.db"))
+        store.log_message("user", "سلام", "test", {"n": 1})
+        store.log_message("assistant", "hi", "test", {"n": 2})
+        rows = store.fetch_messages(2)
+        assert [r[3] for r in rows] == ["hi", "سلام"]
+
+
+class TestMessageWriter:
+    """Test the write-behind message logger"""
+
+    def test_batches_and_drains_on_stop(self, tmp_path):
+        """Queued rows are written in batches and drained on stop"""
+        db = str(tmp_path / "w.db")
+        w = store.MessageWriter(db, batch=10, interval_s=60)
+        for i in range(25):
+            w.submit((float(i), "user", f"m{i}", "test", "{}"))
+        w.stop()
+        count = store.get_conn(db).execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+        assert count == 25
+        assert w.stats()["batches"] >= 3
+
+    def test_flush_makes_rows_visible(self, tmp_path):
+        """flush() blocks until pending rows are committed"""
+        db = str(tmp_path / "w.db")
+        w = store.MessageWriter(db, batch=1000, interval_s=60)
+        w.submit((1.0, "user", "hello", "test", "{}"))
+        w.flush()
+        assert store.get_conn(db).execute("SELECT text FROM messages").fetchone()[0] == "hello"
+        w.stop()
+
+    def test_locked_database_is_retried(self, tmp_path, monkeypatch):
+        """A transient lock is retried with backoff instead of dropping the batch"""
+        db = str(tmp_path / "w.db")
+        real_write = store._write_rows
+        failures = [2]
+
+        def flaky(path, rows):
+            if failures[0]:
+                failures[0] -= 1
+                raise store.sqlite3.OperationalError("database is locked")
+            real_write(path, rows)
+
+        monkeypatch.setattr(store, "_write_rows", flaky)
+        monkeypatch.setattr(store, "RETRY_BACKOFF_S", 0.001)
+        w = store.MessageWriter(db, batch=10, interval_s=60)
+        for i in range(5):
+            w.submit((float(i), "user", f"m{i}", "test", "{}"))
+        w.stop()
+        assert store.get_conn(db).execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 5
+        assert w.stats()["retries"] == 2 and w.stats()["failed"] == 0
+
+    def test_bad_rows_fall_back_to_per_row_writes(self, tmp_path):
+        """A row that cannot be written is counted as failed; the rest of its batch still lands"""
+        db = str(tmp_path / "w.db")
+        w = store.MessageWriter(db, batch=10, interval_s=60)
+        w.submit((1.0, "user", "ok-1", "test", "{}"))
+        w.submit((2.0, "user", "bad"))
+        w.submit((3.0, "user", "ok-2", "test", "{}"))
+        w.stop()
+        texts = [r[0] for r in store.get_conn(db).execute("SELECT text FROM messages ORDER BY ts")]
+        assert texts == ["ok-1", "ok-2"]
+        assert w.stats()["failed"] == 1 and w.stats()["written"] == 2
+
+    def test_submits_racing_stop_are_not_lost(self, tmp_path):
+        """Rows submitted while stop() runs are either drained or written directly"""
+        db = str(tmp_path / "w.db")
+        w = store.MessageWriter(db, batch=10, interval_s=60)
+        start = threading.Barrier(5)
+
+        def log(n):
+            start.wait()
+            for i in range(50):
+                w.submit((float(i), "user", f"t{n}-{i}", "test", "{}"))
+
+        threads = [threading.Thread(target=log, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        start.wait()
+        w.stop()
+        for t in threads:
+            t.join(5)
+        assert store.get_conn(db).execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 200
+        assert w.stats()["queued"] == 0
+
+    def test_stop_drains_rows_left_behind_by_the_worker(self, tmp_path):
+        """Anything still queued after the worker exits is written by stop()"""
+        db = str(tmp_path / "w.db")
+        w = store.MessageWriter(db, batch=10, interval_s=60)
+        w._q.put(None)
+        w._thread.join(5)
+        w._q.put((db, (1.0, "user", "late", "test", "{}")))
+        done = threading.Event()
+        w._q.put(done)
+        w.stop()
+        assert done.is_set()
+        assert store.get_conn(db).execute("SELECT text FROM messages").fetchone()[0] == "late"
@@ -0,0 +1,101 @@
+"""
+Unit Tests for the persistent TTS synthesis worker pool
+"""
+
+import io
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "heystive_professional"))
+
+from heystive.engines.tts import synthesis_workers
+from heystive.engines.tts.synthesis_workers import SynthesisWorkerPool, WorkerError, read_frame, write_frame
+
+
+class TestFrames:
+    """Test the length-prefixed pipe protocol"""
+
+    def test_round_trip(self):
+        stream = io.BytesIO()
+        write_frame(stream, {"id": 1, "op": "synth", "text": "سلام"}, b"\x00\x01")
+        write_frame(stream, {"id": 2, "op": "ping"})
+        stream.seek(0)
+        assert read_frame(stream) == ({"id": 1, "op": "synth", "text": "سلام"}, b"\x00\x01")
+        assert read_frame(stream) == ({"id": 2, "op": "ping"}, b"")
+        assert read_frame(stream) is None
+
+
+class TestSynthesisWorkerPool:
+    """Test dispatch, restart and metrics against the mock backend"""
+
+    @pytest.fixture
+    def pool(self):
+        pool = SynthesisWorkerPool("mock", size=2, max_inflight=1, health_interval=0)
+        yield pool
+        pool.close()
+
+    def test_workers_persist_across_requests(self, pool):
+        first = pool.synthesize("سلام")
+        pids = {w.pid for w in pool.workers if w is not None}
+        for _ in range(5):
+            pool.synthesize("سلام دنیا")
+        assert first.format == "wav" and first.sample_rate == 16000
+        assert {w.pid for w in pool.workers if w is not None} == pids
+        assert pool.stats()["requests"] == 6
+
+    def test_concurrent_callers_queue(self, pool):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(pool.synthesize("x" * 20))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = pool.stats()
+        assert len(results) == 8
+        assert stats["alive"] <= 2 and stats["inflight"] == 0 and stats["queue_depth"] == 0
+
+    def test_crashed_worker_is_restarted(self, pool):
+        pool.synthesize("a")
+        crashed = pool.workers[0]
+        crashed.process.kill()
+        crashed.process.wait()
+        time.sleep(0.05)
+        assert pool.synthesize("b").duration > 0
+        assert pool.workers[0] is not crashed
+        assert pool.stats()["restarts"] == 1
+        assert all(pool.health_check().values())
+
+    def test_slow_spawn_does_not_hold_the_pool_lock(self, pool, monkeypatch):
+        entered, release = threading.Event(), threading.Event()
+        real_worker = synthesis_workers.SynthesisWorker
+
+        def gated_worker(engine, index, *args):
+            if index == 0:
+                entered.set()
+                release.wait(5)
+            return real_worker(engine, index, *args)
+
+        monkeypatch.setattr(synthesis_workers, "SynthesisWorker", gated_worker)
+        slow = threading.Thread(target=pool.synthesize, args=("a",))
+        slow.start()
+        assert entered.wait(5)
+        start = time.monotonic()
+        assert pool.stats()["requests"] == 1
+        assert pool.synthesize("b").duration > 0
+        assert time.monotonic() - start < 2.0
+        assert pool.workers[0] is None and pool.workers[1] is not None
+        release.set()
+        slow.join(5)
+        assert pool.workers[0] is not None
+        assert pool.stats()["requests"] == 2 and pool.stats()["spawn_failures"] == 0
+
+    def test_closed_pool_and_unknown_engine(self, pool):
+        pool.close()
+        with pytest.raises(WorkerError):
+            pool.synthesize("a")
+        with pytest.raises(ValueError):
+            SynthesisWorkerPool("nope", health_interval=0)
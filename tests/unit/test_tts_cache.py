@@ -0,0 +1,85 @@
+"""
+Unit Tests for the two-tier TTS synthesis cache
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "heystive_professional"))
+
+from heystive.engines.tts.synthesis_cache import CachedAudio, SynthesisCache, synthesis_key
+
+
+class TestSynthesisKey:
+    """Test content addressing"""
+
+    def test_key_depends_on_every_input(self):
+        base = synthesis_key("سلام", "kamtera_female", "Female", {"rate": 150})
+        assert base == synthesis_key("سلام", "kamtera_female", "Female", {"rate": 150})
+        assert base != synthesis_key("سلام!", "kamtera_female", "Female", {"rate": 150})
+        assert base != synthesis_key("سلام", "kamtera_male", "Female", {"rate": 150})
+        assert base != synthesis_key("سلام", "kamtera_female", "Male", {"rate": 150})
+        assert base != synthesis_key("سلام", "kamtera_female", "Female", {"rate": 120})
+
+
+class TestSynthesisCache:
+    """Test memory/disk tiers, eviction and metrics"""
+
+    def test_miss_then_memory_hit_then_disk_hit(self, tmp_path):
+        cache = SynthesisCache(tmp_path)
+        key = synthesis_key("سلام", "espeak_persian")
+        assert cache.get(key) is None
+        path = cache.put(key, b"RIFFdata", "wav", 22050)
+        assert path == cache.path_for(key) and path.read_bytes() == b"RIFFdata"
+        assert cache.get(key) == CachedAudio(b"RIFFdata", "wav", 22050)
+        fresh = SynthesisCache(tmp_path)
+        assert fresh.get(key) == CachedAudio(b"RIFFdata", "wav", 22050)
+        assert fresh.get(key).data == b"RIFFdata"
+        stats = fresh.stats()
+        assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 0)
+        assert cache.stats()["misses"] == 1 and cache.stats()["memory_hits"] == 1
+
+    def test_format_and_sample_rate_survive_restart(self, tmp_path):
+        cache = SynthesisCache(tmp_path)
+        key = synthesis_key("سلام", "google_tts")
+        path = cache.put(key, b"ID3mp3", "mp3", 24000)
+        assert path.name == f"{key}.24000.mp3"
+        assert SynthesisCache(tmp_path).get(key) == CachedAudio(b"ID3mp3", "mp3", 24000)
+
+    def test_replacing_an_entry_drops_the_old_file(self, tmp_path):
+        cache = SynthesisCache(tmp_path)
+        old = cache.put("f" * 64, b"RIFFdata", "wav", 16000)
+        new = cache.put("f" * 64, b"RIFFdata", "wav", 22050)
+        assert not old.exists() and new.exists()
+        assert cache.stats()["disk_bytes"] == 8
+
+    def test_memory_tier_evicts_least_recently_used(self, tmp_path):
+        cache = SynthesisCache(tmp_path, max_memory_bytes=10)
+        cache.put("a" * 64, b"12345", "wav", 16000)
+        cache.put("b" * 64, b"12345", "wav", 16000)
+        cache.get("a" * 64)
+        cache.put("c" * 64, b"12345", "wav", 16000)
+        stats = cache.stats()
+        assert stats["memory_entries"] == 2 and stats["memory_evictions"] == 1
+        assert "b" * 64 not in cache._memory
+        assert cache.get("b" * 64).data == b"12345"
+        assert cache.stats()["disk_hits"] == 1
+
+    def test_disk_tier_evicts_by_size_and_survives_restart(self, tmp_path):
+        cache = SynthesisCache(tmp_path, max_disk_bytes=10)
+        paths = {k: cache.put(k * 64, b"12345", "wav", 16000) for k in "abc"}
+        assert not paths["a"].exists() and cache.path_for("a" * 64) is None
+        assert cache.stats()["disk_bytes"] == 10
+        os.utime(paths["b"], ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+        fresh = SynthesisCache(tmp_path, max_disk_bytes=10)
+        fresh.put("d" * 64, b"12345", "wav", 16000)
+        assert paths["b"].exists()
+        assert not paths["c"].exists()
+
+    def test_clear(self, tmp_path):
+        cache = SynthesisCache(tmp_path / "cache")
+        path = cache.put("e" * 64, b"wave", "wav", 16000)
+        cache.clear()
+        assert not path.exists() and cache.get("e" * 64) is None
@@ -0,0 +1,147 @@
+"""
+Unit Tests for lazy engine loading and warm-up in the Persian multi-TTS manager
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "heystive_professional"))
+
+from heystive.engines.tts.persian_multi_tts_manager import PersianMultiTTSManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    tts = PersianMultiTTSManager(lazy=True, warmup=[], output_dir=tmp_path)
+    tts.loaded = []
+
+    def fake_loader(name, works=True):
+        def load():
+            tts.loaded.append(name)
+            if works:
+                tts.engines[name] = {**tts.ENGINE_INFO[name], 'engine': name, 'status': 'Working'}
+        return load
+
+    tts.engine_loaders = {name: fake_loader(name) for name in tts.engine_priority}
+    tts.fake_loader = fake_loader
+    return tts
+
+
+class TestLazyLoading:
+    """Test that engines load on first use only"""
+
+    def test_nothing_loads_at_construction(self, manager):
+        assert manager.engines == {} and manager.loaded == []
+        assert manager.current_engine == 'kamtera_female'
+        assert set(manager.engine_states.values()) == {'unloaded'}
+
+    def test_first_use_loads_once(self, manager):
+        assert manager.get_current_engine_info()['voice_type'] == 'Female'
+        assert manager.switch_engine('espeak_persian')
+        assert manager.switch_engine('espeak_persian')
+        assert manager.loaded == ['kamtera_female', 'espeak_persian']
+        assert manager.engine_states['espeak_persian'] == 'loaded'
+        assert 'espeak_persian' in manager.engine_load_times
+
+    def test_failed_engine_falls_back_down_the_priority_list(self, manager):
+        manager.engine_loaders['kamtera_female'] = manager.fake_loader('kamtera_female', works=False)
+        assert manager.get_current_engine_info()['name'] == 'Kamtera Male VITS'
+        assert manager.engine_states['kamtera_female'] == 'failed'
+        assert not manager.switch_engine('kamtera_female')
+        assert manager.loaded.count('kamtera_female') == 1
+
+    def test_list_engines_reports_static_metadata_before_loading(self, manager):
+        manager.switch_engine('google_tts')
+        listed = manager.list_engines()
+        assert list(listed) == manager.engine_priority
+        keys = set(listed['google_tts'])
+        for name, info in listed.items():
+            assert keys <= set(info) | {'engine'}
+        assert listed['kamtera_male']['state'] == 'unloaded'
+        assert listed['kamtera_male']['quality'] == 'Premium' and listed['kamtera_male']['voice_type'] == 'Male'
+        assert listed['kamtera_male']['model_path'] == 'Kamtera/persian-tts-male-vits'
+        assert listed['google_tts']['state'] == 'loaded' and listed['google_tts']['status'] == 'Working'
+
+
+class TestWarmUp:
+    """Test the background warm-up queue"""
+
+    def test_background_warm_up_loads_in_priority_order(self, manager):
+        manager.warm_up(['espeak_persian', 'kamtera_male'])
+        manager._warmup_thread.join(5)
+        assert manager.loaded == ['kamtera_male', 'espeak_persian']
+        assert manager.engine_states['kamtera_male'] == 'loaded'
+
+    def test_warm_up_and_first_use_share_one_load(self, manager):
+        entered, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow_load():
+            calls.append(1)
+            entered.set()
+            release.wait(5)
+            manager.engines['kamtera_female'] = {**manager.ENGINE_INFO['kamtera_female'], 'status': 'Working'}
+
+        manager.engine_loaders['kamtera_female'] = slow_load
+        manager.warm_up(['kamtera_female'])
+        assert entered.wait(5)
+        assert manager.engine_states['kamtera_female'] == 'loading'
+        user = threading.Thread(target=manager.get_current_engine_info)
+        user.start()
+        time.sleep(0.05)
+        release.set()
+        user.join(5)
+        manager._warmup_thread.join(5)
+        assert calls == [1] and manager.engine_states['kamtera_female'] == 'loaded'
+
+    def test_engine_queued_as_the_worker_finds_the_queue_empty_is_warmed(self, manager):
+        warm_queue = manager._warmup_queue
+        real_get = warm_queue.get
+        raced = []
+
+        def get(timeout=None):
+            try:
+                return real_get(timeout=0.01)
+            except Exception:
+                if not raced:
+                    raced.append(1)
+                    late = threading.Thread(target=manager.warm_up, args=(['system_tts'],))
+                    late.start()
+                    late.join(5)
+                raise
+
+        warm_queue.get = get
+        manager.warm_up(['kamtera_female'])
+        deadline = time.monotonic() + 5
+        while manager._warmup_thread is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert raced and manager.loaded == ['kamtera_female', 'system_tts']
+        assert manager._warmup_thread is None and warm_queue.empty()
+
+    def test_foreground_warm_up(self, manager):
+        manager.warm_up(['system_tts'], background=False)
+        assert manager.loaded == ['system_tts'] and manager._warmup_thread is None
+
+
+class TestSynthesisCacheHits:
+    """Test that cached results keep the engine's format and sample rate"""
+
+    def test_mp3_hit_keeps_format_and_rate(self, manager, monkeypatch):
+        from heystive.engines.tts.audio_result import AudioResult
+        calls = []
+
+        def fake_gtts(text):
+            calls.append(text)
+            return AudioResult(data=b"ID3" + b"\x00" * 16, format="mp3", sample_rate=24000)
+
+        monkeypatch.setattr(manager, "_speak_google_tts", fake_gtts)
+        first = manager.synthesize_persian("سلام", "google_tts")
+        manager.synthesis_cache._memory.clear()
+        hit = manager.synthesize_persian("سلام", "google_tts")
+        assert len(calls) == 1
+        assert (hit.format, hit.sample_rate, hit.to_bytes()) == ("mp3", 24000, first.to_bytes())
+        assert manager.synthesis_cache.path_for(next(iter(manager.synthesis_cache._disk))).suffix == ".mp3"
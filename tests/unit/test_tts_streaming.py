@@ -0,0 +1,128 @@
+"""
+Unit Tests for sentence-streamed synthesis and gapless stream playback
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "heystive_professional"))
+
+from heystive.engines.tts.stream_player import StreamPlayer
+
+
+class FakeOutputStream:
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+        self.events = []
+        self.blocks = []
+
+    def start(self):
+        self.events.append("start")
+
+    def write(self, block):
+        self.events.append("write")
+        self.blocks.append(block.copy())
+
+    def stop(self):
+        self.events.append("stop")
+
+    def close(self):
+        self.events.append("close")
+
+
+class TestStreamPlayer:
+    """Test that one stream carries every chunk of an utterance"""
+
+    def test_chunks_share_one_stream(self):
+        opened = []
+
+        def open_stream(sample_rate):
+            opened.append(FakeOutputStream(sample_rate))
+            return opened[-1]
+
+        with StreamPlayer(22050, open_stream) as player:
+            for n in (10, 7, 3):
+                player.write(np.ones(n, dtype=np.float64))
+        assert len(opened) == 1 and opened[0].sample_rate == 22050
+        assert opened[0].events == ["start", "write", "write", "write", "stop", "close"]
+        assert all(b.dtype == np.float32 and b.shape[1] == 1 for b in opened[0].blocks)
+        assert player.frames_written == 20
+
+    def test_close_without_audio_opens_nothing(self):
+        opened = []
+        StreamPlayer(16000, lambda sr: opened.append(sr)).close()
+        assert opened == []
+
+
+def make_tts(segment_log=None, fail_on=None):
+    pytest.importorskip("torch")
+    pytest.importorskip("torchaudio")
+    from heystive.engines.tts.persian_tts import ElitePersianTTS
+    tts = ElitePersianTTS({"ram_gb": 8, "cpu_cores": 4, "gpu_available": False})
+
+    async def synthesize(text, emotion, speed):
+        if segment_log is not None:
+            segment_log.append(text)
+        if fail_on and fail_on in text:
+            raise RuntimeError("model failed")
+        await asyncio.sleep(0)
+        return np.full(1000, 0.1, dtype=np.float32)
+
+    tts.active_model = {"name": "stub", "type": "fallback", "synthesize": synthesize}
+    tts.stream_chunk_ms = 20
+    return tts
+
+
+class TestStreamingSynthesis:
+    """Test stream_premium_persian and speak_streaming"""
+
+    def test_segments_stream_as_fixed_size_chunks(self):
+        log = []
+        tts = make_tts(log)
+
+        async def go():
+            return [c async for c in tts.stream_premium_persian("سلام. حال شما چطور است؟ خوبم")]
+
+        chunks = asyncio.run(go())
+        assert len(log) == 3
+        size = int(tts.sample_rate * tts.stream_chunk_ms / 1000)
+        assert all(c.dtype == np.float32 and len(c) <= size for c in chunks)
+        assert sum(len(c) for c in chunks) == 3000
+        stats = tts.synthesis_stats
+        assert stats["streaming_syntheses"] == 1 and stats["last_time_to_first_audio"] > 0
+
+    def test_model_error_reaches_the_consumer(self):
+        tts = make_tts(fail_on="دوم")
+
+        async def go():
+            return [c async for c in tts.stream_premium_persian("اول. دوم.")]
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(go())
+
+    def test_speak_streaming_plays_through_one_player(self):
+        tts = make_tts()
+        players = []
+
+        def create_player():
+            players.append(StreamPlayer(tts.sample_rate, FakeOutputStream))
+            return players[-1]
+
+        tts._create_stream_player = create_player
+        assert asyncio.run(tts.speak_streaming("سلام. خداحافظ.")) is True
+        assert len(players) == 1 and players[0].frames_written == 2000
+        assert players[0]._stream is None
+
+    def test_speak_streaming_closes_the_player_on_failure(self):
+        tts = make_tts(fail_on="خداحافظ")
+        closed = []
+        player = StreamPlayer(tts.sample_rate, FakeOutputStream)
+        real_close = player.close
+        player.close = lambda: closed.append(1) or real_close()
+        tts._create_stream_player = lambda: player
+        assert asyncio.run(tts.speak_streaming("سلام. خداحافظ.")) is False
+        assert closed == [1]
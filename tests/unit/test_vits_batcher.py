@@ -0,0 +1,168 @@
+"""
+Unit Tests for the TTS micro-batching scheduler
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "heystive_professional"))
+
+from heystive.engines.tts import vits_batcher
+from heystive.engines.tts.vits_batcher import MicroBatcher, VitsBatchRunner, join_sentences
+
+
+class TestMicroBatcher:
+    """Test batching, ordering and error propagation"""
+
+    def test_concurrent_requests_share_one_batch(self):
+        calls = []
+
+        def batch_fn(items):
+            calls.append(list(items))
+            return [i * 2 for i in items]
+
+        batcher = MicroBatcher(batch_fn, max_batch=4, max_wait_ms=200)
+        results = {}
+        barrier = threading.Barrier(4)
+
+        def worker(i):
+            barrier.wait()
+            results[i] = batcher.run(i, timeout=5)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results == {0: 0, 1: 2, 2: 4, 3: 6}
+        assert len(calls) == 1 and sorted(calls[0]) == [0, 1, 2, 3]
+        stats = batcher.stats()
+        assert stats["batches"] == 1 and stats["avg_batch_size"] == 4 and stats["max_batch_seen"] == 4
+        batcher.close()
+
+    def test_batch_size_is_capped_and_wait_is_bounded(self):
+        sizes = []
+        batcher = MicroBatcher(lambda items: sizes.append(len(items)) or items, max_batch=3, max_wait_ms=5)
+        futures = [batcher.submit(i) for i in range(7)]
+        assert [f.result(timeout=5) for f in futures] == list(range(7))
+        assert max(sizes) <= 3 and sum(sizes) == 7
+        start = time.perf_counter()
+        assert batcher.run("solo", timeout=5) == "solo"
+        assert time.perf_counter() - start < 1.0
+        batcher.close()
+
+    def test_errors_reach_every_caller(self):
+        def batch_fn(items):
+            raise ValueError("boom")
+
+        batcher = MicroBatcher(batch_fn, max_batch=2, max_wait_ms=50)
+        futures = [batcher.submit(i) for i in range(2)]
+        for f in futures:
+            with pytest.raises(ValueError):
+                f.result(timeout=5)
+        assert batcher.stats()["errors"] == 1
+        batcher.close()
+        with pytest.raises(RuntimeError):
+            batcher.submit(1)
+
+
+class FakeTokenizer:
+    class characters:
+        pad_id = 0
+
+    def text_to_ids(self, text, language=None):
+        return [ord(c) % 50 + 1 for c in text]
+
+
+def make_fake_vits(hop=4, frames_per_token=2):
+    """
+    Stand-in for Coqui Vits.inference: each token becomes frames_per_token frames of hop samples,
+    padded rows are zero beyond their own y_mask and padding tokens must be ignored via x_lengths
+    """
+    torch = pytest.importorskip("torch")
+
+    class FakeVits(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.weight = torch.nn.Parameter(torch.zeros(1))
+            self.tokenizer = FakeTokenizer()
+            self.calls = []
+
+        def inference(self, x, aux_input):
+            lengths = aux_input["x_lengths"]
+            self.calls.append(x.shape[0])
+            frames = int(lengths.max()) * frames_per_token
+            wav = torch.zeros(x.shape[0], 1, frames * hop)
+            y_mask = torch.zeros(x.shape[0], 1, frames)
+            for b in range(x.shape[0]):
+                tokens = x[b, :int(lengths[b])].float()
+                per_frame = tokens.repeat_interleave(frames_per_token)
+                samples = torch.sin(per_frame.repeat_interleave(hop) * 0.1 + torch.arange(per_frame.numel() * hop) * 0.01)
+                wav[b, 0, :samples.numel()] = samples
+                y_mask[b, 0, :per_frame.numel()] = 1
+            return {"model_outputs": wav, "y_mask": y_mask}
+
+    return FakeVits()
+
+
+class TestVitsBatchRunner:
+    """Test that a padded batched forward pass reproduces per-item inference"""
+
+    def unbatched(self, model, text):
+        torch = pytest.importorskip("torch")
+        ids = model.tokenizer.text_to_ids(text)
+        out = model.inference(torch.tensor([ids]), {"x_lengths": torch.tensor([len(ids)])})
+        return out["model_outputs"][0, 0].numpy()
+
+    def test_batched_matches_unbatched(self):
+        model = make_fake_vits(hop=4)
+        texts = ["سلام", "یک جمله بلندتر از بقیه", "خوب", "متن متوسط"]
+        expected = [self.unbatched(model, t) for t in texts]
+        model.calls.clear()
+        results = VitsBatchRunner(model)(texts)
+        assert model.calls == [len(texts)]
+        for got, want in zip(results, expected):
+            assert got.dtype == np.float32 and got.shape == want.shape
+            np.testing.assert_allclose(got, want, rtol=0, atol=1e-6)
+
+    def test_hop_follows_the_model_output(self):
+        model = make_fake_vits(hop=7, frames_per_token=3)
+        short, long = VitsBatchRunner(model)(["ab", "abcdef"])
+        assert (len(short), len(long)) == (2 * 3 * 7, 6 * 3 * 7)
+
+    def test_trim_silence_is_applied_per_item(self, monkeypatch):
+        model = make_fake_vits()
+        runner = VitsBatchRunner(model, trim_silence=True)
+        monkeypatch.setattr(runner, "_trim_silence", lambda wav: wav[:3])
+        assert [len(w) for w in runner(["abcd", "ab"])] == [3, 3]
+
+    def test_from_synthesizer_reads_do_trim_silence(self):
+        class Synth:
+            tts_model = object()
+
+            class tts_config:
+                audio = {"do_trim_silence": True}
+
+        assert VitsBatchRunner.from_synthesizer(Synth).trim_silence is True
+        Synth.tts_config.audio = {}
+        assert VitsBatchRunner.from_synthesizer(Synth).trim_silence is False
+
+
+class TestJoinSentences:
+    """Test that batched output is assembled like Synthesizer.tts"""
+
+    def test_gap_after_every_sentence(self):
+        joined = join_sentences([np.ones(3), np.ones(2)])
+        gap = vits_batcher.SENTENCE_GAP
+        assert joined.dtype == np.float32 and len(joined) == 5 + 2 * gap
+        assert joined[:3].all() and not joined[3:3 + gap].any() and not joined[-gap:].any()
+
+    def test_batching_is_off_by_default(self, monkeypatch):
+        import importlib
+        monkeypatch.delenv("HEYSTIVE_TTS_BATCH_MAX", raising=False)
+        assert importlib.reload(vits_batcher).BATCH_MAX == 1
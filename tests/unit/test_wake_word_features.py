@@ -0,0 +1,121 @@
+"""
+Unit Tests for the streaming wake word feature extractor
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "heystive_professional"))
+
+from heystive.engines.wake_word.streaming_features import AudioRingBuffer, StreamingFeatureExtractor, StreamingVAD
+
+
+class TestAudioRingBuffer:
+    """Test the fixed-capacity sample ring"""
+
+    def test_wraps_and_keeps_latest(self):
+        ring = AudioRingBuffer(5)
+        ring.append(np.arange(3))
+        ring.append(np.arange(3, 8))
+        assert len(ring) == 5
+        assert ring.view().tolist() == [3, 4, 5, 6, 7]
+        assert ring.oldest(2).tolist() == [3, 4]
+        assert ring.latest(2).tolist() == [6, 7]
+        assert ring.total == 8
+
+    def test_oversized_append_and_clear(self):
+        ring = AudioRingBuffer(4)
+        ring.append(np.arange(10))
+        assert ring.view().tolist() == [6, 7, 8, 9]
+        ring.clear()
+        assert len(ring) == 0 and ring.total == 0
+
+
+class TestStreamingFeatureExtractor:
+    """Test incremental features against full-window librosa features"""
+
+    def _signal(self, n):
+        return (0.1 * np.random.default_rng(0).standard_normal(n)).astype(np.float32)
+
+    def test_matches_full_window_librosa_features(self):
+        """Same parameters as the original full-window extractor: centered frames, top_db=80"""
+        librosa = pytest.importorskip("librosa")
+        y = self._signal(512 * 150)
+        y[:20000] *= 0.001  # quiet lead-in so the top_db clip is exercised
+        ex = StreamingFeatureExtractor(16000, max_seconds=3.0)
+        for i in range(0, len(y), 1024):
+            ex.push(y[i:i + 1024])
+        f = ex.features()
+        window = y[-48000:]
+        mfcc = librosa.feature.mfcc(y=window, sr=16000, n_mfcc=13, n_fft=2048, hop_length=512)
+        assert f["mfccs"].shape == mfcc.shape
+        assert np.allclose(f["mfccs"], mfcc, atol=1e-3)
+        assert np.allclose(f["delta_mfccs"], librosa.feature.delta(mfcc), atol=1e-3)
+        assert np.allclose(f["delta2_mfccs"], librosa.feature.delta(mfcc, order=2), atol=1e-3)
+        assert np.allclose(f["spectral_centroids"], librosa.feature.spectral_centroid(y=window, sr=16000), rtol=1e-4)
+        assert np.allclose(f["zcr"], librosa.feature.zero_crossing_rate(window))
+        assert f["energy"] == pytest.approx(float(np.mean(window ** 2)), rel=1e-5)
+        assert f["duration"] == pytest.approx(3.0)
+
+    def test_frames_are_analysed_once(self):
+        ex = StreamingFeatureExtractor(16000)
+        assert ex.push(np.zeros(511, dtype=np.float32)) == 0
+        assert ex.push(np.zeros(1, dtype=np.float32)) == 1
+        ex.push(self._signal(16000 - 512))
+        ex.features()
+        first = ex.frames_processed
+        ex.push(self._signal(1024))
+        ex.features()
+        assert ex.frames_processed - first == 2
+        ex.reset()
+        assert ex.frames_processed == 0 and ex.features()["mfccs"].shape[1] == 0
+
+
+class TestStreamingVAD:
+    """Test cached per-frame VAD flags and the speech timeline"""
+
+    def _tone(self, seconds, amp):
+        t = np.arange(int(16000 * seconds)) / 16000
+        return (amp * np.sin(2 * np.pi * 200 * t) * 32767).astype(np.int16)
+
+    def test_ratio_tracks_window_and_gates_silence(self):
+        calls = []
+
+        def is_speech(frame, sr):
+            calls.append(len(frame))
+            return True
+
+        vad = StreamingVAD(16000, max_seconds=1.0, is_speech=is_speech)
+        vad.push(np.zeros(8000, dtype=np.int16))
+        assert vad.speech_ratio() == 0.0 and not calls
+        assert vad.frames_gated == 50
+        vad.push(self._tone(0.5, 0.3))
+        assert vad.speech_ratio() == pytest.approx(0.5)
+        assert len(calls) == 50 and set(calls) == {320}
+        vad.push(self._tone(0.5, 0.3))
+        assert vad.speech_ratio() == pytest.approx(1.0)
+        assert vad.speech_ratio(seconds=0.2) == pytest.approx(1.0)
+
+    def test_quiet_speech_reaches_the_vad(self):
+        calls = []
+        vad = StreamingVAD(16000, max_seconds=1.0, is_speech=lambda frame, sr: calls.append(1) or True)
+        vad.push(self._tone(0.2, 0.004))  # about -50 dBFS, well under the old 0.01 floor
+        assert len(calls) == 20 and vad.speech_ratio() == pytest.approx(1.0)
+        ungated = StreamingVAD(16000, max_seconds=1.0, is_speech=lambda frame, sr: False, energy_floor=0)
+        ungated.push(np.zeros(1600, dtype=np.int16))
+        assert ungated.frames_gated == 0
+
+    def test_partial_frames_carry_over_and_timeline(self):
+        vad = StreamingVAD(16000, max_seconds=1.0, smooth_frames=4)
+        assert vad.push(self._tone(0.005, 0.3)) == 0
+        assert vad.push(self._tone(0.015, 0.3)) == 2
+        vad.push(np.zeros(640, dtype=np.int16))
+        timeline = vad.timeline()
+        assert timeline.shape == (6,)
+        assert timeline[:2].tolist() == [1.0, 1.0]
+        assert timeline[-1] == pytest.approx(0.0)
+        vad.reset()
+        assert vad.speech_ratio() == 0.0 and vad.timeline().size == 0
@@ -0,0 +1,94 @@
+"""
+Unit Tests for the streamed WAV parser shared by the API clients
+"""
+
+import io
+import struct
+import sys
+import wave
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from api_bridge.wav_stream import iter_wav_stream
+
+
+def wav_bytes(pcm: bytes, sample_rate=22050, channels=1) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm)
+    return buf.getvalue()
+
+
+def riff(*chunks: bytes, data_size=None, pcm=b"") -> bytes:
+    body = b"WAVE" + b"".join(chunks)
+    body += b"data" + struct.pack("<I", len(pcm) if data_size is None else data_size) + pcm
+    return b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + body
+
+
+def fmt_chunk(sample_rate=16000, channels=1, bits=16, audio_format=1, extra=b"") -> bytes:
+    payload = struct.pack("<HHIIHH", audio_format, channels, sample_rate, sample_rate * channels * bits // 8,
+                          channels * bits // 8, bits) + extra
+    return b"fmt " + struct.pack("<I", len(payload)) + payload
+
+
+def split(data: bytes, sizes):
+    out, pos = [], 0
+    for n in sizes:
+        out.append(data[pos:pos + n])
+        pos += n
+    out.append(data[pos:])
+    return out
+
+
+def collect(chunks):
+    parts = list(iter_wav_stream(chunks))
+    return b"".join(p for p, _, _ in parts), parts
+
+
+class TestIterWavStream:
+    """Test header parsing across chunk boundaries and sample alignment"""
+
+    def test_split_header(self):
+        pcm = bytes(range(200))
+        data = wav_bytes(pcm, 22050)
+        for sizes in ([1] * 50, [3, 9, 20, 30], [43], [44], [45]):
+            got, parts = collect(split(data, sizes))
+            assert got == pcm
+            assert {(sr, ch) for _, sr, ch in parts} == {(22050, 1)}
+
+    def test_odd_length_chunks_stay_sample_aligned(self):
+        pcm = bytes(range(240))
+        data = wav_bytes(pcm, 16000, channels=2)
+        got, parts = collect(split(data, [47, 5, 3, 7, 11, 1, 13]))
+        assert got == pcm
+        assert all(len(p) % 4 == 0 for p, _, _ in parts)
+        assert {(sr, ch) for _, sr, ch in parts} == {(16000, 2)}
+
+    def test_extra_chunks_before_data(self):
+        pcm = b"\x01\x00\x02\x00\x03\x00"
+        listing = b"LIST" + struct.pack("<I", 5) + b"INFOx\x00"
+        data = riff(fmt_chunk(8000, extra=b"\x00\x00"), listing, pcm=pcm)
+        got, parts = collect(split(data, [30, 17, 2]))
+        assert got == pcm and parts[0][1:] == (8000, 1)
+
+    def test_streaming_size_runs_to_end_and_known_size_stops(self):
+        pcm = b"\x10\x00" * 8
+        got, _ = collect([riff(fmt_chunk(), data_size=0xFFFFFFFF, pcm=pcm)])
+        assert got == pcm
+        trailer = b"LIST" + struct.pack("<I", 4) + b"INFO"
+        got, _ = collect(split(riff(fmt_chunk(), data_size=6, pcm=pcm[:6] + trailer), [40, 3]))
+        assert got == pcm[:6]
+
+    def test_rejects_non_wav_and_unsupported_formats(self):
+        with pytest.raises(ValueError):
+            list(iter_wav_stream([b"ID3\x04" + b"\x00" * 60]))
+        with pytest.raises(ValueError):
+            list(iter_wav_stream([riff(fmt_chunk(bits=24), pcm=b"\x00" * 6)]))
+        with pytest.raises(ValueError):
+            list(iter_wav_stream([riff(fmt_chunk())[:30]]))
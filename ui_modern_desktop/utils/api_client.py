@@ -6,11 +6,13 @@ Handles communication with the backend voice processing system
 import requests
 import json
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
 from pathlib import Path
 import tempfile
 import time
 
+from api_bridge.wav_stream import iter_wav_stream
+
 logger = logging.getLogger(__name__)
 
 class HeystiveAPIClient:
@@ -212,6 +214,36 @@ class HeystiveAPIClient:
                 'message': str(e)
             }
     
+    def stream_text_to_speech(self, text: str, on_audio: Callable[[bytes, int, int], None],
+                              voice: str = 'default', chunk_size: int = 4096) -> Dict[str, Any]:
+        """
+        Stream speech from /api/tts/stream; on_audio(pcm_bytes, sample_rate, channels)
+        is called per chunk so playback can start before synthesis finishes
+        """
+        url = f"{self.base_url}/api/tts/stream"
+        try:
+            start = time.time()
+            first_chunk_ms = None
+            total = 0
+            with self.session.post(url, json={'text': text, 'voice': voice}, headers={'Accept': 'audio/wav'},
+                                   stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                for pcm, sample_rate, channels in iter_wav_stream(response.iter_content(chunk_size)):
+                    if first_chunk_ms is None:
+                        first_chunk_ms = (time.time() - start) * 1000
+                    total += len(pcm)
+                    on_audio(pcm, sample_rate, channels)
+            
+            logger.info(f"✅ TTS streamed for: {text[:50]}... ({total} bytes)")
+            return {'status': 'success', 'bytes': total, 'first_chunk_ms': first_chunk_ms}
+            
+        except Exception as e:
+            logger.error(f"❌ TTS stream failed: {e}")
+            return {
+                'status': 'error',
+                'message': str(e)
+            }
+    
     def set_voice_settings(self, settings: Dict[str, Any]) -> Dict[str, Any]:
         """
         Update voice settings